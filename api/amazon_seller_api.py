@@ -13,16 +13,25 @@ from dotenv import load_dotenv
 import requests
 import io
 import csv
+import codecs
+import gzip
+import tempfile
+import threading
 from glob import glob
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import asdict, dataclass
-from typing import Dict, List, Any, Optional, TypedDict, Union, Tuple
-from datetime import datetime, timezone
+from typing import BinaryIO, Dict, Iterator, List, Any, Optional, TypedDict, Union, Tuple
+from datetime import datetime, timedelta, timezone
 from sp_api.base import Marketplaces, ReportType
-from sp_api.api import ProductTypeDefinitions, ListingsItems, ReportsV2, CatalogItems, ProductTypeDefinitions, ListingsItems, DataKiosk
+from sp_api.api import ProductTypeDefinitions, ListingsItems, ReportsV2, CatalogItems, ProductTypeDefinitions, ListingsItems, DataKiosk, Feeds
 from sp_api.api.catalog_items.catalog_items import CatalogItemsVersion
 from urllib3 import Retry
+from app.config.constants import AMAZON_REPORT_CACHE_DIR, AMAZON_REPORT_MAX_AGE
 from app.config.logging_init import logger
+from app.product_record import emits_records
+from api.rate_limiter import endpoint_key, rate_limiter
+from api.token_manager import token_manager_for
+from api.transport import transport
 
 # Type definitions
 class ProductFeatures(TypedDict):
@@ -42,6 +51,7 @@ class ListingReport:
     document_id: str
     status: str
     data: Optional[List[Dict[str, Any]]] = None
+    created_at: Optional[datetime] = None  # the listings in the report are current as of then
 
 @dataclass
 class ProductData(TypedDict):
@@ -183,7 +193,7 @@ class CategoryManager:
             with open(file_path, 'r') as file:
                 return raw_category_attrs, json.load(file)
         
-        product_scheme = requests.get(raw_category_attrs["schema"]["link"]["resource"])
+        product_scheme = transport.get(raw_category_attrs["schema"]["link"]["resource"])
         scheme_json = product_scheme.json()
         category_attrs = self._extract_category_item_attrs(scheme_json, raw_category_attrs["productType"])
         
@@ -224,6 +234,123 @@ class CategoryManager:
 
         return processed_attrs
         
+def _as_utc(value: Optional[Union[str, datetime]]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, naive values are taken as UTC."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+class ReportCache:
+    """
+    On-disk cache of downloaded report documents, keyed by reportDocumentId.
+
+    It also records the dataStartTime of every report requested here, as the reports
+    listed by `get_reports` do not tell a complete report from an incremental one
+    reliably. Documents older than `max_age` are dropped, they belong to reports that
+    are no longer reused.
+    """
+
+    def __init__(self, path: str = AMAZON_REPORT_CACHE_DIR, max_age: float = AMAZON_REPORT_MAX_AGE):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.index_path = self.path / "index.json"
+        self._lock = threading.Lock()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {"reports": {}, "documents": {}}
+
+    def _save_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        temp_path = self.index_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(index, file)
+        os.replace(temp_path, self.index_path)
+
+    def _document_path(self, document_id: str) -> Path:
+        return self.path / re.sub(r"[^\w.-]", "_", document_id)
+
+    def remember_report(self, report_id: str, data_start_time: Optional[datetime] = None) -> None:
+        """Record the data start of a report requested here, None for a complete report."""
+        with self._lock:
+            index = self._load_index()
+            index["reports"][report_id] = {
+                "data_start_time": data_start_time.isoformat() if data_start_time else None,
+                "requested_at": time.time(),
+            }
+            self._save_index(index)
+
+    def covers(self, report: Dict[str, Any], data_start_time: Optional[datetime] = None) -> bool:
+        """
+        Tell whether a listed report holds every row a request starting at
+        `data_start_time` needs, None asking for a complete report.
+        """
+        recorded = self._load_index()["reports"].get(report["reportId"])
+        report_start = _as_utc(recorded["data_start_time"] if recorded else report.get("dataStartTime"))
+
+        if report_start is None:
+            return True
+
+        return data_start_time is not None and report_start <= _as_utc(data_start_time)
+
+    def document(self, document_id: str) -> Optional[Tuple[Path, Optional[str], str]]:
+        """Return the path, compression and encoding of a cached document, or None."""
+        meta = self._load_index()["documents"].get(document_id)
+        path = self._document_path(document_id)
+
+        if not meta or not path.is_file():
+            return None
+
+        return path, meta["compression"], meta["encoding"]
+
+    def store_document(self, document_id: str, download, compression: Optional[str]) -> Tuple[Path, Optional[str], str]:
+        """
+        Download a document into the cache.
+
+        Args:
+            document_id: The reportDocumentId the document is stored under
+            download: Callable writing the document to the binary file it is given and
+                returning its text encoding
+            compression: The document's compressionAlgorithm
+
+        Returns:
+            The path, compression and encoding of the stored document
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        path = self._document_path(document_id)
+        temp_path = path.with_suffix(path.suffix + ".part")
+
+        with open(temp_path, "wb") as spool:
+            encoding = download(spool)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            index = self._load_index()
+            index["documents"][document_id] = {
+                "compression": compression, "encoding": encoding, "downloaded_at": time.time()
+            }
+            self._prune(index)
+            self._save_index(index)
+
+        return path, compression, encoding
+
+    def _prune(self, index: Dict[str, Dict[str, Any]]) -> None:
+        expired_before = time.time() - self.max_age
+
+        for document_id, meta in list(index["documents"].items()):
+            if meta["downloaded_at"] < expired_before:
+                self._document_path(document_id).unlink(missing_ok=True)
+                del index["documents"][document_id]
+
+        for report_id, meta in list(index["reports"].items()):
+            if meta["requested_at"] < expired_before:
+                del index["reports"][report_id]
+
 class PayloadBuilder:
     """Builds payloads for Amazon listing operations."""
     
@@ -273,30 +400,45 @@ class AmazonListingManager:
             "lwa_app_id": self.client_id,
             "lwa_client_secret": self.client_secret,
         }
-        self.session = requests.session()
+        self.session = transport.session_for("https://sellingpartnerapi-eu.amazon.com")
+        self.token_manager = token_manager_for(
+            ("amazon", self.client_id, self.refresh_token), self._fetch_access_token, name="Amazon LWA"
+        )
         self.max_retries = 3
         self.retry_delay = 2
         self.timeout = 300  # 5 minutes timeout for report generation
+        self.report_poll_interval = 30
+        self.feed_poll_interval = 30
+        self.feed_timeout = 1800  # feeds of thousands of messages take a while to process
+        self.feed_max_messages = 10000  # JSON_LISTINGS_FEED message limit
+        self.report_download_chunk = 1024 * 1024  # bytes written to the report spool file at once
+        self.report_max_age = AMAZON_REPORT_MAX_AGE
+        self.report_cache = ReportCache(AMAZON_REPORT_CACHE_DIR, self.report_max_age)
+        self.listings_as_of: Optional[float] = None  # epoch creation time of the last listings report read
         self.chunk_size = 20
         self.max_workers = 5
 
-    def get_access_token(self):
+    def _fetch_access_token(self) -> Tuple[str, int]:
         """
-        The function `get_access_token` retrieves an access token by sending a POST request to a specified
-        URL with necessary parameters.
-        :return: The function `get_access_token` is returning the access token obtained from the API
-        response after making a POST request to the token URL with the provided payload containing the
-        client ID, client secret, and refresh token.
+        Exchanges the refresh token for a new LWA access token.
+        :return: The access token and its lifetime in seconds.
         """
         token_url = "https://api.amazon.com/auth/o2/token"
         payload = f"grant_type=refresh_token&client_id={self.client_id}&client_secret={self.client_secret}&refresh_token={self.refresh_token}"
         headers = {"Content-Type": "application/x-www-form-urlencoded;charset=UTF-8"}
-        token_response = requests.request(
-            "POST", token_url, headers=headers, data=payload, timeout=300
+        token_response = transport.request(
+            "POST", token_url, headers=headers, data=payload
         )
         response_content = json.loads(token_response.text)
-        access_token_data = response_content["access_token"]
-        return access_token_data
+        return response_content["access_token"], response_content.get("expires_in", 3600)
+
+    def get_access_token(self):
+        """
+        The function `get_access_token` returns the cached LWA access token, fetching a new one
+        only when the cached token is about to expire.
+        :return: The access token to send in the `x-amz-access-token` header.
+        """
+        return self.token_manager.get()
 
     def request_data(
         self,
@@ -332,20 +474,27 @@ class AmazonListingManager:
             "x-amz-access-token": f"{access_token}",
             "x-amz-date": formatted_time,
         }
+        rate_key = endpoint_key(operation_uri) if operation_uri else None
+        token_refreshed = False
         while True:
+            rate_limiter.acquire("amazon", rate_key)
             if session_data:
-                session_data.headers = headers
+                # Headers go per request, the session is shared with other clients
                 try:
-                    init_request = session_data.get(f"{request_url}", data=payload)
+                    init_request = session_data.get(
+                        f"{request_url}", headers=headers, data=payload, timeout=transport.timeout
+                    )
                 except ConnectionError:
                     logger.error(
                         "Amazon request had a ConnectionError, sleeping for 5 seconds!"
                     )
                     time.sleep(5)
+                    continue
             else:
-                init_request = requests.request(
+                init_request = transport.request(
                     method, f"{request_url}", headers=headers, data=payload, timeout=30
                 )
+            rate_limiter.update("amazon", rate_key, init_request.status_code, init_request.headers)
             if init_request.status_code in (200, 400):
                 if init_request.text:
                     jsonify = json.loads(init_request.text)
@@ -354,9 +503,16 @@ class AmazonListingManager:
                     jsonify = None
                 return jsonify
             if init_request.status_code == 403:
-                session_data.headers["x-amz-access-token"] = access_token
+                if token_refreshed:
+                    logger.error(f"SP-API rejected a fresh access token || Reason: {init_request.text}")
+                    return None
+                # The cached token may have been revoked, fetch a new one once
+                self.token_manager.invalidate()
+                headers["x-amz-access-token"] = self.get_access_token()
+                token_refreshed = True
             elif init_request.status_code == 429:
-                time.sleep(65)
+                # The limiter pauses this operation before the next attempt
+                continue
             else:
                 error_message = json.loads(init_request.text)["errors"][0]["message"]
                 if re.search("not found", error_message):
@@ -442,14 +598,15 @@ class AmazonListingManager:
 
         return attrs
 
-    @Retry
     def get_product_definitions(self, category_name: str) -> Dict[str, Any]:
         """Get product type definitions from Amazon."""
-        product_definitions = ProductTypeDefinitions().search_definitions_product_types(
-            itemName=category_name,
-            marketplaceIds=[self.marketplace_id],
-            searchLocale="tr_TR",
-            locale="tr_TR",
+        product_definitions = self.retry(
+            lambda: ProductTypeDefinitions().search_definitions_product_types(
+                itemName=category_name,
+                marketplaceIds=[self.marketplace_id],
+                searchLocale="tr_TR",
+                locale="tr_TR",
+            )
         )
         
         if not product_definitions.payload['productTypes']:
@@ -556,37 +713,129 @@ class AmazonListingManager:
             for item in report_data
         )
 
-    async def get_report_async(self, report_type: str) -> ListingReport:
-        """Asynchronously create and retrieve a report."""
+    def _create_report(self, report_type: str, data_start_time: Optional[datetime] = None) -> str:
+        """Request a new report, limited to data changed since `data_start_time` if given, and return its ID."""
+        report_options = {}
+        if data_start_time:
+            report_options["dataStartTime"] = data_start_time.isoformat()
+        
+        report_request = self.retry(
+            lambda: ReportsV2().create_report(
+                reportType=report_type,
+                marketplaceIds=[self.marketplace_id],
+                **report_options
+            )
+        )
+        report_id = report_request.payload["reportId"]
+        self.report_cache.remember_report(report_id, data_start_time)
+        return report_id
+
+    def find_recent_report(self, report_type: str, data_start_time: Optional[datetime] = None) -> Optional[ListingReport]:
+        """
+        Look for a finished report of `report_type` created within `report_max_age` that
+        covers `data_start_time`, so the minutes of report generation can be skipped.
+
+        Returns:
+            The newest matching report, or None if there is none or the lookup failed
+        """
+        if self.report_max_age <= 0:
+            return None
+
+        created_since = datetime.now(timezone.utc) - timedelta(seconds=self.report_max_age)
         try:
-            # Create report request
-            report_request = self.retry(
-                lambda: ReportsV2().create_report(
-                    reportType=report_type,
-                    marketplaceIds=[self.marketplace_id],
+            # A single attempt, a failed lookup only costs a new report
+            response = ReportsV2().get_reports(
+                reportTypes=[report_type],
+                processingStatuses=["DONE"],
+                marketplaceIds=[self.marketplace_id],
+                createdSince=created_since,
+            )
+        except Exception as e:
+            logger.warning(f"Could not look up recent {report_type} reports: {str(e)}")
+            return None
+
+        reports = sorted(response.payload.get("reports", []), key=lambda report: report["createdTime"], reverse=True)
+
+        for report in reports:
+            if report.get("reportDocumentId") and self.report_cache.covers(report, data_start_time):
+                logger.info(f"Reusing {report_type} report {report['reportId']} created at {report['createdTime']}")
+                return ListingReport(
+                    report_id=report["reportId"],
+                    document_id=report["reportDocumentId"],
+                    status="DONE",
+                    created_at=_as_utc(report["createdTime"])
                 )
+
+        return None
+
+    def _check_report(self, report_id: str) -> Optional[ListingReport]:
+        """Return the finished report, or None while it is still being processed."""
+        report_status = self.retry(
+            lambda: ReportsV2().get_report(reportId=report_id)
+        )
+        
+        if report_status.payload["processingStatus"] == "DONE":
+            return ListingReport(
+                report_id=report_id,
+                document_id=report_status.payload["reportDocumentId"],
+                status="DONE",
+                created_at=_as_utc(report_status.payload.get("createdTime"))
             )
             
-            report_id = report_request.payload["reportId"]
+        elif report_status.payload["processingStatus"] == "CANCELLED":
+            raise ListingFetchError("Report generation was cancelled")
+        
+        return None
+
+    def get_report(self, report_type: str, data_start_time: Optional[datetime] = None) -> ListingReport:
+        """Reuse a recent report or create one and block until it is ready."""
+        try:
+            report = self.find_recent_report(report_type, data_start_time)
+            if report:
+                return report
+
+            requested_at = datetime.now(timezone.utc)
+            report_id = self._create_report(report_type, data_start_time)
             start_time = time.time()
             
             # Wait for report completion
             while time.time() - start_time < self.timeout:
-                report_status = self.retry(
-                    lambda: ReportsV2().get_report(reportId=report_id)
-                )
+                report = self._check_report(report_id)
+                if report:
+                    report.created_at = report.created_at or requested_at
+                    return report
                 
-                if report_status.payload["processingStatus"] == "DONE":
-                    return ListingReport(
-                        report_id=report_id,
-                        document_id=report_status.payload["reportDocumentId"],
-                        status="DONE"
-                    )
-                    
-                elif report_status.payload["processingStatus"] == "CANCELLED":
-                    raise ListingFetchError("Report generation was cancelled")
+                time.sleep(self.report_poll_interval)
+            
+            raise ListingFetchError("Report generation timed out")
+            
+        except Exception as e:
+            self._handle_api_error("report generation", e)
+
+    async def get_report_async(self, report_type: str, data_start_time: Optional[datetime] = None) -> ListingReport:
+        """
+        Asynchronously create and retrieve a report.
+
+        The SP-API SDK is blocking, so its calls run in worker threads while the
+        polling waits on the event loop.
+        """
+        try:
+            report = await asyncio.to_thread(self.find_recent_report, report_type, data_start_time)
+            if report:
+                return report
+
+            requested_at = datetime.now(timezone.utc)
+            report_id = await asyncio.to_thread(self._create_report, report_type, data_start_time)
+            start_time = time.time()
+            
+            # Wait for report completion
+            while time.time() - start_time < self.timeout:
+                report = await asyncio.to_thread(self._check_report, report_id)
+                if report:
+                    report.created_at = report.created_at or requested_at
+                    return report
                 
-                await asyncio.sleep(30)
+                await asyncio.sleep(self.report_poll_interval)
             
             raise ListingFetchError("Report generation timed out")
             
@@ -611,6 +860,102 @@ class AmazonListingManager:
         except Exception as e:
             self._handle_api_error("report processing", e)
 
+    @staticmethod
+    def read_report_rows(binary: BinaryIO, compression: Optional[str] = None,
+                         encoding: str = "utf-8") -> Iterator[Dict[str, str]]:
+        """
+        Lazily read the rows of a tab separated report.
+
+        Args:
+            binary: The report document as a binary file object
+            compression: The document's compressionAlgorithm, "GZIP" or None
+            encoding: Text encoding of the document, a UTF-8 BOM is dropped either way
+
+        Yields:
+            One dict per report row, keyed by the header columns
+        """
+        if compression == "GZIP":
+            binary = gzip.GzipFile(fileobj=binary)
+
+        if codecs.lookup(encoding).name == "utf-8":
+            encoding = "utf-8-sig"
+
+        text = io.TextIOWrapper(binary, encoding=encoding, newline="")
+        try:
+            reader = csv.DictReader(text, delimiter="\t")
+
+            # Rows carry every header column, checking the header validates them all
+            if reader.fieldnames is not None:
+                missing = {"product-id", "seller-sku", "listing-id", "quantity", "price"} - set(reader.fieldnames)
+                if missing:
+                    raise ListingFetchError(f"Invalid report data structure, missing columns: {sorted(missing)}")
+
+            yield from reader
+        finally:
+            text.detach()
+
+    def _download_report(self, url: str, spool: BinaryIO) -> str:
+        """Stream a report document into `spool` and return its text encoding."""
+        with transport.get(url, stream=True) as response:
+            response.raise_for_status()
+
+            for chunk in response.iter_content(chunk_size=self.report_download_chunk):
+                spool.write(chunk)
+
+            encoding = response.encoding or "iso-8859-1"
+
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            encoding = "iso-8859-1"
+
+        return encoding
+
+    def iter_report_rows(self, document_id: str) -> Iterator[Dict[str, str]]:
+        """
+        Yield the rows of a report document one by one, decompressing and decoding as
+        they are read.
+
+        The document is read from the report cache, or downloaded into it first. With
+        the cache disabled it is downloaded to a temporary file.
+        """
+        cached = self.report_cache.document(document_id) if self.report_max_age > 0 else None
+
+        if cached is None:
+            document = self.retry(
+                lambda: ReportsV2().get_report_document(reportDocumentId=document_id)
+            )
+            compression = document.payload.get("compressionAlgorithm")
+
+            if self.report_max_age <= 0:
+                with tempfile.TemporaryFile() as spool:
+                    encoding = self._download_report(document.payload["url"], spool)
+                    spool.seek(0)
+                    yield from self.read_report_rows(spool, compression, encoding)
+                return
+
+            cached = self.report_cache.store_document(
+                document_id, lambda spool: self._download_report(document.payload["url"], spool), compression
+            )
+
+        path, compression, encoding = cached
+        with open(path, "rb") as binary:
+            yield from self.read_report_rows(binary, compression, encoding)
+
+    def iter_listings(self, rows: Iterator[Dict[str, str]],
+                      status_filter: Optional[List[str]] = None) -> Iterator[ProductData]:
+        """Normalize report rows into products, skipping FBA SKUs and statuses outside `status_filter`."""
+        for row in rows:
+            if status_filter and row.get("status", "ACTIVE") not in status_filter:
+                continue
+
+            if "_fba" in row["seller-sku"]:
+                continue
+
+            product = self.process_product_data(row)
+            if product:
+                yield product
+
     def process_product_data(self, raw_data: Dict[str, Any]) -> ProductData:
         """Process raw product data into structured format."""
         try:
@@ -632,14 +977,20 @@ class AmazonListingManager:
             logger.error(f"Error processing product data: {str(e)}")
             return None
 
-    async def fetch_catalog_data_batch(self, skus: List[str]) -> List[Dict[str, Any]]:
-        """Fetch catalog data for a batch of SKUs."""
+    def fetch_catalog_data_batch(self, skus: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch catalog data for a batch of SKUs.
+
+        Returns:
+            Dict of the form {"catalog": {asin: catalog item}}, ready to be merged
+            with the results of the other batches
+        """
+        sku_string = ",".join(skus)
         try:
             catalog_item = CatalogItems()
             catalog_item.version = CatalogItemsVersion.V_2022_04_01
             
-            sku_string = ",".join(skus)
-            response = await self.retry(
+            response = self.retry(
                 lambda: catalog_item.search_catalog_items(
                     marketplaceIds=[self.marketplace_id],
                     includedData="attributes,identifiers,images,productTypes,summaries,relationships,dimensions,salesRanks",
@@ -651,17 +1002,19 @@ class AmazonListingManager:
                 )
             )
             
-            return response.payload.get("items", [])
+            return {"catalog": {item["asin"]: item for item in response.payload.get("items", [])}}
             
         except Exception as e:
             self._handle_api_error(f"catalog data fetch for SKUs {sku_string}", e)
-            return []
+            return {}
 
+    @emits_records("amazon")
     def get_listings(self, 
                           every_product: bool = False,
                           include_inventory: bool = False,
                           include_pricing: bool = False,
-                          status_filter: Optional[List[str]] = None) -> List[ProductData]:
+                          status_filter: Optional[List[str]] = None,
+                          modified_since: Optional[datetime] = None) -> List[ProductData]:
         """
         Enhanced method to retrieve Amazon listings with various options and filters.
         
@@ -670,112 +1023,136 @@ class AmazonListingManager:
             include_inventory (bool): Include current inventory levels
             include_pricing (bool): Include current pricing information
             status_filter (List[str]): Filter products by status (e.g., ['ACTIVE', 'INACTIVE'])
+            modified_since (datetime): Report only listings changed since then, as the
+                report's dataStartTime
             
         Returns:
-            List[ProductData]: List of processed product data
+            List[ProductData]: List of processed product data, current as of
+                `listings_as_of` which may predate the call when a recent report is reused
         """
+        self.listings_as_of = None
         try:
             # Get basic report
-            report = asyncio.run(self.get_report_async(ReportType.GET_MERCHANT_LISTINGS_ALL_DATA))
-            report_document = self.retry(
-                lambda: ReportsV2().get_report_document(
-                    reportDocumentId=report.document_id,
-                    download=True,
-                    decrypt=True,
-                )
+            report = self.get_report(ReportType.GET_MERCHANT_LISTINGS_ALL_DATA, modified_since)
+            return self.listings_from_report(
+                report, every_product, include_inventory, include_pricing, status_filter
             )
             
-            # Process report data
-            raw_data = self.process_report_document(report_document)
+        except Exception as e:
+            self._handle_api_error("listing retrieval", e)
+            return []
+
+    async def get_listings_async(self, 
+                                 every_product: bool = False,
+                                 include_inventory: bool = False,
+                                 include_pricing: bool = False,
+                                 status_filter: Optional[List[str]] = None,
+                                 modified_since: Optional[datetime] = None) -> List[ProductData]:
+        """Coroutine version of `get_listings`, the report wait does not hold a thread."""
+        self.listings_as_of = None
+        try:
+            report = await self.get_report_async(ReportType.GET_MERCHANT_LISTINGS_ALL_DATA, modified_since)
+            return await asyncio.to_thread(
+                self.listings_from_report,
+                report, every_product, include_inventory, include_pricing, status_filter
+            )
             
-            # Filter by status if needed
-            if status_filter:
-                raw_data = [
-                    item for item in raw_data 
-                    if item.get("status", "ACTIVE") in status_filter
-                ]
+        except Exception as e:
+            self._handle_api_error("listing retrieval", e)
+            return []
+
+    def listings_from_report(self,
+                             report: ListingReport,
+                             every_product: bool = False,
+                             include_inventory: bool = False,
+                             include_pricing: bool = False,
+                             status_filter: Optional[List[str]] = None) -> List[ProductData]:
+        """
+        Download a finished listings report and build the product list from it.
+
+        The report is streamed row by row, so only the resulting products are held in
+        memory and not the report text or its parsed rows. The report's creation time
+        is kept in `listings_as_of` for the sync marks.
+        """
+        self.listings_as_of = report.created_at.timestamp() if report.created_at else None
+        products = list(self.iter_listings(self.iter_report_rows(report.document_id), status_filter))
+        
+        if not every_product:
+            return products
+        
+        # Get SKUs for detailed data
+        skus = [p["sku"] for p in products if p]
+        
+        # Fetch detailed data in parallel
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Split SKUs into chunks
+            sku_chunks = list(self.chunk_list(skus, self.chunk_size))
             
-            # Process basic product data
-            products = [
-                self.process_product_data(item) 
-                for item in raw_data 
-                if not re.search(r"\_fba", item["seller-sku"])
-            ]
+            # Create tasks for parallel execution
+            tasks = []
             
-            if not every_product:
-                return products
+            # Catalog data tasks
+            if every_product:
+                tasks.extend([
+                    executor.submit(self.fetch_catalog_data_batch, chunk)
+                    for chunk in sku_chunks
+                ])
             
-            # Get SKUs for detailed data
-            skus = [p["sku"] for p in products if p]
+            # Inventory data tasks
+            if include_inventory:
+                tasks.extend([
+                    executor.submit(self.fetch_inventory_data_batch, chunk)
+                    for chunk in sku_chunks
+                ])
             
-            # Fetch detailed data in parallel
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Split SKUs into chunks
-                sku_chunks = list(self.chunk_list(skus, self.chunk_size))
-                
-                # Create tasks for parallel execution
-                tasks = []
-                
-                # Catalog data tasks
-                if every_product:
-                    tasks.extend([
-                        executor.submit(self.fetch_catalog_data_batch, chunk)
-                        for chunk in sku_chunks
-                    ])
-                
-                # Inventory data tasks
-                if include_inventory:
-                    tasks.extend([
-                        executor.submit(self.fetch_inventory_data_batch, chunk)
-                        for chunk in sku_chunks
-                    ])
-                
-                # Pricing data tasks
-                if include_pricing:
-                    tasks.extend([
-                        executor.submit(self.fetch_pricing_data_batch, chunk)
-                        for chunk in sku_chunks
-                    ])
-                
-                # Wait for all tasks to complete
-                results = {}
-                for future in as_completed(tasks):
-                    try:
-                        data = future.result()
-                        results.update(data)
-                    except Exception as e:
-                        logger.error(f"Error in parallel execution: {str(e)}")
-            
-            # Merge all data
-            self.merge_product_data(products, results)
-            
-            logger.info(f"Successfully fetched {len(products)} products with detailed data")
-            return products
+            # Pricing data tasks
+            if include_pricing:
+                tasks.extend([
+                    executor.submit(self.fetch_pricing_data_batch, chunk)
+                    for chunk in sku_chunks
+                ])
             
-        except Exception as e:
-            self._handle_api_error("listing retrieval", e)
-            return []
+            # Wait for all tasks to complete, every batch adds to the same data kinds
+            results = {}
+            for future in as_completed(tasks):
+                try:
+                    data = future.result()
+                    for kind, items in data.items():
+                        results.setdefault(kind, {}).update(items)
+                except Exception as e:
+                    logger.error(f"Error in parallel execution: {str(e)}")
+        
+        # Merge all data
+        self.merge_product_data(products, results)
+        
+        logger.info(f"Successfully fetched {len(products)} products with detailed data")
+        return products
+
+    @staticmethod
+    def chunk_list(items: List[Any], size: int):
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
 
     def merge_product_data(self, products: List[ProductData], 
                           additional_data: Dict[str, Any]) -> None:
-        """Merge additional data into product objects."""
+        """Merge additional data into product dicts, catalog items are keyed by ASIN."""
         for product in products:
             if not product:
                 continue
                 
-            sku = product.basic_info["sku"]
+            sku = product["sku"]
             
             # Merge catalog data
-            if "catalog" in additional_data and sku in additional_data["catalog"]:
-                product.catalog_data = additional_data["catalog"][sku]
+            if "catalog" in additional_data and product["id"] in additional_data["catalog"]:
+                product["catalog_data"] = additional_data["catalog"][product["id"]]
             
             # Merge inventory data
             if "inventory" in additional_data and sku in additional_data["inventory"]:
-                product.inventory_data = additional_data["inventory"][sku]
+                product["inventory_data"] = additional_data["inventory"][sku]
             
             # Merge pricing data
             if "pricing" in additional_data and sku in additional_data["pricing"]:
-                product.pricing_data = additional_data["pricing"][sku]
+                product["pricing_data"] = additional_data["pricing"][sku]
 
     def export_listings(self, products: List[ProductData], 
                        format: str = "json",
@@ -945,6 +1322,169 @@ class AmazonListingManager:
             ]
         }
 
+    def update_listings(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Update price and quantity of many listings through JSON_LISTINGS_FEEDs.
+
+        Every product becomes a PATCH message carrying the same patches as
+        `update_listing`, so a change set of thousands of SKUs costs a few feed calls
+        instead of a `patch_listings_item` call per SKU.
+
+        Args:
+            products: Product dicts with sku, quantity and price
+
+        Returns:
+            Dict mapping each SKU to True, or to a {"success", "message"} dict if it failed
+        """
+        messages = {
+            product["sku"]: {"sku": product["sku"], "operationType": "PATCH", **self._build_update_payload(product)}
+            for product in products
+        }
+        return self.submit_listing_messages(list(messages.values()))
+
+    def create_listings(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Create many listings through JSON_LISTINGS_FEEDs, one UPDATE message per product.
+
+        Args:
+            products: Full product data dicts, as `add_listing` takes them
+
+        Returns:
+            Dict mapping each stock code to True, or to a {"success", "message"} dict if it failed
+        """
+        messages = []
+        results = {}
+        product_types = {}
+
+        for product_data in products:
+            product_sku = product_data.get("stockCode")
+            try:
+                category_name = product_data["categoryName"]
+                # Products of one category share a product type, look it up once
+                if category_name not in product_types:
+                    product_types[category_name] = self.get_product_definitions(category_name)["name"]
+                product_type = product_types[category_name]
+
+                images = self.process_product_images(product_data["images"])
+                attrs = self.extract_product_attributes(product_data["attributes"])
+                payload = self.build_base_payload(product_data, product_type, attrs, images)
+                payload = self.add_category_specific_attributes(payload, product_type, attrs, product_data)
+
+                messages.append({"sku": product_sku, "operationType": "UPDATE", **payload})
+            except Exception as e:
+                logger.error(f"Error preparing listing for SKU {product_sku}: {str(e)}")
+                results[product_sku] = {"success": False, "message": str(e)}
+
+        results.update(self.submit_listing_messages(messages))
+        return results
+
+    def build_listings_feed(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Wrap listing messages into a JSON_LISTINGS_FEED document, numbering them from 1."""
+        return {
+            "header": {"sellerId": self.amazon_sa_id, "version": "2.0", "issueLocale": "en_US"},
+            "messages": [
+                {"messageId": message_id, **message} for message_id, message in enumerate(messages, 1)
+            ],
+        }
+
+    def _submit_feed(self, document: Dict[str, Any]) -> str:
+        """Upload a feed document, create the feed and return its ID."""
+        content = json.dumps(document, ensure_ascii=False).encode("utf-8")
+
+        _, feed = self.retry(
+            lambda: Feeds().submit_feed(
+                "JSON_LISTINGS_FEED",
+                io.BytesIO(content),
+                content_type="application/json; charset=UTF-8",
+                marketplaceIds=[self.marketplace_id],
+            )
+        )
+        return feed.payload["feedId"]
+
+    def _check_feed(self, feed_id: str) -> Optional[str]:
+        """Return the processing report document ID, or None while the feed is still being processed."""
+        feed = self.retry(lambda: Feeds().get_feed(feedId=feed_id))
+        status = feed.payload["processingStatus"]
+
+        # A fatal feed can still carry a report explaining why
+        if status in ("DONE", "FATAL") and feed.payload.get("resultFeedDocumentId"):
+            return feed.payload["resultFeedDocumentId"]
+
+        if status in ("CANCELLED", "FATAL"):
+            raise ListingFetchError(f"Feed {feed_id} ended with status {status}")
+
+        return None
+
+    def get_feed_report(self, feed_id: str) -> Dict[str, Any]:
+        """Wait for a feed to be processed and return its processing report."""
+        start_time = time.time()
+
+        while time.time() - start_time < self.feed_timeout:
+            document_id = self._check_feed(feed_id)
+            if document_id:
+                return json.loads(self.retry(lambda: Feeds().get_feed_result_document(document_id)))
+
+            time.sleep(self.feed_poll_interval)
+
+        raise ListingFetchError(f"Feed {feed_id} processing timed out")
+
+    @staticmethod
+    def feed_outcomes(report: Dict[str, Any], skus: List[str]) -> Dict[str, Any]:
+        """
+        Map a JSON_LISTINGS_FEED processing report to per-SKU outcomes.
+
+        Args:
+            report: The processing report, whose issues refer to messages by messageId
+            skus: SKUs of the feed's messages, message N being skus[N - 1]
+
+        Returns:
+            Dict mapping each SKU to True, or to a {"success", "message"} dict for the
+            SKUs whose message has ERROR issues
+        """
+        errors: Dict[int, List[str]] = {}
+        for issue in report.get("issues", []):
+            if issue.get("severity") == "ERROR" and issue.get("messageId") is not None:
+                errors.setdefault(int(issue["messageId"]), []).append(issue.get("message") or issue.get("code", ""))
+
+        return {
+            sku: {"success": False, "message": "; ".join(errors[message_id])} if message_id in errors else True
+            for message_id, sku in enumerate(skus, 1)
+        }
+
+    def submit_listing_messages(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Send listing messages as JSON_LISTINGS_FEEDs of up to `feed_max_messages` each.
+
+        All feeds are submitted before the first one is waited on, so they are processed
+        side by side. A feed that cannot be submitted or processed fails all its SKUs.
+
+        Returns:
+            Dict mapping each SKU to True, or to a {"success", "message"} dict if it failed
+        """
+        results = {}
+        submitted = []
+
+        for chunk in self.chunk_list(messages, self.feed_max_messages):
+            skus = [message["sku"] for message in chunk]
+            try:
+                submitted.append((self._submit_feed(self.build_listings_feed(chunk)), skus))
+            except Exception as e:
+                logger.error(f"Failed to submit a listings feed of {len(skus)} SKUs: {str(e)}")
+                results.update({sku: {"success": False, "message": str(e)} for sku in skus})
+
+        for feed_id, skus in submitted:
+            try:
+                outcomes = self.feed_outcomes(self.get_feed_report(feed_id), skus)
+            except Exception as e:
+                logger.error(f"Listings feed {feed_id} failed: {str(e)}")
+                outcomes = {sku: {"success": False, "message": str(e)} for sku in skus}
+
+            accepted = sum(1 for outcome in outcomes.values() if outcome is True)
+            logger.info(f"Listings feed {feed_id}: {accepted} of {len(skus)} SKUs accepted")
+            results.update(outcomes)
+
+        return results
+
 # Example usage:
 # if __name__ == "__main__":
 #     # Initialize the manager
@@ -0,0 +1,718 @@
+""" Async client layer. Coroutine versions of the fetch, update and create operations of
+ every platform client, all running on one event loop, so a single process can keep
+ hundreds of requests in flight without a thread for each of them.
+
+ Endpoints the sync clients call over plain HTTP are sent natively through httpx. The
+ SDK based operations (sp_api, zeep, the multi step create flows) have no async variant
+ and run in a small bounded thread pool instead. Sync code such as the TUI flow in
+ main.py reaches every coroutine through `run_sync`."""
+
+import asyncio
+import json
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from api import pttavm_api
+from api.pagination import Page
+from api.rate_limiter import endpoint_key, rate_limiter
+from api.trendyol_api import TrendyolAPIError
+from app.config import logger
+from app.config.constants import (
+    ASYNC_BLOCKING_CALLS,
+    ASYNC_MAX_IN_FLIGHT,
+    HTTP_CONNECT_RETRIES,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_POOL_MAXSIZE,
+    HTTP_READ_TIMEOUT,
+    PAGINATION_PAGE_RETRIES,
+    PAGINATION_RETRY_DELAY,
+)
+
+
+class AsyncTransport:
+    """
+    Async counterpart of `api.transport.HTTPTransport`.
+
+    One `httpx.AsyncClient` is kept per event loop, since a client's connections are
+    bound to the loop that opened them. Requests sent under a platform go through the
+    shared rate limiter, so sync and async callers draw from the same buckets.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = ASYNC_MAX_IN_FLIGHT,
+        max_keepalive_connections: int = HTTP_POOL_MAXSIZE,
+        timeout: httpx.Timeout = httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        connect_retries: int = HTTP_CONNECT_RETRIES,
+        rate_limit_retries: int = 3,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            max_connections: Open connections allowed across all hosts
+            max_keepalive_connections: Idle keep-alive connections kept
+            timeout: Default timeout applied when a request sets none
+            connect_retries: Retries for connection errors
+            rate_limit_retries: Times a 429 is retried after its bucket was paused,
+                the last rejection is returned to the caller
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_keepalive_connections
+        )
+        self.timeout = timeout
+        self.connect_retries = connect_retries
+        self.rate_limit_retries = rate_limit_retries
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def client(self) -> httpx.AsyncClient:
+        """Return the client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+
+        if client is None or client.is_closed:
+            client = self._clients[loop] = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=httpx.AsyncHTTPTransport(retries=self.connect_retries, limits=self.limits),
+                headers={"Accept-Encoding": "gzip, deflate"},
+            )
+
+        return client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        platform: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request through the client of the running loop.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            platform: Platform whose rate limit bucket the request is sent under,
+                no rate limiting is applied if None
+            endpoint: Endpoint key of the bucket, the platform wide bucket if None
+            **kwargs: Passed on to `httpx.AsyncClient.request`
+
+        Returns:
+            The response object
+        """
+        for attempt in range(self.rate_limit_retries + 1):
+            if platform:
+                await rate_limiter.acquire_async(platform, endpoint)
+
+            response = await self.client().request(method, url, **kwargs)
+
+            if not platform or not rate_limiter.update(platform, endpoint, response.status_code, response.headers):
+                break
+
+            # The limiter has paused the bucket, the next acquire waits as long as asked
+            logger.warning(f"{platform} rate limit reached on {endpoint or 'all endpoints'}, retrying...")
+
+        return response
+
+    async def aclose(self) -> None:
+        """Close the client of the running loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+# Process wide async transport shared by every async client
+async_transport = AsyncTransport()
+
+# Threads for SDK calls without an async variant, shared by every event loop
+_blocking_executor = ThreadPoolExecutor(max_workers=ASYNC_BLOCKING_CALLS, thread_name_prefix="async-blocking")
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking call in the bounded worker pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, partial(func, *args, **kwargs))
+
+
+async def gather_limited(aws: Iterable[Awaitable[Any]], limit: int = ASYNC_MAX_IN_FLIGHT) -> List[Any]:
+    """
+    Await many awaitables with at most `limit` running at once.
+
+    Returns:
+        Results in input order. Exceptions are returned in place of their result,
+        so one failure does not cancel the rest.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def limited(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(limited(aw) for aw in aws), return_exceptions=True)
+
+
+async def fetch_pages(
+    fetch_page: Callable[[int], Awaitable[Page]],
+    first_page: int = 0,
+    start_page: Optional[int] = None,
+    limit: int = ASYNC_MAX_IN_FLIGHT,
+    retries: int = PAGINATION_PAGE_RETRIES,
+    retry_delay: float = PAGINATION_RETRY_DELAY,
+    name: str = "",
+) -> List[Any]:
+    """
+    Async counterpart of `Paginator.fetch_all`.
+
+    The first page tells how many pages there are, the rest are requested at once.
+    Pages that still fail after `retries` extra attempts are skipped and logged.
+
+    Returns:
+        Items of every fetched page in page order
+    """
+    start_page = first_page if start_page is None else start_page
+
+    async def fetch_with_retries(number: int) -> Page:
+        for attempt in range(retries + 1):
+            try:
+                return await fetch_page(number)
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                logger.warning(f"{name} page {number} failed, retrying || Reason: {e}")
+                await asyncio.sleep(retry_delay * 2 ** attempt)
+
+    first = await fetch_with_retries(start_page)
+    last_page = first_page + (first.total_pages or 0) - 1
+    pages = await gather_limited(
+        (fetch_with_retries(number) for number in range(start_page + 1, last_page + 1)), limit
+    )
+
+    items = list(first.items)
+    for number, page in zip(range(start_page + 1, last_page + 1), pages):
+        if isinstance(page, Exception):
+            logger.error(f"{name} page {number} could not be fetched || Reason: {page}")
+            continue
+        items.extend(page.items)
+
+    return items
+
+
+class EventLoopThread:
+    """
+    A single event loop running in a background thread.
+
+    Sync callers submit coroutines to it with `run`, which keeps every async client on
+    the same loop even when the caller, like the textual TUI, runs a loop of its own.
+    """
+
+    def __init__(self, name: str = "async-clients"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name=self.name, daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run `coro` on the background loop and block until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started()).result(timeout)
+
+    def stop(self) -> None:
+        """Stop the background loop and wait for its thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if loop is None:
+            return
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+# Loop shared by every sync wrapper
+event_loop = EventLoopThread()
+
+
+def run_sync(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """Run a coroutine of the async layer from sync code."""
+    return event_loop.run(coro, timeout)
+
+
+class AsyncPlatformClient(ABC):
+    """
+    Coroutine facade over a sync platform client.
+
+    Subclasses implement every operation, natively on the loop where the platform has
+    plain HTTP endpoints and by wrapping the sync client otherwise. Products are updated
+    and created concurrently, up to `max_in_flight` at a time, and every operation has
+    a `*_sync` wrapper. Sync create functions run `create_in_flight` at a time.
+    """
+
+    platform = ""
+    # Sync create functions share files and client state, None lets them run `max_in_flight` at once
+    create_in_flight: Optional[int] = 1
+
+    def __init__(self, client: Any = None, max_in_flight: int = ASYNC_MAX_IN_FLIGHT):
+        """
+        Initialize the async client.
+
+        Args:
+            client: The sync platform client whose helpers and credentials are reused
+            max_in_flight: Requests kept open at once by a single operation
+        """
+        self.client = client
+        self.max_in_flight = max_in_flight
+
+    @abstractmethod
+    async def fetch_products(self, every_product: bool = False) -> List[Dict[str, Any]]:
+        """Fetch the platform catalog, full product data if `every_product`."""
+
+    @abstractmethod
+    async def update_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Update stock and price of many products, keyed by SKU."""
+
+    @abstractmethod
+    async def create_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Create many products, keyed by stock code."""
+
+    async def _run_per_product(
+        self, func: Callable[[Dict[str, Any]], Any], products: List[Dict[str, Any]], key: str, operation: str
+    ) -> Dict[str, bool]:
+        limit = self.max_in_flight if operation != "create" or self.create_in_flight is None else self.create_in_flight
+        outcomes = await gather_limited((run_blocking(func, product) for product in products), limit)
+        results = {}
+
+        for product, outcome in zip(products, outcomes):
+            # The sync per product calls log their own failures and return whether they succeeded
+            results[product.get(key)] = outcome is True
+            if isinstance(outcome, Exception):
+                logger.error(f"{self.platform} {operation} failed for {product.get(key)} || Reason: {outcome}")
+
+        return results
+
+    def fetch_products_sync(self, every_product: bool = False) -> List[Dict[str, Any]]:
+        return run_sync(self.fetch_products(every_product))
+
+    def update_products_sync(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        return run_sync(self.update_products(products))
+
+    def create_products_sync(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        return run_sync(self.create_products(products))
+
+
+class AsyncTrendyolClient(AsyncPlatformClient):
+    """Native async products and price-and-inventory endpoints of `TrendyolClient`."""
+
+    platform = "trendyol"
+    create_in_flight = None  # creates are stateless price-and-inventory updates
+
+    async def _request(self, endpoint: str, method: str = "GET", payload: Optional[Dict] = None) -> Dict:
+        response = await async_transport.request(
+            method,
+            f"{self.client.BASE_URL}/{self.client.store_id}{endpoint}",
+            headers=self.client.headers,
+            content=json.dumps(payload) if payload else None,
+            platform=self.platform,
+            endpoint=endpoint_key(endpoint),
+        )
+
+        if response.status_code == 200:
+            return response.json()
+        raise TrendyolAPIError(f"Request to {endpoint} failed with {response.status_code}: {response.text}")
+
+    async def _fetch_products_page(self, page: int, page_size: int, filters: str) -> Page:
+        data = await self._request(f"/products?page={page}&size={page_size}{filters}")
+        return Page(page, data['content'], int(data['totalPages']))
+
+    async def fetch_products(self, every_product: bool = False, filters: str = '') -> List[Dict[str, Any]]:
+        page_size = self.client.STOCK_PAGE_SIZE
+        items = await fetch_pages(
+            lambda page: self._fetch_products_page(page, page_size, filters),
+            limit=self.max_in_flight,
+            name="Trendyol",
+        )
+        return [self.client._to_product_data(item, every_product) for item in items]
+
+    async def _submit_batch(self, chunk: List[Dict]) -> str:
+        data = await self._request("/products/price-and-inventory", "POST", {"items": chunk})
+        return data['batchRequestId']
+
+    async def _wait_for_batches(self, batch_request_ids: List[str]) -> Dict[str, Dict]:
+        """Poll every outstanding batch at once each round, until all are processed."""
+        outstanding = list(batch_request_ids)
+        finished = {}
+        deadline = time.monotonic() + self.client.BATCH_TIMEOUT
+
+        while outstanding:
+            statuses = await gather_limited(
+                (self._request(f'/products/batch-requests/{batch_request_id}') for batch_request_id in outstanding),
+                self.max_in_flight,
+            )
+
+            for batch_request_id, batch_status in zip(list(outstanding), statuses):
+                if isinstance(batch_status, Exception):
+                    logger.error(f"Failed to check batch {batch_request_id}: {batch_status}")
+                elif self.client._is_batch_done(batch_status):
+                    finished[batch_request_id] = batch_status
+                    outstanding.remove(batch_request_id)
+
+            if not outstanding:
+                break
+
+            if time.monotonic() >= deadline:
+                logger.error(f"Timed out waiting for batches: {', '.join(outstanding)}")
+                break
+
+            await asyncio.sleep(self.client.BATCH_POLL_INTERVAL)
+
+        return finished
+
+    async def update_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Submit every price-and-inventory batch at once, then poll them together."""
+        items, skus, invalid = self.client._build_price_inventory_items(products)
+        chunks = self.client._chunk_items(items, self.client.PRICE_INVENTORY_BATCH_SIZE)
+        submitted = await gather_limited((self._submit_batch(chunk) for chunk in chunks), self.max_in_flight)
+        batch_request_ids = []
+
+        for chunk, batch_request_id in zip(chunks, submitted):
+            if isinstance(batch_request_id, Exception):
+                logger.error(f"Error submitting batch of {len(chunk)} products: {batch_request_id}")
+            else:
+                batch_request_ids.append(batch_request_id)
+
+        results = self.client._collect_batch_results(await self._wait_for_batches(batch_request_ids), items, skus)
+        results.update(invalid)
+        return results
+
+    async def create_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        # Trendyol has no create call here, products are pushed as price and inventory like App.create_products does
+        return await self._run_per_product(self.client.update_product, products, "sku", "create")
+
+
+class AsyncN11Client(AsyncPlatformClient):
+    """Native async product query of `N11RestAPI`, task based updates run in a worker."""
+
+    platform = "n11"
+    PAGE_SIZE = 50
+
+    async def _fetch_products_page(self, page: int) -> Page:
+        response = await async_transport.request(
+            "GET",
+            self.client.base_url + "ms/product-query",
+            params={"page": page, "size": self.PAGE_SIZE},
+            headers=self.client.headers,
+            platform=self.platform,
+            endpoint="ms/product-query",
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        return Page(page, data.get("content", []), data.get("totalPages", 0))
+
+    async def fetch_products(self, every_product: bool = False) -> List[Dict[str, Any]]:
+        products = await fetch_pages(self._fetch_products_page, first_page=1, limit=self.max_in_flight, name="N11")
+        return self.client.format_products(products, every_product)
+
+    async def update_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        # Tasks are already submitted in batches of a thousand SKUs, one worker is enough
+        return await run_blocking(self.client.update_products, products)
+
+    async def create_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        return await self._run_per_product(
+            lambda product_data: self.client.create_product(product_data=product_data), products, "stockCode", "create"
+        )
+
+
+class AsyncHepsiburadaClient(AsyncPlatformClient):
+    """`Hb_API` operations offloaded to the worker pool."""
+
+    platform = "hepsiburada"
+
+    async def fetch_products(self, every_product: bool = False) -> List[Dict[str, Any]]:
+        return await run_blocking(self.client.get_listings, every_product)
+
+    async def update_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        # Inventory uploads carry thousands of rows each, one worker is enough
+        return await run_blocking(self.client.update_listings, products)
+
+    async def create_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        return await self._run_per_product(
+            lambda product_data: self.client.create_listing(product_data=product_data), products, "stockCode", "create"
+        )
+
+
+class AsyncPazaramaClient(AsyncPlatformClient):
+    """`PazaramaAPIClient` operations offloaded to the worker pool."""
+
+    platform = "pazarama"
+
+    async def fetch_products(self, every_product: bool = False) -> List[Dict[str, Any]]:
+        return await run_blocking(self.client.get_products, every_product)
+
+    async def update_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        outcomes = await run_blocking(self.client.update_products, products)
+        return {code: outcome["success"] for code, outcome in outcomes.items()}
+
+    async def create_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        return await self._run_per_product(
+            lambda product_data: self.client.create_products(product_data=product_data), products, "stockCode", "create"
+        )
+
+
+class AsyncPttavmClient(AsyncPlatformClient):
+    """Native async multi-item StokFiyatGuncelle3 envelopes, the catalog stream is parsed in a worker."""
+
+    platform = "pttavm"
+    create_in_flight = None  # creates are stateless StokFiyatGuncelle3 calls
+    QUOTA_FAULT_RETRIES = 5  # times an envelope is resent after PTTAVM's per minute quota fault
+
+    async def fetch_products(self, every_product: bool = False) -> List[Dict[str, Any]]:
+        return await run_blocking(pttavm_api.getpttavm_procuctskdata, every_product)
+
+    async def _update_chunk(self, chunk: List[Dict[str, Any]]) -> Dict[str, bool]:
+        uri = 'StokFiyatGuncelle3'
+        payload = pttavm_api.soap_envelope(pttavm_api.stock_price_items_payload(chunk))
+
+        for attempt in range(self.QUOTA_FAULT_RETRIES + 1):
+            response = await async_transport.request(
+                "POST", pttavm_api.PTTAVM_URL, headers=pttavm_api.soap_headers(uri), content=payload,
+                platform=self.platform, endpoint=uri,
+            )
+
+            if response.status_code == 200:
+                outcomes = pttavm_api.update_results(response, len(chunk))
+                results = {product['sku']: success for product, success in zip(chunk, outcomes)}
+                logger.info(f"PTTAVM updated {sum(results.values())} of {len(chunk)} products")
+                return results
+
+            error_response = pttavm_api.fault_message(response)
+            if not pttavm_api.is_quota_fault(error_response):
+                break
+
+            # PTTAVM reports its per minute quota as a SOAP fault instead of a 429
+            rate_limiter.penalize(self.platform, uri)
+
+        logger.error(f"Request failure for {len(chunk)} PTTAVM products | Response: {error_response}")
+        return {product['sku']: False for product in chunk}
+
+    async def update_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Send up to UPDATE_BATCH_SIZE items per envelope and MAX_UPDATES_IN_FLIGHT envelopes at once."""
+        unique = list({product['sku']: product for product in products}.values())
+        batch_size = pttavm_api.UPDATE_BATCH_SIZE
+        chunks = [unique[start:start + batch_size] for start in range(0, len(unique), batch_size)]
+        outcomes = await gather_limited(
+            (self._update_chunk(chunk) for chunk in chunks), min(self.max_in_flight, pttavm_api.MAX_UPDATES_IN_FLIGHT)
+        )
+        results = {}
+
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Request failure for {len(chunk)} PTTAVM products | Response: {outcome}")
+                outcome = {}
+            # Items the response carries no flag for count as failed
+            results.update({product['sku']: outcome.get(product['sku']) is True for product in chunk})
+
+        return results
+
+    async def create_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        # PTTAVM has no create call here, products are pushed as stock and price like App.create_products does
+        return await self._run_per_product(
+            lambda product_data: pttavm_api.pttavm_updatedata(product_data=product_data), products, "sku", "create"
+        )
+
+
+class AsyncWooCommerceClient(AsyncPlatformClient):
+    """Native async products listing and products/batch calls of `WooCommerceAPIClient`."""
+
+    platform = "wordpress"
+
+    async def _request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        wcapi = self.client.wcapi
+        return await async_transport.request(
+            method,
+            wcapi._API__get_url(endpoint),
+            auth=(wcapi.consumer_key, wcapi.consumer_secret),
+            headers={"user-agent": wcapi.user_agent, "accept": "application/json"},
+            timeout=httpx.Timeout(wcapi.timeout, connect=HTTP_CONNECT_TIMEOUT),
+            platform=self.platform,
+            endpoint=endpoint_key(endpoint, depth=1),
+            **kwargs,
+        )
+
+    def _handle_api_response(self, response: httpx.Response, operation: str) -> Optional[Any]:
+        try:
+            if response.is_success:
+                return response.json()
+            logger.error(f"{operation} failed: Status {response.status_code}, Message: {response.text}")
+            return None
+        except json.JSONDecodeError:
+            logger.error(f"Failed to decode JSON response for {operation}")
+            return None
+
+    async def _fetch_products_page(self, page: int, every_product: bool) -> Page:
+        params = {"per_page": self.client.PAGE_SIZE, "page": page}
+        if not every_product:
+            params["_fields"] = self.client.STOCK_FIELDS
+
+        response = await self._request("GET", "products", params=params)
+        current_products = self._handle_api_response(response, "Products fetch")
+
+        if current_products is None:
+            raise ValueError(f"Products page {page} could not be fetched")
+
+        total_pages = response.headers.get("X-WP-TotalPages")
+        return Page(page, current_products, int(total_pages) if total_pages else None)
+
+    async def fetch_products(self, every_product: bool = False) -> List[Dict[str, Any]]:
+        products = await fetch_pages(
+            lambda page: self._fetch_products_page(page, every_product),
+            first_page=1,
+            limit=self.max_in_flight,
+            name="WordPress",
+        )
+        return self.client._filter_products(products, every_product)
+
+    async def _send_batch(self, operation: str, chunk: List[tuple]) -> Dict[str, bool]:
+        response = await self._request(
+            "POST", "products/batch", json={operation: [payload for _, payload in chunk]}
+        )
+        return self.client._batch_outcomes(
+            operation, chunk, self._handle_api_response(response, f"Batch {operation}")
+        )
+
+    async def _run_batches(self, operation: str, items: List[tuple]) -> Dict[str, bool]:
+        batch_size = self.client.BATCH_SIZE
+        chunks = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+        outcomes = await gather_limited((self._send_batch(operation, chunk) for chunk in chunks), self.max_in_flight)
+        results = {}
+
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Batch {operation} failed for {len(chunk)} products || Reason: {outcome}")
+                outcome = {sku: False for sku, _ in chunk}
+            results.update(outcome)
+
+        return results
+
+    async def update_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        items, results = self.client._build_update_items(products)
+        results.update(await self._run_batches("update", items))
+        return results
+
+    async def create_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        # Building a payload may look up categories, which is a blocking call
+        items = []
+        results = {}
+
+        for product_data in products:
+            try:
+                items.append(
+                    (product_data['stockCode'], await run_blocking(self.client._build_product_payload, product_data))
+                )
+            except Exception as e:
+                logger.error(f"Exception while preparing product: {str(e)}")
+                results[product_data.get('stockCode')] = False
+
+        results.update(await self._run_batches("create", items))
+        return results
+
+
+class AsyncAmazonClient(AsyncPlatformClient):
+    """`AmazonListingManager` with the report wait on the loop and SP-API calls in workers."""
+
+    platform = "amazon"
+
+    async def fetch_products(self, every_product: bool = False) -> List[Dict[str, Any]]:
+        return await self.client.get_listings_async(every_product=every_product)
+
+    async def update_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        # One JSON_LISTINGS_FEED carries every update, the feed wait runs in a worker
+        outcomes = await run_blocking(self.client.update_listings, products)
+        return {sku: outcome is True for sku, outcome in outcomes.items()}
+
+    async def create_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        # One JSON_LISTINGS_FEED carries every product, the feed wait runs in a worker
+        outcomes = await run_blocking(self.client.create_listings, products)
+        return {sku: outcome is True for sku, outcome in outcomes.items()}
+
+
+ASYNC_CLIENT_CLASSES = {
+    "trendyol": AsyncTrendyolClient,
+    "n11": AsyncN11Client,
+    "hepsiburada": AsyncHepsiburadaClient,
+    "pazarama": AsyncPazaramaClient,
+    "pttavm": AsyncPttavmClient,
+    "wordpress": AsyncWooCommerceClient,
+    "amazon": AsyncAmazonClient,
+}
+
+
+def build_async_clients(clients: Dict[str, Any], max_in_flight: int = ASYNC_MAX_IN_FLIGHT) -> Dict[str, AsyncPlatformClient]:
+    """
+    Wrap sync platform clients in their async clients.
+
+    Args:
+        clients: Platform name to sync client mapping, PTTAVM takes None as it is
+            a module of functions
+        max_in_flight: Requests kept open at once by a single operation
+
+    Returns:
+        Platform name to async client mapping
+    """
+    return {
+        platform: ASYNC_CLIENT_CLASSES[platform](client, max_in_flight)
+        for platform, client in clients.items()
+        if platform in ASYNC_CLIENT_CLASSES
+    }
+
+
+async def fetch_all(
+    async_clients: Dict[str, AsyncPlatformClient],
+    every_product: bool = False,
+    platforms: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch several platforms at once on the running loop.
+
+    Returns:
+        Platform name to product list mapping, None for platforms that failed
+    """
+    selected = [platform for platform in (platforms or async_clients) if platform in async_clients]
+    outcomes = await asyncio.gather(
+        *(async_clients[platform].fetch_products(every_product) for platform in selected), return_exceptions=True
+    )
+    data = {}
+
+    for platform, outcome in zip(selected, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Error loading data for platform '{platform}': {outcome}")
+            outcome = None
+        data[platform] = outcome
+
+    return data
+
+
+def fetch_all_sync(
+    async_clients: Dict[str, AsyncPlatformClient],
+    every_product: bool = False,
+    platforms: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    return run_sync(fetch_all(async_clients, every_product, platforms))
@@ -1,30 +1,30 @@
 import requests
 from app.config import logger
 from app.exceptions import APIError
-import time
+from api.rate_limiter import rate_limiter
+from api.transport import transport
 from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
 
 class BaseAPI:
-    def __init__(self, base_url: str, api_key: Optional[str] = None):
+    def __init__(self, base_url: str, api_key: Optional[str] = None, platform: Optional[str] = None):
         self.base_url = base_url
+        self.platform = platform or urlsplit(base_url).netloc
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = transport.session_for(base_url)
+        self.headers = {}
         if api_key:
-            self.session.headers.update({"Authorization": f"Bearer {api_key}"})
-        self.last_request_time = 0
+            self.headers["Authorization"] = f"Bearer {api_key}"
 
     def _rate_limit(self):
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < 1:
-            time.sleep(1 - elapsed)
-        self.last_request_time = time.time()
+        rate_limiter.acquire(self.platform)
 
     def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, data: Optional[Dict] = None) -> Dict[str, Any]:
         self._rate_limit()
         url = f"{self.base_url}/{endpoint}"
         try:
-            response = self.session.request(method, url, params=params, json=data)
+            response = self.session.request(method, url, params=params, json=data, headers=self.headers, timeout=transport.timeout)
+            rate_limiter.update(self.platform, None, response.status_code, response.headers)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -10,11 +10,18 @@ import json
 import requests
 from circuitbreaker import CircuitBreaker
 from app.config.logging_init import logger
+from app.product_record import emits_records
+from api.transport import transport
 
 products = []
 
 class Hb_API:
 
+    INVENTORY_UPLOAD_BATCH_SIZE = 4000  # Rows sent per /inventory-uploads request
+    INVENTORY_POLL_INTERVAL = 5
+    INVENTORY_POLL_TIMEOUT = 900
+    LISTINGS_PAGE_SIZE = 1000  # Max limit accepted by listing-external
+
     def __init__(self):
 
         self.data = None
@@ -324,12 +331,12 @@ class Hb_API:
         try:
             with circuit_breaker:
 
-                api_request = requests.request(
+                api_request = transport.request(
                     request_type,
                     url,
                     headers=self.headers,
                     data=payload,
-                    timeout=3000
+                    platform="hepsiburada"
                 )
 
                 if api_request.status_code == 200:
@@ -355,72 +362,153 @@ class Hb_API:
                         delay} seconds""")
             time.sleep(delay)
 
-    def get_listings(self, everyproduct: bool = False) -> list:
+    def iter_listing_pages(self, limit: int = LISTINGS_PAGE_SIZE):
         """
-        Retrieves stock data for products from HepsiBurada.
+        Yields every page of listing-external listings.
+
+        Pages are requested by offset until `totalCount` listings have been
+        read, so catalogs larger than a single page are fetched completely.
 
         Args:
-            everyproduct (bool, optional): If True, returns all product data. Defaults to False.
+            limit (int, optional): Listings requested per page.
+
+        Yields:
+            list: The listings of one page.
+
+        Raises:
+            ValueError: If a page request fails.
+        """
+
+        offset = 0
+
+        while True:
+
+            listings_request_raw = self.request_data(
+                subdomain=self.listing_external_url,
+                url_addons=f"?offset={offset}&limit={limit}",
+                request_type="GET",
+                payload_content=[],
+            )
+            if not listings_request_raw:
+
+                raise ValueError(f"Listings request at offset {offset} failed")
+
+            listings_data = json.loads(listings_request_raw.text)
+            listings = listings_data.get("listings") or []
+
+            if listings:
+
+                yield listings
+
+            offset += len(listings)
+
+            if not listings or offset >= listings_data.get("totalCount", 0):
+
+                break
+
+    def get_listing_index(self) -> dict:
+        """
+        Builds a merchantSku to listing map over every listing-external page.
 
         Returns:
-            list: A list of product data.
+            dict: Listings keyed by merchantSku, the first listing wins for duplicate SKUs.
         """
 
-        listings_list = []
-        # To get current updated stocks numbers 
-        listings_request_raw = self.request_data(
-                    subdomain=self.listing_external_url ,
-                    url_addons=f"?limit=1000",
-                    request_type="GET",
-                    payload_content=[],
-                )
-        listings_data = json.loads(listings_request_raw.text)
+        listing_index = {}
+
+        for listings in self.iter_listing_pages():
+
+            for listing in listings:
+
+                listing_index.setdefault(listing["merchantSku"], listing)
+
+        return listing_index
+
+    def iter_listings(self, everyproduct: bool = False):
+        """
+        Streams mpop products joined with their listing, page by page.
+
+        Args:
+            everyproduct (bool, optional): If True, yields all product data. Defaults to False.
+
+        Yields:
+            dict: One joined product, in the format returned by `get_listings`.
+        """
+
+        # To get current updated stocks numbers
+        listing_index = self.get_listing_index()
 
         page = 1
-        totalPages = 0
 
-        while page != 0:
+        while True:
 
-            try:
+            data_request_raw = self.request_data(
+                subdomain=self.mpop_url + f"product/api/products/all-products-of-merchant/{self.store_id}/",
+                url_addons=f"?size=100&page={page}",
+                request_type="GET",
+                payload_content=[],
+            )
+            formatted_data = json.loads(data_request_raw.text)
+            totalPages = formatted_data['totalPages']
 
-                if totalPages == page:
+            for data in formatted_data["data"]:
 
-                    page = 0
-                    break    
+                listing = listing_index.get(data["merchantSku"])
 
-                data_request_raw = self.request_data(
-                    subdomain=self.mpop_url + f"product/api/products/all-products-of-merchant/{self.store_id}/",
-                    url_addons=f"?size=100&page={page}",
-                    request_type="GET",
-                    payload_content=[],
-                )
-                formatted_data = json.loads(data_request_raw.text)
-                totalPages = formatted_data['totalPages']
+                if listing is None:
 
-                for data in formatted_data["data"]:
-                    for listing in listings_data['listings']:
-                        if listing['merchantSku'] == data["merchantSku"]:
-                            if not everyproduct:
-                            
-                                listings_list.append(
-                                    {
-                                        "id": data["hbSku"],
-                                        "sku": data["merchantSku"],
-                                        "quantity": listing.get('availableStock', 0),
-                                        "price": float(listing["price"]),
-                                    }
-                                )
-                            else:
+                    continue
+
+                if not everyproduct:
+
+                    yield {
+                        "id": data["hbSku"],
+                        "sku": data["merchantSku"],
+                        "quantity": listing.get('availableStock', 0),
+                        "price": float(listing["price"]),
+                    }
+
+                else:
 
-                                data['stock'] = listing.get('availableStock', 0)
-                                data['price'] = listing.get('price', 0)
-                                listings_list.append({"sku": data["merchantSku"], "data": data})                    
+                    data['stock'] = listing.get('availableStock', 0)
+                    data['price'] = listing.get('price', 0)
+                    yield {"sku": data["merchantSku"], "data": data}
 
-                page += 1         
+            page += 1
 
-            except Exception as e:
+            if page >= totalPages:
 
-                self.logger.error(f"Error fetching product data: {e}")
+                break
+
+    @emits_records("hepsiburada")
+    def get_listings(self, everyproduct: bool = False) -> list:
+        """
+        Retrieves stock data for products from HepsiBurada.
+
+        Args:
+            everyproduct (bool, optional): If True, returns all product data. Defaults to False.
+
+        Returns:
+            list: A list of product data.
+
+        Raises:
+            ValueError: If a page request fails, so a partial catalog is never
+            taken for a complete one.
+        """
+
+        listings_list = []
+
+        try:
+
+            for listing in self.iter_listings(everyproduct):
+
+                listings_list.append(listing)
+
+        except Exception as e:
+
+            # A failed page used to be retried forever, fail the fetch instead of returning part of the catalog
+            self.logger.error(f"Error fetching product data after {len(listings_list)} products: {e}")
+            raise
 
         if listings_list:
 
@@ -504,7 +592,7 @@ class Hb_API:
                             )
                         }
                         url = self.mpop_url + f"""ticket-api/api/integrator/import"""
-                        update_request_raw = requests.post(
+                        update_request_raw = transport.post(
                             url=url,
                             files=files,
                             headers=self.headers
@@ -557,65 +645,147 @@ class Hb_API:
 
         else:
 
-            update_payload = json.dumps(
-                [
-                    {
-                        "hepsiburadaSku": product_data["id"],
-                        "merchantSku": product_data["sku"],
-                        "availableStock": product_data["quantity"],
-                        "price": product_data["price"]
-                    }
-                ]
-            )
-            update_request_raw = self.request_data(
+            self.update_listings([product_data])
+
+    def update_listings(self, products: list, batch_size: int = INVENTORY_UPLOAD_BATCH_SIZE) -> dict:
+        """
+        Updates stock and price of many products with a few inventory uploads.
+
+        Rows are grouped into /inventory-uploads requests of up to `batch_size`
+        items. Every upload is submitted first, then all of them are polled
+        together until they are done or INVENTORY_POLL_TIMEOUT is reached.
+
+        Args:
+            products (list): Product dicts with id (hepsiburadaSku), sku, quantity and price.
+            batch_size (int, optional): Rows sent per upload.
+
+        Returns:
+            dict: Maps each merchantSku to whether its update succeeded. Rows
+            missing a field are skipped and reported as failed under whichever
+            of sku or id they have.
+        """
+
+        rows = {}
+        skipped = []
+
+        for product in products:
+
+            try:
+
+                rows[product["sku"]] = {
+                    "hepsiburadaSku": product["id"],
+                    "merchantSku": product["sku"],
+                    "availableStock": product["quantity"],
+                    "price": product["price"]
+                }
+
+            except KeyError as e:
+
+                key = product.get("sku", product.get("id"))
+                self.logger.error(f"Skipping product {key} without {e}")
+                skipped.append(key)
+
+        results = {sku: False for sku in rows}
+        results.update({key: False for key in skipped})
+        skus = list(rows)
+        uploads = {}
+
+        for start in range(0, len(skus), batch_size):
+
+            chunk = skus[start:start + batch_size]
+            upload_request = self.request_data(
                 subdomain=self.listing_external_url,
-                url_addons=f"""/inventory-uploads""",
+                url_addons="/inventory-uploads",
                 request_type="POST",
-                payload_content=update_payload,
+                payload_content=json.dumps([rows[sku] for sku in chunk]),
             )
-            if update_request_raw:
 
-                update_state_id = json.loads(update_request_raw.text)["id"]
+            if upload_request:
 
-                while True:
+                uploads[json.loads(upload_request.text)["id"]] = chunk
 
-                    check_status_request = self.request_data(
-                        subdomain=self.listing_external_url,
-                        url_addons=f"""/inventory-uploads/id/{update_state_id}""",
-                        request_type="GET",
-                        payload_content=[],
-                    )
-                    if check_status_request:
+            else:
 
-                        check_status = json.loads(check_status_request.text)
+                self.logger.error(f"Inventory upload of {len(chunk)} products could not be submitted")
 
-                        if check_status["status"] == "Done" and not check_status["errors"]:
+        deadline = time.monotonic() + self.INVENTORY_POLL_TIMEOUT
 
-                            self.logger.info(
-                                f"""Product with code: {
-                                    product_data["sku"]}, New value: {product_data["quantity"]}, New price: {product_data["price"]} updated successfully"""
-                            )
-                            break
+        while uploads and time.monotonic() < deadline:
 
-                        if check_status["errors"]:
+            time.sleep(self.INVENTORY_POLL_INTERVAL)
 
-                            self.logger.error(
-                                f"""Product with code: {product_data["sku"]} failed to update || Reason: {
-                                    check_status["errors"]}"""
-                            )
-                            break
+            for upload_id in list(uploads):
 
-                    else:
+                check_status_request = self.request_data(
+                    subdomain=self.listing_external_url,
+                    url_addons=f"/inventory-uploads/id/{upload_id}",
+                    request_type="GET",
+                    payload_content=[],
+                )
+                if not check_status_request:
+
+                    continue
+
+                check_status = json.loads(check_status_request.text)
+
+                if check_status["status"] != "Done" and not check_status["errors"]:
+
+                    continue
+
+                chunk = uploads.pop(upload_id)
+                failed = self._failed_upload_skus(check_status["errors"], chunk)
+
+                for sku in chunk:
+
+                    results[sku] = sku not in failed
+
+                self.logger.info(f"""Inventory upload {upload_id} finished || {
+                    len(chunk) - len(failed)} updated, {len(failed)} failed""")
+
+                if failed:
+
+                    self.logger.error(f"""Inventory upload {upload_id} failed for {
+                        sorted(failed)} || Reason: {check_status["errors"]}""")
+
+        for upload_id, chunk in uploads.items():
+
+            self.logger.error(f"Inventory upload {upload_id} of {len(chunk)} products did not finish in time")
 
-                        continue
+        return results
 
-    def create_listing(self, product_data) -> None:
+    @staticmethod
+    def _failed_upload_skus(errors: list, chunk: list) -> set:
+        """
+        Returns the merchantSkus an inventory upload reported errors for.
+
+        Errors that do not name a SKU fail the whole chunk, since the
+        upload cannot tell which rows they belong to.
+        """
+
+        failed = set()
+
+        for error in errors or []:
+
+            sku = error.get("merchantSku") if isinstance(error, dict) else None
+
+            if sku is None:
+
+                return set(chunk)
+
+            failed.add(sku)
+
+        return failed
+
+    def create_listing(self, product_data) -> bool:
         """
         Sends a POST request to the HepsiBurada API to create a new listing.
 
         Args:
             url (str): The URL of the API endpoint.
             ready_data (list): A list of dictionaries containing product data.
+
+        Returns:
+            bool: False if the import was rejected or any listing failed.
         """
 
         def get_product_status(response_json, page: int = 0) -> dict:
@@ -636,24 +806,22 @@ class Hb_API:
 
             ready_data = self.prepare_product_data(items=product_data, op='create')
 
-            with open("integrator.json", "w", encoding="utf-8") as json_file:
-
-                json.dump(ready_data, json_file)
-
+            # Uploaded from memory, so concurrent creates never share a file on disk
             files = {
                 "file": (
                     "integrator.json",
-                    open("integrator.json", "rb"),
+                    json.dumps(ready_data).encode("utf-8"),
                     "application/json",
                 )
             }
 
             url = self.mpop_url + "product/api/products/import"
 
-            self.headers["Accept"] = "application/json"
-            self.headers.pop("Content-Type")
+            # Per request headers, the multipart upload sets its own Content-Type
+            headers = {**self.headers, "Accept": "application/json"}
+            headers.pop("Content-Type", None)
 
-            response = requests.post(url, files=files, headers=self.headers)
+            response = transport.post(url, files=files, headers=headers)
 
             if response.status_code == 200:
 
@@ -663,6 +831,7 @@ class Hb_API:
 
                     status_check = get_product_status(response_json)
                     count = 0
+                    created = True
 
                     if status_check['success'] == True:
                             
@@ -684,6 +853,7 @@ class Hb_API:
                                     break
 
                                 elif status['importStatus'] == 'FAILED':
+                                    created = False
                                     self.logger.error(
                                     f"""Listing {status['merchantSku']} creation failed || Reason: {
                                         status['importMessages'][0]['message']}""")
@@ -691,12 +861,12 @@ class Hb_API:
                             
                             status_check = get_product_status(response_json, count)         
 
-                    else:
-
-                            pass
+                        return created
 
                 else:
 
                     self.logger.error("The create request was not successfull")
 
+        return False
+
 
@@ -21,6 +21,8 @@ import requests
 from selenium import webdriver
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
+from api.token_manager import token_manager_for
+from api.transport import transport
 
 
 def get_oauth_token(consumer_key: str, consumer_secret: str, url: str, callback: str, method: str):
@@ -41,11 +43,11 @@ def get_oauth_token(consumer_key: str, consumer_secret: str, url: str, callback:
             uri=url+"/oauth/initiate",
             http_method=method)[1]
 
-        response = requests.request(
+        response = transport.request(
             method,
             url+"/oauth/initiate",
             headers=header,
-            data={}, timeout=3000)
+            data={})
 
         response.raise_for_status()
         response_data = response.text.split("&")
@@ -156,12 +158,11 @@ def get_access_token(consumer_key, consumer_secret, callback, auth_data, token,
             uri=url+"/oauth/token",
             http_method=method)[1]
 
-        response = requests.request(
+        response = transport.request(
             method,
             url+"/oauth/token",
             headers=header,
-            data={},
-            timeout=3000)
+            data={})
 
         response.raise_for_status()
         response_data = response.text.split("&")
@@ -217,18 +218,42 @@ def get_token(consumer_key, consumer_secret, base_url, callback, method, usernam
     """
     The function `get_token` retrieves a verifier token and an 
     access token using OAuth authentication.
+
+    OAuth 1.0a access tokens do not expire, so the browser login only
+    runs once per store and the tokens are reused by later calls.
+    A failed login raises ValueError and is not cached, so the next
+    call tries again.
     """
 
-    oauth_token = get_oauth_token(
-        consumer_key, consumer_secret, base_url, callback, method)
+    def fetch_tokens():
+
+        oauth_token = get_oauth_token(
+            consumer_key, consumer_secret, base_url, callback, method)
+
+        if not oauth_token:
+
+            raise ValueError("Magento request token could not be fetched")
+
+        verifier_token = get_verifier_token(
+            oauth_token, base_url, username, password)
+
+        if not verifier_token:
+
+            raise ValueError("Magento login failed, no verifier token was returned")
+
+        access_token = get_access_token(
+            consumer_key, consumer_secret, callback, verifier_token, oauth_token, base_url, method)
+
+        if not access_token:
+
+            raise ValueError("Magento access token could not be fetched")
 
-    verifier_token = get_verifier_token(
-        oauth_token, base_url, username, password)
+        return {'verifier_token': verifier_token, 'access_token': access_token}, None
 
-    access_token = get_access_token(
-        consumer_key, consumer_secret, callback, verifier_token, oauth_token, base_url, method)
+    token_manager = token_manager_for(
+        ('magento', base_url, consumer_key, username), fetch_tokens, name='Magento')
 
-    return {'verifier_token': verifier_token, 'access_token': access_token}
+    return token_manager.get()
 
 
 def fetch_products(base_url, callback, consumer_key, consumer_secret, username, password):
@@ -289,8 +314,8 @@ def fetch_products(base_url, callback, consumer_key, consumer_secret, username,
     header = Client.sign(
         client, uri=f'{base_url}/api/rest/products?limit=100', http_method='GET')[1]
 
-    content = requests.get(
-        f'{base_url}/api/rest/products?limit=100', headers=header, data={}, timeout=3000)
+    content = transport.get(
+        f'{base_url}/api/rest/products?limit=100', headers=header, data={})
 
     products = json.loads(content.text)
 
@@ -319,9 +344,9 @@ def fetch_products(base_url, callback, consumer_key, consumer_secret, username,
                                          base_url}/api/rest/products?limit=100&page={page}',
                                      http_method='GET')[1]
 
-        loop_request = requests.get(
+        loop_request = transport.get(
             f'{base_url}/api/rest/products?limit=100&page={page}',
-            headers=looping_header, data={}, timeout=3000)
+            headers=looping_header, data={})
 
         products = json.loads(loop_request.text)
 
@@ -545,11 +570,11 @@ def update_request(tokens, item: dict):
                              http_method='PUT',
                              body=json.dumps(item))[1]
 
-        update_response = requests.request("PUT",
+        update_response = transport.request("PUT",
                                            f"{base_url}/api/rest/products/{
                                                item['entity_id']}",
                                            headers=header,
-                                           data=json.dumps(item), timeout=300000)
+                                           data=json.dumps(item))
 
         if update_response.status_code == 200:
 
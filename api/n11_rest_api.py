@@ -5,10 +5,22 @@ import os
 import re
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
 from app.config.logging_init import logger
+from app.product_record import emits_records
+from api.pagination import Page, Paginator
+from api.transport import transport
 
 
 class N11RestAPI:
+    PRICE_STOCK_BATCH_SIZE = 1000  # SKUs sent per price-stock-update task
+    MAX_TASKS_IN_FLIGHT = 4
+    TASK_DETAILS_PAGE_SIZE = 1000
+    TASK_POLL_INTERVAL = 1
+    TASK_POLL_MAX_INTERVAL = 30
+    TASK_TIMEOUT = 900
+    PRODUCTS_FETCH_WORKERS = 4
+
     def __init__(self):
         """Initialize with the base URL of the N11 product API."""
         self.base_url = "https://api.n11.com/"
@@ -22,6 +34,7 @@ class N11RestAPI:
             "appsecret": self.api_secret,
             "Content-Type": "application/json",
         }
+        self.last_fetch_errors = {}
 
     def _create_basic_auth(self, username, password):
         """Create basic authentication header."""
@@ -87,7 +100,7 @@ class N11RestAPI:
             attrs['Hav Yüksekliği'] = '5'
 
         # Get category attributes from n11 API
-        n11_category_attrs_response = requests.get(
+        n11_category_attrs_response = transport.get(
             self.base_url + f"cdn/category/{category_id}/attribute",
             headers=self.headers
         )
@@ -288,8 +301,8 @@ class N11RestAPI:
         print(f"CSV file with all SKU fields (except images) has been created at: {
               csv_file_path}")
 
-    def create_product(self, product_data):
-        """Create products using the N11 API."""
+    def create_product(self, product_data) -> bool:
+        """Create products using the N11 API, returns whether every SKU was created."""
         payload = {"payload": {"integrator": "QAT 1.0", "skus": []}}
 
         # Prepare the SKU data from the provided product data
@@ -347,7 +360,7 @@ class N11RestAPI:
         # Send POST request to create products
         try:
             self.json_to_csv(payload, 'test.csv')
-            response = requests.post(
+            response = transport.post(
                 self.base_url + "ms/product/tasks/product-create",
                 headers={
                     "Authorization": self.auth,
@@ -364,7 +377,7 @@ class N11RestAPI:
             if response.status_code == 200:
                 while True:
                     # Fetch task details
-                    task_detail = requests.post(
+                    task_detail = transport.post(
                         self.base_url + "ms/product/task-details/page-query",
                         headers=self.headers,
                         data=json.dumps({"taskId": response_data["id"], "pageable": {
@@ -377,47 +390,59 @@ class N11RestAPI:
 
                     time.sleep(5)
 
+                created = True
                 for item in task_response['skus']['content']:
                     if item['status'] == 'SUCCESS':
                         logger.info(
                             f"{item['itemCode']} is successfully created")
                     else:
+                        created = False
                         logger.error(f"{item['itemCode']} Not created || Reason: {
                                      item['reasons']}")
+                return created
         except requests.exceptions.RequestException as e:
             logger.error(f"An error occurred: {e}")
-            return 'null'
-
-    def get_products(self, stock_code='null', page=1, page_size=50, raw_data=False):
-        """Retrieve products from the API with optional filters."""
-        page = 1
-        products = []
-        headers = self.headers
 
-        while True:
-            params = {"page": page, "size": page_size}
-
-            product_request_url = self.base_url + "ms/product-query"
+        return False
 
-            try:
-                response = requests.get(
-                    product_request_url, params=params, headers=headers
-                )
-                response.raise_for_status()  # Raise an error for bad responses
-                data = response.json()
-                products.extend(data.get("content", []))
-
-                if data.get("totalPages", 0) == page:
-                    break  # No more pages, exit the loop
+    def _fetch_products_page(self, page, page_size):
+        """Fetch one page of ms/product-query."""
+        response = transport.get(
+            self.base_url + "ms/product-query", params={"page": page, "size": page_size}, headers=self.headers,
+            platform="n11", endpoint="ms/product-query"
+        )
+        response.raise_for_status()  # Raise an error for bad responses, the paginator retries the page
+        data = response.json()
 
-                page += 1
+        return Page(page, data.get("content", []), data.get("totalPages", 0))
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"An error occurred: {e}")
-                return 'null'
+    @emits_records("n11")
+    def get_products(self, stock_code='null', page=1, page_size=50, raw_data=False):
+        """
+        Retrieve products from the API with optional filters.
+
+        The first page gives the page count and the remaining pages are fetched
+        concurrently. Pages that keep failing are skipped and reported in
+        `last_fetch_errors` as page number to error, so a partial catalog is
+        returned instead of nothing.
+        """
+        paginator = Paginator(
+            lambda number: self._fetch_products_page(number, page_size),
+            first_page=1,
+            start_page=page,
+            max_workers=self.PRODUCTS_FETCH_WORKERS,
+            name="N11"
+        )
+        products = paginator.fetch_all()
+        self.last_fetch_errors = paginator.errors
 
         logger.info(f"N11 fetched {len(products)} products")
 
+        return self.format_products(products, raw_data)
+
+    @staticmethod
+    def format_products(products, raw_data=False):
+        """Shape ms/product-query items like the other platforms' product lists."""
         if not raw_data:
             # Return filtered data: stock code, quantity, and sale price
             return [
@@ -435,74 +460,162 @@ class N11RestAPI:
                         for item in products]
             return products
 
-    def update_product(self, product: dict):
-
-        uri_addon = "ms/product/tasks/price-stock-update"
+    def _submit_price_stock_task(self, skus: list):
+        """Submit one price-stock-update task and return its id, or None if it was rejected."""
 
         post_payload = {
             "payload": {
                 "integrator": "QAT 1.0",
-                "skus": [
-                    {"stockCode": product["sku"], "listPrice": int(product['price']) * 2, "salePrice": int(
-                        product['price']), "quantity": int(product["quantity"]), "currencyType": "TL"}
-                ],
+                "skus": skus,
             }
         }
 
-        post_response = requests.post(
-            self.base_url + uri_addon, headers=self.headers, json=post_payload
+        post_response = transport.post(
+            self.base_url + "ms/product/tasks/price-stock-update", headers=self.headers, json=post_payload,
+            platform="n11", endpoint="ms/product/tasks"
         )
 
         if post_response.status_code == 200:
+            return post_response.json()["id"]
 
-            task_payload = {
-                "taskId": post_response.json()["id"],
-                "pageable": {"page": 0, "size": 1000},
-            }
+        logger.error(
+            f"""Price-stock-update task for {len(skus)} products is unsuccessful | Response: {
+                post_response.text}"""
+        )
+        return None
+
+    def _query_task_details(self, task_id, page: int = 0):
+        """Fetch one page of a task's details, None if the request failed."""
+
+        task_response = transport.post(
+            self.base_url + "ms/product/task-details/page-query",
+            headers=self.headers,
+            json={"taskId": task_id, "pageable": {"page": page, "size": self.TASK_DETAILS_PAGE_SIZE}},
+            platform="n11", endpoint="ms/product/task-details"
+        )
+
+        if task_response.status_code == 200:
+            return task_response.json()
+
+        logger.error(f"Task details request for task {task_id} failed | Response: {task_response.text}")
+        return None
+
+    def _wait_for_price_stock_task(self, task_id, skus: list) -> dict:
+        """
+        Poll a price-stock-update task with backoff until it is processed.
 
-            while True:
-                task_response = requests.post(
-                    self.base_url + "ms/product/task-details/page-query",
-                    headers=self.headers,
-                    json=task_payload,
-                )
+        Args:
+            task_id: Id of the submitted task
+            skus: The sku payloads sent with the task
 
-                if task_response.status_code == 200:
+        Returns:
+            dict: Maps each stock code of the task to whether its update succeeded
+        """
 
-                    res_json = task_response.json()
+        results = {sku["stockCode"]: False for sku in skus}
+        sent = {sku["stockCode"]: sku for sku in skus}
+        delay = self.TASK_POLL_INTERVAL
+        deadline = time.monotonic() + self.TASK_TIMEOUT
 
-                    if res_json.get("status") == "PROCESSED":
+        while True:
+            res_json = self._query_task_details(task_id)
 
-                        for item in res_json["skus"]["content"]:
+            if res_json is None:
+                return results
 
-                            if item["status"] == "SUCCESS":
+            if res_json.get("status") in ("PROCESSED", "REJECT"):
+                break
 
-                                logger.info(
-                                    f"""Product with code: {
-                                        product["sku"]} updated successfully"""
-                                )
+            if time.monotonic() >= deadline:
+                logger.error(f"Price-stock-update task {task_id} did not finish in time")
+                return results
 
-                                return
+            time.sleep(delay)
+            delay = min(delay * 2, self.TASK_POLL_MAX_INTERVAL)
 
-                            logger.error(
-                                f"""Request for product {
-                                    product['sku']} is unsuccessful | listPrice:{int(product['price']) * 2}, "salePrice": {int(
-                                        product['price'])} | Response: {
-                                    item['sku']['reasons']}"""
-                            )
-                            return
+        # Item outcomes are paginated like any other query
+        page = 0
+        while True:
+            for item in res_json["skus"]["content"]:
+                item_sku = item.get("sku") or {}
+                stock_code = item.get("itemCode") or item_sku.get("stockCode")
 
+                if stock_code not in results:
                     continue
 
+                if item["status"] == "SUCCESS":
+                    results[stock_code] = True
+                    logger.info(f"Product with code: {stock_code} updated successfully")
                 else:
-                    break
+                    logger.error(
+                        f"""Request for product {stock_code} is unsuccessful | listPrice:{
+                            sent[stock_code]['listPrice']}, "salePrice": {sent[stock_code]['salePrice']} | Response: {
+                            item.get('reasons') or item_sku.get('reasons')}"""
+                    )
 
-        else:
+            page += 1
+            if page >= res_json["skus"].get("totalPages", 1):
+                break
 
-            post_response.raise_for_status()
+            res_json = self._query_task_details(task_id, page)
+            if res_json is None:
+                break
 
-            logger.error(
-                f"""Request for product {
-                    product['sku']} is unsuccessful | Response: {
-                    post_response.text}"""
-            )
+        return results
+
+    def _update_price_stock_chunk(self, skus: list) -> dict:
+        task_id = self._submit_price_stock_task(skus)
+
+        if task_id is None:
+            return {sku["stockCode"]: False for sku in skus}
+
+        return self._wait_for_price_stock_task(task_id, skus)
+
+    def update_products(self, products: list, batch_size: int = PRICE_STOCK_BATCH_SIZE,
+                        max_in_flight: int = MAX_TASKS_IN_FLIGHT) -> dict:
+        """
+        Update price and stock of many products with multi-SKU tasks.
+
+        Products are packed into price-stock-update tasks of up to `batch_size`
+        SKUs, and up to `max_in_flight` tasks are submitted and polled at once.
+
+        Args:
+            products: Product dicts with sku, quantity and price
+            batch_size: SKUs sent per task
+            max_in_flight: Tasks processed concurrently
+
+        Returns:
+            dict: Maps each stock code to whether its update succeeded, products with
+            a missing or malformed value are reported as failed
+        """
+
+        skus = {}
+        results = {}
+        for product in products:
+            try:
+                skus[product["sku"]] = {
+                    "stockCode": product["sku"],
+                    "listPrice": int(product['price']) * 2,
+                    "salePrice": int(product['price']),
+                    "quantity": int(product["quantity"]),
+                    "currencyType": "TL",
+                }
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Skipping malformed product {product.get('sku')}: {e!r}")
+                results[product.get("sku")] = False
+
+        payloads = list(skus.values())
+        chunks = [payloads[start:start + batch_size] for start in range(0, len(payloads), batch_size)]
+
+        if not chunks:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(max_in_flight, len(chunks))) as executor:
+            for chunk_results in executor.map(self._update_price_stock_chunk, chunks):
+                results.update(chunk_results)
+
+        return results
+
+    def update_product(self, product: dict):
+
+        self.update_products([product])
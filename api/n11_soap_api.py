@@ -5,10 +5,65 @@ import os
 import re
 import time
 import requests
-import xmltodict
 from zeep import Client, Settings, xsd
 from zeep.exceptions import Error
+from zeep.transports import Transport
 from typing import Any, Tuple, Optional, List, Dict, Union
+from api.soap import SoapTemplate, find_text, iter_elements
+from api.transport import transport
+
+
+STOCK_UPDATE_REQUEST = """
+                            <soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:sch="http://www.n11.com/ws/schemas">
+                              <soapenv:Header/>
+                              <soapenv:Body>
+                                <sch:UpdateStockByStockSellerCodeRequest>
+                                  <auth>
+                                    <appKey>{app_key}</appKey>
+                                    <appSecret>{app_secret}</appSecret>
+                                  </auth>
+                                  <stockItems>
+                                    <stockItem>
+                                      <sellerStockCode>{sku}</sellerStockCode>
+                                      <quantity>{quantity}</quantity>
+                                    </stockItem>
+                                  </stockItems>
+                                </sch:UpdateStockByStockSellerCodeRequest>
+                              </soapenv:Body>
+                            </soapenv:Envelope>
+                            """
+
+DETAILED_ORDER_LIST_REQUEST = """
+            <soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:sch="http://www.n11.com/ws/schemas">
+                <soapenv:Header/>
+                <soapenv:Body>
+                    <sch:DetailedOrderListRequest>
+                        <auth>
+                            <appKey>{app_key}</appKey>
+                            <appSecret>{app_secret}</appSecret>
+                        </auth>
+                        <searchData>
+                            <productId></productId>
+                            <status>Completed</status>
+                            <buyerName></buyerName>
+                            <orderNumber></orderNumber>
+                            <productSellerCode></productSellerCode>
+                            <recipient></recipient>
+                            <sameDayDelivery></sameDayDelivery>
+                            <period>
+                                <startDate></startDate>
+                                <endDate></endDate>
+                            </period>
+                            <sortForUpdateDate>true</sortForUpdateDate>
+                        </searchData>
+                        <pagingData>
+                            <currentPage>{current_page}</currentPage>
+                            <pageSize>100</pageSize>
+                        </pagingData>
+                    </sch:DetailedOrderListRequest>
+                </soapenv:Body>
+            </soapenv:Envelope>
+            """
 
 
 class N11SoapAPI:
@@ -28,6 +83,12 @@ class N11SoapAPI:
         self.auth = {"appKey": self.api_key, "appSecret": self.api_secret}
         self.client = self.__create_client__()
 
+        # Hand written envelopes, compiled once with the credentials
+        self.stock_update_template = SoapTemplate(
+            STOCK_UPDATE_REQUEST, app_key=self.api_key, app_secret=self.api_secret)
+        self.order_list_template = SoapTemplate(
+            DETAILED_ORDER_LIST_REQUEST, app_key=self.api_key, app_secret=self.api_secret)
+
         self.logger = logging.getLogger(__name__)
 
     def __create_client__(
@@ -49,8 +110,15 @@ class N11SoapAPI:
             strict=False, xml_huge_tree=True, xsd_ignore_sequence_order=True
         )
         try:
-            ds = requests.get(wsdl_url)
-            client = Client(wsdl=wsdl_url, settings=settings)
+            client = Client(
+                wsdl=wsdl_url,
+                settings=settings,
+                transport=Transport(
+                    session=transport.session_for(wsdl_url),
+                    timeout=transport.timeout[0],
+                    operation_timeout=transport.timeout[1],
+                ),
+            )
             return client
 
         except Error as e:
@@ -75,28 +143,16 @@ class N11SoapAPI:
             response_namespace (str): The namespace of the response element.
             list_name (str): The name of the list element to extract.
             error_message (bool): Flag to indicate if error messages should be returned. Defaults to False.
-            namespace_id (str): The namespace identifier. Defaults to 'ns3'.
+            namespace_id (str): The namespace identifier. Defaults to 'ns3'. Unused, the response
+                                element is matched by its local name whatever its prefix.
 
         Returns:
             Optional[Tuple[Any, Any]]: A tuple containing the list of items and the total number of pages, or None.
         """
 
         try:
-            # XML raw data trimming
-            revised_response = (
-                raw_xml.replace(
-                    """<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/"><SOAP-ENV:Header/><SOAP-ENV:Body>""",
-                    "",
-                )
-            ).replace("""</SOAP-ENV:Body></SOAP-ENV:Envelope>""", "")
-
-            # Parse the XML response into a dictionary using xmltodict library.
-            response_json = xmltodict.parse(revised_response)
-
-            # Access the response elements using the response_namespace and list_name   variables.
-            response_data = response_json.get(
-                f"{namespace_id}:{response_namespace}")
-            #   response_json['SOAP-ENV:Envelope']['SOAP-ENV:Body'].get(f"{namespace_id}: {response_namespace}"))
+            # Only the response element is converted, the envelope around it is skipped
+            response_data = next(iter_elements(raw_xml, response_namespace), None)
 
             if response_data:
                 if list_name in response_data and not error_message:
@@ -320,90 +376,42 @@ class N11SoapAPI:
         to extract relevant information.
         """
 
-        payload = f"""
-            <soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"xmlns:sch="http://www.n11.com/ws/schemas">
-                <soapenv:Header/>
-                <soapenv:Body>
-                    <sch:DetailedOrderListRequest>
-                        <auth>
-                            <appKey>{self.api_key}</appKey>
-                            <appSecret>{self.api_secret}</appSecret>
-                        </auth>
-                        <searchData>
-                            <productId></productId>
-                            <status>Completed</status>
-                            <buyerName></buyerName>
-                            <orderNumber></orderNumber>
-                            <productSellerCode></productSellerCode>
-                            <recipient></recipient>
-                            <sameDayDelivery></sameDayDelivery>
-                            <period>
-                                <startDate></startDate>
-                                <endDate></endDate>
-                            </period>
-                            <sortForUpdateDate>true</sortForUpdateDate>
-                        </searchData>
-                        <pagingData>
-                            <currentPage>0</currentPage>
-                            <pageSize>100</pageSize>
-                        </pagingData>
-                    </sch:DetailedOrderListRequest>
-                </soapenv:Body>
-            </soapenv:Envelope>
-            """
         orders_url = f"{link}/orderService/"
-
-        # This is used to send a SOAP request to the N11 API to retrieve a list of  products.
-        api_call = requests.post(
-            orders_url, headers=self.headers, data=payload, timeout=30
-        )
+        raw_elements = []
         current_page = 0
+        orders_total_pages = 1
 
-        # Status code of 200 means that the request was successful and the
-        # server returned the expected response.
-        if api_call.status_code == 200:
+        # Process all pages found
+        while current_page < orders_total_pages:
 
-            orders_list, orders_total_pages = self.assign_vars(
-                api_call, "DetailedOrderListResponse", "orderList"
+            # This is used to send a SOAP request to the N11 API to retrieve a list of orders.
+            api_call = transport.post(
+                orders_url, headers=self.headers,
+                data=self.order_list_template.render(current_page=current_page), timeout=30
             )
 
-            raw_elements = []
-
-            # Process all pages found
-            if orders_list is not None:
-                while current_page < int(orders_total_pages):
-
-                    for order in orders_list:
-                        flattened_order = self.flatten_dict(order, "")
-                        raw_elements.append(flattened_order)
-
-                    current_page += 1
-                    payload_dump = payload.replace(
-                        "<currentPage>0</currentPage>",
-                        f"<currentPage>{str(current_page)}</currentPage>",
-                    )
-                    orders_list, _ = self.looper(
-                        orders_url,
-                        payload_dump,
-                        "DetailedOrderListResponse",
-                        "orderList",
-                    )
+            # Status code of 200 means that the request was successful and the
+            # server returned the expected response.
+            if api_call.status_code != 200:
 
-            else:
+                self.logger.error(f"Error: {api_call.text}")
+                break
 
-                self.logger.error("No orders found in the response.")
-        else:
+            for order in iter_elements(api_call.content, "order"):
+                raw_elements.append(self.__flatten_dict__(order, ""))
 
-            self.logger.error("Error:", api_call.text)
+            orders_total_pages = int(find_text(api_call.content, "pageCount", "0"))
+            current_page += 1
 
         if raw_elements:
 
             self.logger.info(
-                "Detailed orders list extraction is Successful. || Response:",
-                api_call.reason,
+                f"Detailed orders list extraction is Successful. || Orders: {len(raw_elements)}"
             )
         else:
-            pass
+
+            self.logger.error("No orders found in the response.")
+
         return raw_elements
 
     def _get_categories(self, save: bool = False):
@@ -854,45 +862,25 @@ class N11SoapAPI:
 
     def update_products(self, data: Dict) -> None:
 
-        post_payload = f"""
-                            <soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:sch="http://www.n11.com/ws/schemas">
-                              <soapenv:Header/>
-                              <soapenv:Body>
-                                <sch:UpdateStockByStockSellerCodeRequest>
-                                  <auth>
-                                    <appKey>{self.api_key}</appKey>
-                                    <appSecret>{self.api_secret}</appSecret>
-                                  </auth>
-                                  <stockItems>
-                                    <stockItem>
-                                      <sellerStockCode>{data['sku']}</sellerStockCode>
-                                      <quantity>{data['quantity']}</quantity>
-                                    </stockItem>
-                                  </stockItems>
-                                </sch:UpdateStockByStockSellerCodeRequest>
-                              </soapenv:Body>
-                            </soapenv:Envelope>
-                            """
+        post_payload = self.stock_update_template.render(sku=data['sku'], quantity=data['quantity'])
 
-        post_response = requests.request(
-            "POST", self.base_url, headers=self.headers, data=post_payload, timeout=30
-        )
+        # 429s pause the N11 bucket in the limiter, so every retry waits as long as asked
+        for _ in range(3):
+            post_response = transport.request(
+                "POST", self.base_url, headers=self.headers, data=post_payload, timeout=30,
+                platform="n11", endpoint="UpdateStockByStockSellerCode"
+            )
+            if post_response.status_code != 429:
+                break
 
         if post_response.status_code == 200:
 
-            if re.search("errorMessage", post_response.text) or re.search(
-                "failure", post_response.text
-            ):
+            if b"errorMessage" in post_response.content or b"failure" in post_response.content:
 
-                error_message = self.__assign_vars__(
-                    raw_xml=post_response.text,
-                    response_namespace="UpdateStockByStockSellerCodeResponse",
-                    list_name="",
-                    error_message=True,
-                )
+                error_message = find_text(post_response.content, "errorMessage")
                 self.logger.error(
                     f"""Request failure for product {data['sku']} | Response: {
-                        error_message['result']['errorMessage']}"""
+                        error_message}"""
                 )
 
             else:
@@ -904,7 +892,9 @@ class N11SoapAPI:
 
         elif post_response.status_code == 429:
 
-            time.sleep(15)
+            self.logger.error(
+                f"Request for product {data['sku']} is rate limited after 3 attempts"
+            )
 
         else:
 
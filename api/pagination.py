@@ -0,0 +1,143 @@
+""" Concurrent paginator for page numbered list endpoints. The first page tells how many
+ pages there are, the rest are fetched in parallel and failed pages are retried alone."""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.config import logger
+from app.config.constants import PAGINATION_MAX_WORKERS, PAGINATION_PAGE_RETRIES, PAGINATION_RETRY_DELAY
+
+
+@dataclass
+class Page:
+    """One fetched page."""
+    number: int
+    items: List[Any] = field(default_factory=list)
+    total_pages: Optional[int] = None
+
+
+class Paginator:
+    """
+    Fetches every page of an endpoint with a bounded number of workers.
+
+    `fetch_page` receives a page number and returns a Page, raising on failure. Pages
+    that still fail after `retries` extra attempts are skipped and reported in
+    `errors`, so callers get partial results instead of nothing.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int], Page],
+        first_page: int = 0,
+        max_workers: int = PAGINATION_MAX_WORKERS,
+        retries: int = PAGINATION_PAGE_RETRIES,
+        retry_delay: float = PAGINATION_RETRY_DELAY,
+        name: str = "",
+        start_page: Optional[int] = None,
+    ):
+        """
+        Initialize the paginator.
+
+        Args:
+            fetch_page: Function fetching a single page
+            first_page: Number of the first page, 0 or 1 depending on the platform
+            max_workers: Pages fetched concurrently
+            retries: Extra attempts for a failed page
+            retry_delay: Delay before the first retry, doubled on every retry
+            name: Name used in log messages
+            start_page: Page to start from, `first_page` if None
+        """
+        self.fetch_page = fetch_page
+        self.first_page = first_page
+        self.max_workers = max_workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.name = name
+        self.start_page = first_page if start_page is None else start_page
+        self.errors: Dict[int, str] = {}
+
+    def _fetch_with_retries(self, number: int) -> Optional[Page]:
+        delay = self.retry_delay
+
+        for attempt in range(self.retries + 1):
+            try:
+                return self.fetch_page(number)
+            except Exception as e:
+                if attempt == self.retries:
+                    logger.error(f"{self.name} page {number} failed after {attempt + 1} attempts || Reason: {e}")
+                    self.errors[number] = str(e)
+                    return None
+
+                logger.warning(f"{self.name} page {number} failed, retrying in {delay} seconds || Reason: {e}")
+                time.sleep(delay)
+                delay *= 2
+
+    def iter_pages(self, ordered: bool = True) -> Iterator[Page]:
+        """
+        Yield pages as they are fetched.
+
+        Args:
+            ordered: Yield pages in page order. Otherwise pages are yielded as soon as
+                they arrive, which lets callers start processing earlier.
+
+        Yields:
+            Every page that could be fetched
+        """
+        self.errors = {}
+        first = self._fetch_with_retries(self.start_page)
+
+        if first is None:
+            return
+
+        yield first
+
+        if first.total_pages is None:
+            # Page count unknown, walk the pages one by one until an empty one
+            number = self.start_page + 1
+            page = first
+            while page is not None and page.items:
+                page = self._fetch_with_retries(number)
+                if page is not None and page.items:
+                    yield page
+                number += 1
+            return
+
+        remaining = range(self.start_page + 1, self.first_page + first.total_pages)
+        if not remaining:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(remaining)), thread_name_prefix="page")
+        try:
+            futures: Dict[Future, int] = {executor.submit(self._fetch_with_retries, number): number
+                                          for number in remaining}
+
+            if ordered:
+                for future in sorted(futures, key=futures.get):
+                    page = future.result()
+                    if page is not None:
+                        yield page
+            else:
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        page = future.result()
+                        if page is not None:
+                            yield page
+        finally:
+            # Stop queued pages if the caller stops iterating early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def fetch_all(self, ordered: bool = True) -> List[Any]:
+        """Return the items of every page, in page order unless `ordered` is False."""
+        items: List[Any] = []
+
+        for page in self.iter_pages(ordered):
+            items.extend(page.items)
+
+        if self.errors:
+            logger.warning(f"{self.name} fetch is incomplete || Failed pages: {sorted(self.errors)}")
+
+        return items
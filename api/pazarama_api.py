@@ -5,7 +5,12 @@ import re
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from app.config.logging_init import logger
+from app.product_record import emits_records
+from api.rate_limiter import endpoint_key
+from api.token_manager import token_manager_for
+from api.transport import transport
 
 
 class PazaramaAPIClient:
@@ -20,6 +25,9 @@ class PazaramaAPIClient:
         token_expiry (float): The Unix timestamp when the current token expires.
     """
 
+    UPDATE_BATCH_SIZE = 1000  # Items sent per updateStock-v2 / updatePrice-v2 request
+    MAX_PARALLEL_UPDATES = 4
+
     def __init__(self):
         """
         Initializes the PazaramaAPIClient instance.
@@ -39,17 +47,21 @@ class PazaramaAPIClient:
         base64_bytes = base64.b64encode(user_pass_bytes)
         self.base64_hash = base64_bytes.decode('utf-8')
 
-    def get_access_token(self):
-        """
-        Retrieves a new access token from the Pazarama API.
-
-        This method sends a POST request to the Pazarama token endpoint
-        and stores the access token and its expiration time.
+        # Shared by every client using the same credentials
+        self.token_manager = token_manager_for(
+            ("pazarama", pazaram_key), self._fetch_access_token, name="Pazarama"
+        )
 
-        If the token request fails, an error is logged.
+    def _fetch_access_token(self):
+        """
+        Requests a new access token from the Pazarama token endpoint.
 
         Returns:
-            None
+            tuple: The access token and its lifetime in seconds.
+
+        Raises:
+            ValueError: If the response does not contain a token.
+            requests.exceptions.RequestException: If the request fails.
         """
         url = "https://isortagimgiris.pazarama.com/connect/token"
         payload = "grant_type=client_credentials&scope=merchantgatewayapi.fullaccess"
@@ -58,40 +70,54 @@ class PazaramaAPIClient:
             "Authorization": f"Basic {str(self.base64_hash)}",
         }
 
-        try:
-            response = requests.post(url, headers=headers, data=payload, timeout=30)
-            response.raise_for_status()
-            response_data = response.json()
-
-            if "accessToken" in response_data["data"]:
-                self.access_token = response_data["data"]["accessToken"]
-                expires_in = response_data["data"].get(
-                    "expiresIn", 3600
-                )  # Default to 1 hour if not provided
-                self.token_expiry = (
-                    time.time() + expires_in - 60
-                )  # Refresh slightly before expiry
-            else:
-                logger.error(f"Access token request failed || Reason: {response_data}")
-                self.access_token = None
-                self.token_expiry = None
+        response = transport.post(url, headers=headers, data=payload, timeout=30)
+        response.raise_for_status()
+        response_data = response.json()
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Access token request encountered an error: {str(e)}")
-            self.access_token = None
-            self.token_expiry = None
+        if "accessToken" not in response_data["data"]:
+            raise ValueError(response_data)
+
+        # Default to 1 hour if not provided
+        return response_data["data"]["accessToken"], response_data["data"].get("expiresIn", 3600)
+
+    def get_access_token(self):
+        """
+        Retrieves a new access token from the Pazarama API.
+
+        The cached token is dropped and a new one is requested and stored
+        along with its expiration time.
+
+        If the token request fails, an error is logged.
+
+        Returns:
+            None
+        """
+        self.token_manager.invalidate()
+        self.ensure_token_validity()
 
     def ensure_token_validity(self):
         """
         Ensures that the current access token is valid.
 
-        If the token is missing or has expired, a new token is requested.
+        The token is served from the shared token cache, a new token is
+        requested only if the cached one is missing or about to expire.
 
         Returns:
             None
         """
-        if not self.access_token or time.time() >= self.token_expiry:
-            self.get_access_token()
+        try:
+            self.access_token = self.token_manager.get()
+            self.token_expiry = self.token_manager.expires_at
+
+        except ValueError as e:
+            logger.error(f"Access token request failed || Reason: {e}")
+            self.access_token = None
+            self.token_expiry = None
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Access token request encountered an error: {str(e)}")
+            self.access_token = None
+            self.token_expiry = None
 
     def process_target_attributes(self, source_data, target_data):
         """
@@ -222,7 +248,7 @@ class PazaramaAPIClient:
             "Tip": tip,
         }
 
-    def request_data(self, method="GET", uri="", params=None, payload=None):
+    def request_data(self, method="GET", uri="", params=None, payload=None, return_failures=False):
         """
         Sends a request to the Pazarama API with the specified method, URI, parameters, and payload.
 
@@ -235,6 +261,8 @@ class PazaramaAPIClient:
             uri (str): The URI path for the API endpoint.
             params (dict, optional): Query parameters to include in the request.
             payload (dict, optional): The JSON payload to include in the request.
+            return_failures (bool, optional): Return responses with `success` False
+                instead of None, so callers can read their message.
 
         Returns:
             dict: The JSON response from the API if the request is successful.
@@ -252,27 +280,27 @@ class PazaramaAPIClient:
 
         while True:
             try:
-                response = requests.request(
-                    method, url, headers=headers, params=params, data=payload_dump
+                response = transport.request(
+                    method, url, headers=headers, params=params, data=payload_dump,
+                    platform="pazarama", endpoint=endpoint_key(uri)
                 )
+                if response.status_code == 429:  # Too many requests
+                    # The limiter pauses the endpoint before the next attempt
+                    logger.warning("Rate limit exceeded. Retrying...")
+                    continue
+
                 response_data = response.json()
                 if response_data['success'] == False:
                     logger.error(f"Request failed || Reason: {response_data['message']}")
-                    return None
+                    return response_data if return_failures else None
 
 
                 if response.status_code == 200:
                     return response_data
 
             except requests.exceptions.RequestException as e:
-                if response.status_code == 429:  # Too many requests
-                    logger.warning("Rate limit exceeded. Retrying after a delay...")
-                    time.sleep(3)
-                else:
-                    logger.error(
-                        f"Request failed with status {response.status_code} || Reason: {e}"
-                    )
-                    return None
+                logger.error(f"Request failed || Reason: {e}")
+                return None
 
     def request_processing(
         self, uri: str, payload: dict = None, params: dict = None, method: str = "GET"
@@ -393,6 +421,7 @@ class PazaramaAPIClient:
 
         products = []
         product_data_list = product_data
+        created = True
 
         try:
             for data_items in product_data_list:
@@ -459,6 +488,7 @@ class PazaramaAPIClient:
                         
                         if create_request['data']['error']['errors'] != []:
                             
+                            created = False
                             for product_sk in create_request['data']['error']['errors']:
                                 logger.error(f"Product with code: {product_sku} failed to create. || Reason: {product_sk}")
 
@@ -474,21 +504,31 @@ class PazaramaAPIClient:
                                 if product_status_check['data']['status'] == 2:
                                     for result in product_status_check['data']['batchResult']:
                                         if result['failureReasons'] != []:
+                                            created = False
                                             logger.error(f"Product with code: {result['createProduct']['stockCode']} failed to create. || Reason: {result['failureReasons']}")
                                         else:
                                             logger.info(f"Product with code: {result['createProduct']['stockCode']} successfully created.")
                                     break
                                 elif product_status_check['data']['status'] == 3:
+                                    created = False
                                     logger.error(f"Product with code: {product_sku} failed to create.")
                                     break
                                 time.sleep(2)
                     else:
+                        created = False
                         logger.error(
                             f'Product with code: {product_sku} failed to create || Reason: {create_request['message']} || Elapsed time: {elapsed_time:.2f} seconds.'
                         )
+                else:
+                    created = False
+
+            return created
+
         except KeyError:
             logger.error(f"Error: {KeyError}")
+            return False
         
+    @emits_records("pazarama")
     def get_products(self, everyProduct: bool = False, local: bool = False):
         """
         Retrieves a list of products from the Pazarama API and returns a subset of product data
@@ -549,6 +589,108 @@ class PazaramaAPIClient:
 
         return products_items
 
+    def _send_update_chunk(self, uri: str, items: list) -> dict:
+        """
+        Sends one chunk of an update-v2 request.
+
+        Returns:
+            dict: Maps each code of the chunk to its `success` and `message`.
+        """
+        response = self.request_data(
+            method="POST", uri=uri, payload={"items": items}, return_failures=True
+        )
+
+        if response is None:
+            return {item["code"]: {"success": False, "message": "Request failed"} for item in items}
+
+        # Item level outcomes when Pazarama reports them, the chunk outcome otherwise
+        item_results = {
+            item["code"]: item for item in response.get("data") or []
+            if isinstance(item, dict) and "code" in item
+        }
+
+        results = {}
+        for item in items:
+            outcome = item_results.get(item["code"], response)
+            results[item["code"]] = {
+                "success": outcome.get("success", response["success"]) == True,
+                "message": outcome.get("message") or response.get("message"),
+            }
+
+        return results
+
+    def update_products(self, products: list, update_stock: bool = True, update_price: bool = False,
+                        batch_size: int = UPDATE_BATCH_SIZE) -> dict:
+        """
+        Updates stock and price of many products with as few requests as possible.
+
+        Products are split into updateStock-v2 and updatePrice-v2 chunks of up to
+        `batch_size` items. Chunks are sent in parallel and paced by the rate limiter.
+        Like `update_product`, only stock is sent unless prices are explicitly asked for.
+
+        Args:
+            products (list): Product dicts with id (Pazarama code), sku, quantity and price.
+            update_stock (bool): Send the stock counts.
+            update_price (bool): Send the prices, products without a price are reported as failed.
+            batch_size (int): Items sent per request.
+
+        Returns:
+            dict: Maps each code to its aggregated `success` and `message`, rows with
+            a missing code or a malformed value are reported as failed.
+        """
+        skus = {}
+        results = {}
+        stock_items = []
+        price_items = []
+
+        # Rows are checked one by one, a bad row only fails itself
+        for product in products:
+            code = product.get("id")
+            skus[code] = product.get("sku", code)
+            results[code] = {"success": True, "message": None}
+
+            if code is None:
+                results[code] = {"success": False, "message": "Missing code"}
+                continue
+
+            if update_stock:
+                try:
+                    stock_items.append({"code": code, "stockCount": int(product["quantity"])})
+                except (KeyError, TypeError, ValueError) as e:
+                    results[code] = {"success": False, "message": f"Invalid quantity: {e!r}"}
+
+            if update_price:
+                if product.get("price"):
+                    price_items.append({"code": code, "listPrice": product["price"] * 2, "salePrice": product["price"]})
+                else:
+                    results[code]["success"] = False
+                    results[code]["message"] = "; ".join(filter(None, [results[code]["message"], "Missing price"]))
+
+        requests_to_send = [
+            (uri, items[start:start + batch_size])
+            for uri, items in (("product/updateStock-v2", stock_items), ("product/updatePrice-v2", price_items))
+            for start in range(0, len(items), batch_size)
+        ]
+
+        if not requests_to_send:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(self.MAX_PARALLEL_UPDATES, len(requests_to_send))) as executor:
+            for chunk_results in executor.map(lambda request: self._send_update_chunk(*request), requests_to_send):
+                for code, outcome in chunk_results.items():
+                    result = results[code]
+                    result["success"] = result["success"] and outcome["success"]
+                    if outcome["message"]:
+                        result["message"] = "; ".join(filter(None, [result["message"], outcome["message"]]))
+
+        failed = [code for code, result in results.items() if not result["success"]]
+        logger.info(f"Pazarama updated {len(results) - len(failed)} of {len(results)} products")
+
+        for code in failed:
+            logger.error(f"Product with code: {skus[code]} failed to update || Reason: {results[code]['message']}")
+
+        return results
+
     def update_product(self, product_data: dict, price_match: bool = False):
         """
         The function `pazarama_updateRequest` updates the stock count of a product on Pazarama platform
@@ -4,9 +4,16 @@ import csv
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Union
+from xml.etree import ElementTree
 import requests
 import xmltodict
 from app.config.logging_init import logger
+from app.product_record import emits_records
+from api.rate_limiter import rate_limiter
+from api.soap import SoapTemplate, fault_string, find_text, find_texts, iter_elements
+from api.transport import transport
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -20,16 +27,13 @@ password = os.getenv('PTTAVMPASSWORD')
 TedarikciId = os.getenv('PTTAVMTEDARIKCIID')
 
 
-def requestdata(method: str = 'POST', uri: str = '', params: dict = None, data: list = ''):
-    """
-    The function `requestData` sends a SOAP request to a specific 
-    URL with provided parameters and data,
-    handling the response accordingly.
-    """
+PTTAVM_URL = "https://ws.pttavm.com:93/service.svc"
 
-    url = "https://ws.pttavm.com:93/service.svc"
+UPDATE_BATCH_SIZE = 100  # items packed into one StokFiyatGuncelle3 envelope
+MAX_UPDATES_IN_FLIGHT = 4  # envelopes sent at once, the rate limiter still applies the quota
 
-    payload = f"""
+
+ENVELOPE_TEMPLATE = """
     <soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:tem="http://tempuri.org/" xmlns:ept="http://schemas.datacontract.org/2004/07/ePttAVMService">
     <soapenv:Header>
         <wsse:Security soapenv:mustUnderstand="1" xmlns:wsse="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd">
@@ -40,32 +44,80 @@ def requestdata(method: str = 'POST', uri: str = '', params: dict = None, data:
         </wsse:Security>
     </soapenv:Header>
    <soapenv:Body>
-    {data}
+    {body}
     </soapenv:Body>
 </soapenv:Envelope>
 """
 
-    headers = {
+# Rendered once with the WS-Security credentials, a request only fills in its body
+ENVELOPE = SoapTemplate(ENVELOPE_TEMPLATE, username=username, password=password)
+
+
+def soap_envelope(data: Union[str, bytes]) -> bytes:
+    """
+    The function `soap_envelope` wraps a SOAP body in the envelope 
+    carrying the PTTAVM WS-Security credentials.
+    """
+
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    return ENVELOPE.render(body=data)
+
+
+def soap_headers(uri: str) -> dict:
+    """ The function `soap_headers` returns the HTTP headers of a SOAP call to `uri`."""
+
+    return {
         'Content-Type': 'text/xml; charset=utf-8',
         'SOAPAction': f'http://tempuri.org/IService/{uri}'
     }
 
+
+def requestdata(method: str = 'POST', uri: str = '', params: dict = None, data: list = '', stream: bool = False):
+    """
+    The function `requestData` sends a SOAP request to a specific 
+    URL with provided parameters and data,
+    handling the response accordingly. With `stream` the body of a
+    successful response is left unread so it can be parsed incrementally.
+    """
+
+    url = PTTAVM_URL
+
+    payload = soap_envelope(data)
+
+    headers = soap_headers(uri)
+
     while True:
 
-        response = requests.request(
-            method, url, headers=headers, params=params, data=payload, timeout=3000)
+        response = transport.request(
+            method, url, headers=headers, params=params, data=payload, stream=stream,
+            platform="pttavm", endpoint=uri)
 
         if response.status_code == 200:
 
             return response
 
-        error_response = formatdata(response)['s:Fault']['faultstring']['#text']\
+        error_response = fault_message(response)
 
-        if not re.search('dakika', error_response):
+        if not is_quota_fault(error_response):
 
             return error_response
 
-        time.sleep(2)
+        # PTTAVM reports its per minute quota as a SOAP fault instead of a 429
+        rate_limiter.penalize("pttavm", uri)
+
+
+def fault_message(response) -> str:
+    """ The function `fault_message` returns the fault string of a failed SOAP response."""
+
+    return fault_string(response.content) or response.text
+
+
+def is_quota_fault(error_response: str) -> bool:
+    """ The function `is_quota_fault` tells whether a fault is PTTAVM's per minute quota."""
+
+    return bool(re.search('dakika', error_response))
 
 
 def formatdata(response):
@@ -87,85 +139,202 @@ def formatdata(response):
     return body_content
 
 
-def getpttavm_procuctskdata(everyproduct: bool = False, local: bool = False):
+def iter_stock_details(response, tag: str = 'StokKontrolDetay') -> Iterator[dict]:
     """
-    The function `getPTTAVM_procuctskData` retrieves product 
-    data from an API and returns a list of
-    products with specific details.
+    The function `iter_stock_details` parses a streamed SOAP response 
+    incrementally and yields every `tag` element as a dict as soon as 
+    it is closed, so memory use does not grow with the catalog size.
+    """
+
+    response.raw.decode_content = True
+
+    yield from iter_elements(response.raw, tag)
+
+
+def iter_pttavm_products(everyproduct: bool = False) -> Iterator[dict]:
+    """
+    The function `iter_pttavm_products` streams the StokKontrolListesi 
+    response and yields the products one by one while it is downloaded.
     """
 
-    api_call = requestdata(uri='StokKontrolListesi')
-    products = []
+    api_call = requestdata(uri='StokKontrolListesi', stream=True)
 
-    if isinstance(api_call, requests.Response) and api_call.status_code == 200:
+    if not (isinstance(api_call, requests.Response) and api_call.status_code == 200):
 
-        products_list = formatdata(api_call)[
-            'StokKontrolListesiResponse']['StokKontrolListesiResult']['a:StokKontrolDetay']
+        raise ValueError(f"Request failure for PTTAVM | Response: {api_call}")
 
-        for product in products_list:
+    with api_call:
+
+        for product in iter_stock_details(api_call):
 
             if not everyproduct:
                 price = float(product['a:KDVsiz']) * (1 + int(product['a:KDVOran']) / 100)
 
-                products.append({'id': product['a:Barkod'],
-                                 'sku': product['a:UrunKodu'],
-                                 'quantity': int(product['a:Miktar']),
-                                 'price': price})
+                yield {'id': product['a:Barkod'],
+                       'sku': product['a:UrunKodu'],
+                       'quantity': int(product['a:Miktar']),
+                       'price': price}
             else:
 
-                products.append({'id': product['a:UrunKodu'],
-                                 'data': product})
+                yield {'id': product['a:UrunKodu'],
+                       'data': product}
+
+
+@emits_records("pttavm")
+def getpttavm_procuctskdata(everyproduct: bool = False, local: bool = False):
+    """
+    The function `getPTTAVM_procuctskData` retrieves product 
+    data from an API and returns a list of
+    products with specific details.
+    """
+
+    try:
 
-        logger.info(f"""PTTAVM fetched {len(products)} products""")
+        products = list(iter_pttavm_products(everyproduct))
 
-        return products
-    
-    else:
-        logger.error(f"""Request failure for PTTAVM | Response: {api_call}""")
+    except (ValueError, ElementTree.ParseError, requests.RequestException) as e:
+
+        logger.error(f"""Request failure for PTTAVM | Response: {e}""")
 
         return None
 
+    logger.info(f"""PTTAVM fetched {len(products)} products""")
 
-def pttavm_updatedata(product_data: dict):
-    """
-    The function `pttavm_updateData` updates product data 
-    on a platform called PTTAVM by sending a
-    request with the provided product information.
-    """
+    return products
 
-    sku = product_data['sku']
-    item_id = product_data['id']
-    quantity = product_data['quantity']
-    price = product_data['price']
-    # price_kdvsiz = product['price'] - product['price'] * 0.1
 
-    update_payload = f"""
-    <tem:StokFiyatGuncelle3>
+STOCK_PRICE_ITEM_TEMPLATE = """
         <tem:item>
             <ept:Aktif>true</ept:Aktif>
-            <ept:Barkod>{item_id}</ept:Barkod>
+            <ept:Barkod>{id}</ept:Barkod>
             <ept:KDVOran>10</ept:KDVOran>
             <ept:KDVli>{price}</ept:KDVli>
             <ept:KDVsiz>0</ept:KDVsiz>
             <ept:Miktar>{quantity}</ept:Miktar>
-            <ept:ShopId>{TedarikciId}</ept:ShopId>
-        </tem:item>
-    </tem:StokFiyatGuncelle3>"""
+            <ept:ShopId>{shop_id}</ept:ShopId>
+        </tem:item>"""
+
+STOCK_PRICE_ITEM = SoapTemplate(STOCK_PRICE_ITEM_TEMPLATE, shop_id=TedarikciId)
+
+STOCK_PRICE_REQUEST = SoapTemplate("""
+    <tem:StokFiyatGuncelle3>{items}
+    </tem:StokFiyatGuncelle3>""")
+
+
+def stock_price_items_payload(products: list) -> bytes:
+    """
+    The function `stock_price_items_payload` builds one StokFiyatGuncelle3 
+    body carrying a `tem:item` for every product in `products`.
+    """
+
+    # price_kdvsiz = product['price'] - product['price'] * 0.1
+    return STOCK_PRICE_REQUEST.render(items=STOCK_PRICE_ITEM.render_many(products))
+
+
+def stock_price_payload(product_data: dict) -> bytes:
+    """
+    The function `stock_price_payload` builds the StokFiyatGuncelle3 
+    body updating the stock and price of one product.
+    """
+
+    return stock_price_items_payload([product_data])
+
+
+def update_succeeded(response) -> bool:
+    """ The function `update_succeeded` reads the outcome of a StokFiyatGuncelle3 response."""
+
+    return find_text(response.content, 'Success', '').lower() == 'true'
+
+
+def update_results(response, item_count: int) -> list:
+    """
+    The function `update_results` reads every `a:Success` flag of a 
+    StokFiyatGuncelle3 response in item order. A single flag answers 
+    for the whole envelope.
+    """
+
+    outcomes = [flag.lower() == 'true' for flag in find_texts(response.content, 'Success')]
+
+    if len(outcomes) == 1:
+        return outcomes * item_count
+
+    return outcomes
+
+
+def _update_chunk(chunk: list) -> dict:
+    """ Send one StokFiyatGuncelle3 envelope and map its outcomes to the SKUs of `chunk`."""
+
+    update_request = requestdata(uri='StokFiyatGuncelle3', data=stock_price_items_payload(chunk))
 
-    update_request = requestdata(uri='StokFiyatGuncelle3', data=update_payload)
+    if not isinstance(update_request, requests.Response):
+
+        logger.error(f"""Request failure for {len(chunk)} PTTAVM products | Response: {update_request}""")
+
+        return {product['sku']: {'success': False, 'message': str(update_request)} for product in chunk}
+
+    outcomes = update_results(update_request, len(chunk))
+
+    # Items without a flag are left out and reported as missing by the caller
+    results = {product['sku']: success for product, success in zip(chunk, outcomes)}
+
+    logger.info(f"""PTTAVM updated {sum(results.values())} of {len(chunk)} products""")
+
+    return results
+
+
+def pttavm_update_products(products: list, batch_size: int = UPDATE_BATCH_SIZE,
+                           max_in_flight: int = MAX_UPDATES_IN_FLIGHT) -> dict:
+    """
+    The function `pttavm_update_products` updates the stock and price of 
+    many products, packing up to `batch_size` items into each 
+    StokFiyatGuncelle3 envelope and sending up to `max_in_flight` 
+    envelopes at once.
+
+    Returns a dict mapping each SKU to whether its update succeeded.
+    """
+
+    unique = {product['sku']: product for product in products}
+    payloads = list(unique.values())
+    chunks = [payloads[start:start + batch_size] for start in range(0, len(payloads), batch_size)]
+    results = {}
+
+    if not chunks:
+        return results
+
+    with ThreadPoolExecutor(max_workers=min(max_in_flight, len(chunks))) as executor:
+        for chunk_results in executor.map(_update_chunk, chunks):
+            results.update(chunk_results)
+
+    return results
+
+
+def pttavm_updatedata(product_data: dict) -> bool:
+    """
+    The function `pttavm_updateData` updates product data 
+    on a platform called PTTAVM by sending a
+    request with the provided product information and 
+    returns whether the update succeeded.
+    """
+
+    sku = product_data['sku']
+    quantity = product_data['quantity']
+    price = product_data['price']
+
+    update_request = requestdata(uri='StokFiyatGuncelle3', data=stock_price_payload(product_data))
 
     if isinstance(update_request, requests.Response):
 
-        responses_msg = formatdata(update_request)[
-            'StokFiyatGuncelle3Response']['StokFiyatGuncelle3Result']
+        success = update_succeeded(update_request)
 
         logger.info(f"""Product success: {
-            responses_msg['a:Success']}, sku: {sku}, New stock: {quantity}, New price: {price} updated successfully""")
+            success}, sku: {sku}, New stock: {quantity}, New price: {price} updated successfully""")
+
+        return success
 
-    else:
+    logger.error(f"""Request failure for product {sku} | Response: {
+        update_request}""")
 
-        logger.error(f"""Request failure for product {sku} | Response: {
-            update_request}""")
+    return False
 
 
 def save_to_csv(data, filename=""):
@@ -0,0 +1,256 @@
+""" Token bucket rate limiting shared by every platform client. Each platform endpoint
+ gets its own bucket, configured from constants and adjusted from the 429 and
+ Retry-After responses the platforms send back."""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+from app.config import logger
+from app.config.constants import (
+    API_RATE_BURST,
+    API_RATE_LIMIT,
+    API_RATE_LIMITS,
+    RATE_LIMIT_BACKOFF,
+    RATE_LIMIT_MIN_FACTOR,
+    RATE_LIMIT_RECOVERY,
+    RATE_LIMIT_RETRY_AFTER,
+)
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket with adaptive rate.
+
+    Callers reserve a token under a short lock and then sleep outside of it, so the
+    same bucket can be shared by threads and asyncio tasks. Reservations may drive the
+    token count negative, which queues waiters fairly instead of letting them race.
+    A bucket without a rate never makes callers wait except while paused after a 429.
+    """
+
+    def __init__(self, rate: Optional[float], capacity: Optional[float], name: str = ""):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Configured refill rate in tokens per second, None for no limit
+            capacity: Maximum number of tokens, the allowed burst
+            name: Bucket name used in log messages
+        """
+        self.name = name
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = max(capacity or 1, 1)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self.rate is None:
+            self._tokens = self.capacity
+            self._updated_at = now
+            return
+
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take `tokens` from the bucket and return how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.rate is None:
+                return max(0.0, self._blocked_until - now)
+
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Block the calling thread until `tokens` are available."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        """Suspend the calling task until `tokens` are available."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """
+        Back off after a rate limit response.
+
+        The rate is cut by RATE_LIMIT_BACKOFF and the bucket is paused for
+        `retry_after` seconds, or RATE_LIMIT_RETRY_AFTER if the platform sent none.
+        Unlimited buckets are only paused.
+        """
+        delay = RATE_LIMIT_RETRY_AFTER if retry_after is None else retry_after
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.rate is not None:
+                self.rate = max(self.rate * RATE_LIMIT_BACKOFF, self.max_rate * RATE_LIMIT_MIN_FACTOR)
+                self._tokens = min(self._tokens, 0)
+            self._blocked_until = max(self._blocked_until, now + delay)
+
+        if self.rate is None:
+            logger.warning(f"Rate limit hit for {self.name} || Pausing {delay:.1f} seconds")
+        else:
+            logger.warning(f"Rate limit hit for {self.name} || Pausing {delay:.1f} seconds, "
+                           f"rate lowered to {self.rate * 60:.1f} requests per minute")
+
+    def reward(self) -> None:
+        """Recover part of the configured rate after a successful request."""
+        if self.rate is None or self.rate >= self.max_rate:
+            return
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_LIMIT_RECOVERY)
+
+    def set_rate(self, rate: float) -> None:
+        """Replace the configured rate, e.g. with the limit a platform advertises."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.rate, rate) if self.rate is not None and self.rate < self.max_rate else rate
+            self.max_rate = rate
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Read the Retry-After header of a response.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def endpoint_key(path: str, depth: int = 2) -> str:
+    """
+    Reduce a request path to the endpoint family it is rate limited under.
+
+    Ids and query strings are dropped so `/products/batch-requests/123?x=1` and
+    `/products/batch-requests/456` share the `products/batch-requests` bucket.
+    """
+    segments = path.split("?", 1)[0].strip("/").split("/")
+
+    return "/".join(segments[:depth])
+
+
+class RateLimiter:
+    """Registry of token buckets keyed by platform and endpoint."""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        default_limit: Optional[float] = API_RATE_LIMIT,
+        default_burst: Optional[float] = API_RATE_BURST,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            limits: (requests per minute, burst) keyed by platform or 'platform:endpoint',
+                None requests per minute for an unthrottled platform
+            default_limit: Requests per minute for platforms without an entry, None for no limit
+            default_burst: Burst for platforms without an entry
+        """
+        self.limits = API_RATE_LIMITS if limits is None else limits
+        self.default_limit = default_limit
+        self.default_burst = default_burst
+        self._buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _limit_for(self, platform: str, endpoint: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+        if endpoint and f"{platform}:{endpoint}" in self.limits:
+            return self.limits[f"{platform}:{endpoint}"]
+
+        return self.limits.get(platform, (self.default_limit, self.default_burst))
+
+    def limit(self, platform: str, endpoint: Optional[str] = None) -> Tuple[Optional[float], Optional[float]]:
+        """Return the configured (requests per minute, burst) of a platform endpoint, None if unthrottled."""
+        return self._limit_for(platform, endpoint)
+
+    def bucket(self, platform: str, endpoint: Optional[str] = None) -> TokenBucket:
+        """Return the bucket of a platform endpoint, creating it on first use."""
+        key = (platform, endpoint)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    per_minute, burst = self._limit_for(platform, endpoint)
+                    name = f"{platform}:{endpoint}" if endpoint else platform
+                    rate = None if per_minute is None else per_minute / 60
+                    bucket = self._buckets[key] = TokenBucket(rate, burst, name)
+
+        return bucket
+
+    def acquire(self, platform: str, endpoint: Optional[str] = None) -> None:
+        self.bucket(platform, endpoint).acquire()
+
+    async def acquire_async(self, platform: str, endpoint: Optional[str] = None) -> None:
+        await self.bucket(platform, endpoint).acquire_async()
+
+    def penalize(self, platform: str, endpoint: Optional[str] = None, retry_after: Optional[float] = None) -> None:
+        self.bucket(platform, endpoint).penalize(retry_after)
+
+    def update(self, platform: str, endpoint: Optional[str], status_code: int, headers: Mapping[str, str]) -> bool:
+        """
+        Feed a response back into the bucket it was sent under.
+
+        Args:
+            platform: Platform name
+            endpoint: Endpoint key, None for the platform wide bucket
+            status_code: HTTP status of the response
+            headers: Response headers
+
+        Returns:
+            True if the response was a rate limit rejection and should be retried
+        """
+        bucket = self.bucket(platform, endpoint)
+
+        # SP-API advertises the real per operation limit on every response
+        advertised = headers.get("x-amzn-RateLimit-Limit")
+        if advertised:
+            try:
+                bucket.set_rate(float(advertised))
+            except ValueError:
+                pass
+
+        if status_code == 429:
+            bucket.penalize(retry_after_seconds(headers))
+            return True
+
+        if status_code < 400:
+            bucket.reward()
+
+        return False
+
+
+# Process wide limiter shared by every platform client
+rate_limiter = RateLimiter()
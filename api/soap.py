@@ -0,0 +1,249 @@
+""" Small SOAP toolkit for the hand written envelopes of PTTAVM and the N11 SOAP API.
+ Templates are split into static byte segments once, so a call only escapes and joins its
+ own values, and responses are scanned for the few elements a caller needs instead of
+ being converted to dicts as a whole."""
+
+import html
+import io
+import re
+from functools import lru_cache
+from string import Formatter
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping, Optional, Pattern, Union
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+Source = Union[bytes, str, BinaryIO]
+
+
+def xml_text(value: Any) -> str:
+    """
+    Convert a template value to XML text.
+
+    Bytes are taken as already rendered XML and inserted as they are, None renders
+    empty, booleans render as xsd booleans and everything else is escaped text.
+    """
+    value_type = type(value)
+
+    # Exact type checks first, they cover nearly every value and cost less than isinstance
+    if value_type is str:
+        return escape(value)
+    if value_type is int or value_type is float:
+        return str(value)
+    if value_type is bytes:
+        return value.decode("utf-8")
+    if value is None:
+        return ""
+    if value_type is bool:
+        return "true" if value else "false"
+    return escape(str(value))
+
+
+class SoapTemplate:
+    """
+    Precompiled XML template with `{name}` placeholders.
+
+    Values known up front, like credentials and namespaces, are given as keyword
+    arguments and folded into the static segments at construction, so a render only
+    escapes the per-call values, joins them with the static segments and encodes the
+    result once.
+    """
+
+    __slots__ = ("_head", "_segments", "_byte_head", "_byte_segments", "fields")
+
+    def __init__(self, template: str, **static: Any):
+        """
+        Compile a template.
+
+        Args:
+            template: XML with `{name}` placeholders, literal braces doubled
+            **static: Placeholder values rendered once into the static segments
+        """
+        parts = []
+        fields = []
+        literal = []
+
+        for text, name, _, _ in Formatter().parse(template):
+            literal.append(text)
+            if name is None:
+                continue
+
+            if name in static:
+                literal.append(xml_text(static[name]))
+            else:
+                parts.append("".join(literal))
+                fields.append(name)
+                literal = []
+
+        parts.append("".join(literal))
+
+        self.fields = tuple(fields)
+        self._head = parts[0]
+        # Each placeholder paired with the static segment following it
+        self._segments = tuple(zip(self.fields, parts[1:]))
+        self._byte_head = self._head.encode("utf-8")
+        self._byte_segments = tuple((name, segment.encode("utf-8")) for name, segment in self._segments)
+
+    def render(self, **values: Any) -> bytes:
+        """
+        Fill the placeholders with `values` and return the document as bytes.
+
+        Works on bytes, so an already rendered body given as bytes is joined into the
+        envelope without being decoded and encoded again.
+        """
+        rendered = [self._byte_head]
+
+        for name, segment in self._byte_segments:
+            value = values[name]
+            rendered.append(value if type(value) is bytes else xml_text(value).encode("utf-8"))
+            rendered.append(segment)
+
+        return b"".join(rendered)
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]]) -> bytes:
+        """
+        Render the template once per row and return the concatenation, for repeated
+        elements like the items of a bulk request. Rows are mappings keyed by
+        placeholder name, product dicts can be passed as they are.
+        """
+        head, segments = self._head, self._segments
+        rendered = []
+        append = rendered.append
+
+        # The common value types are handled inline, a call per value is most of the cost
+        for values in rows:
+            append(head)
+            for name, segment in segments:
+                value = values[name]
+                value_type = type(value)
+                if value_type is str:
+                    append(escape(value))
+                elif value_type is int or value_type is float:
+                    append(str(value))
+                else:
+                    append(xml_text(value))
+                append(segment)
+
+        return "".join(rendered).encode("utf-8")
+
+
+def local_name(tag: str) -> str:
+    """Tag without its `{namespace}` part."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def element_to_dict(element: ElementTree.Element, prefixes: Dict[str, str]) -> Any:
+    """
+    Convert an element into the same structure `xmltodict.parse` builds, keeping the
+    namespace prefixes of the original document in the keys.
+    """
+    def qualified_name(tag):
+        if tag[0] == "{":
+            uri, name = tag[1:].split("}", 1)
+            prefix = prefixes.get(uri)
+            return f"{prefix}:{name}" if prefix else name
+        return tag
+
+    content = {f"@{qualified_name(key)}": value for key, value in element.attrib.items()}
+
+    for child in element:
+        key = qualified_name(child.tag)
+        value = element_to_dict(child, prefixes)
+
+        if key in content:
+            if not isinstance(content[key], list):
+                content[key] = [content[key]]
+            content[key].append(value)
+        else:
+            content[key] = value
+
+    text = element.text.strip() if element.text and element.text.strip() else None
+
+    if not content:
+        return text
+
+    if text is not None:
+        content["#text"] = text
+
+    return content
+
+
+def _read(source: Source) -> bytes:
+    if isinstance(source, str):
+        return source.encode("utf-8")
+    if isinstance(source, bytes):
+        return source
+    return source.read()
+
+
+def _stream(source: Source) -> BinaryIO:
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    return source
+
+
+def iter_elements(source: Source, tag: str) -> Iterator[Any]:
+    """
+    Yield every `tag` element of a document as a dict as soon as it is closed.
+
+    Processed elements are dropped from the tree, so memory use does not grow with the
+    number of elements and a streamed response can be parsed while it is downloaded.
+
+    Args:
+        source: Document as bytes, text or a binary file object
+        tag: Local name of the elements to yield, without namespace prefix
+    """
+    prefixes = {}
+    parents = []
+
+    for event, item in ElementTree.iterparse(_stream(source), events=("start-ns", "start", "end")):
+        if event == "start-ns":
+            prefix, uri = item
+            prefixes[uri] = prefix
+
+        elif event == "start":
+            parents.append(item)
+
+        else:
+            parents.pop()
+
+            if local_name(item.tag) == tag:
+                yield element_to_dict(item, prefixes)
+
+                # Drop the processed element so the tree never holds more than one of them
+                if parents:
+                    parents[-1].remove(item)
+
+
+@lru_cache(maxsize=None)
+def _text_pattern(name: str) -> Pattern[bytes]:
+    # Opening tag with any prefix and attributes, plain text, then a closing tag
+    return re.compile(rb"<(?:[\w.-]+:)?" + re.escape(name.encode("utf-8")) + rb"(?:\s[^>]*)?>([^<]*)</")
+
+
+def _text(raw: bytes) -> str:
+    text = raw.decode("utf-8").strip()
+    return html.unescape(text) if "&" in text else text
+
+
+def find_texts(source: Source, name: str) -> List[str]:
+    """
+    Text of every leaf element with local name `name`, in document order.
+
+    The document is scanned, not parsed, which is many times faster than building a
+    tree for the one or two values a response is read for. Self closing elements are
+    skipped, and text is expected as plain character data, not CDATA.
+    """
+    return [_text(raw) for raw in _text_pattern(name).findall(_read(source))]
+
+
+def find_text(source: Source, name: str, default: Optional[str] = None) -> Optional[str]:
+    """Text of the first leaf element with local name `name`, `default` if there is none."""
+    match = _text_pattern(name).search(_read(source))
+    return _text(match.group(1)) if match else default
+
+
+def fault_string(source: Source) -> Optional[str]:
+    """The `faultstring` of a SOAP fault, None if the document carries none."""
+    return find_text(source, "faultstring")
@@ -0,0 +1,95 @@
+""" Cache for platform access tokens. A token is fetched once and reused by every
+ request until shortly before it expires, instead of minting a new one per call."""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.config import logger
+from app.config.constants import TOKEN_REFRESH_MARGIN
+
+# (token, seconds until expiry), None for tokens that never expire
+TokenFetcher = Callable[[], Tuple[Any, Optional[float]]]
+
+
+class TokenManager:
+    """
+    Thread safe cache around a token fetch function.
+
+    Reads are lock free while the cached token is valid. When it has to be refreshed,
+    the first thread fetches a new one under the lock and every other thread waiting on
+    the lock gets that same token, so a burst of requests triggers a single refresh.
+    """
+
+    def __init__(self, fetch_token: TokenFetcher, refresh_margin: float = TOKEN_REFRESH_MARGIN, name: str = ""):
+        """
+        Initialize the token manager.
+
+        Args:
+            fetch_token: Function returning a new token and its lifetime in seconds
+            refresh_margin: Seconds before expiry the token is considered stale
+            name: Name used in log messages
+        """
+        self.fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.name = name
+        self._token: Any = None
+        self._expires_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def expires_at(self) -> Optional[float]:
+        """Unix timestamp the cached token expires at, None if it does not expire."""
+        return self._expires_at
+
+    def _is_valid(self) -> bool:
+        if self._token is None:
+            return False
+
+        return self._expires_at is None or time.time() < self._expires_at - self.refresh_margin
+
+    def get(self) -> Any:
+        """
+        Return a valid token, fetching a new one if the cached token is stale.
+
+        Raises:
+            Whatever the fetch function raises, the cache is left empty in that case
+        """
+        if self._is_valid():
+            return self._token
+
+        with self._lock:
+            # Another thread may have refreshed the token while this one was waiting
+            if self._is_valid():
+                return self._token
+
+            token, expires_in = self.fetch_token()
+            self._token = token
+            self._expires_at = None if expires_in is None else time.time() + expires_in
+            logger.info(f"Fetched a new {self.name} access token")
+
+            return token
+
+    def invalidate(self) -> None:
+        """Drop the cached token, e.g. after the platform rejected it."""
+        with self._lock:
+            self._token = None
+            self._expires_at = None
+
+
+_managers: Dict[Hashable, TokenManager] = {}
+_managers_lock = threading.Lock()
+
+
+def token_manager_for(key: Hashable, fetch_token: TokenFetcher, **kwargs) -> TokenManager:
+    """
+    Return the process wide token manager registered under `key`.
+
+    Clients created for the same credentials share one manager and so one token.
+    `fetch_token` and `kwargs` are only used when the manager is first created.
+    """
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = TokenManager(fetch_token, **kwargs)
+
+        return _managers[key]
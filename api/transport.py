@@ -0,0 +1,143 @@
+""" Shared HTTP transport for all platform clients. Requests go through one keep-alive
+ connection pool per host, so paginated fetches and update loops reuse connections
+ instead of paying a new TCP and TLS handshake for every call."""
+
+import threading
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+
+from api.rate_limiter import rate_limiter
+from app.config.constants import (
+    HTTP_CONNECT_RETRIES,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_HOST_POOL_SIZES,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_READ_TIMEOUT,
+)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class HTTPTransport:
+    """
+    Pooled HTTP transport with one `requests.Session` per host.
+
+    Sessions are created lazily and shared by every client talking to the same host.
+    They carry no credentials, clients pass their own headers on every request.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = HTTP_POOL_CONNECTIONS,
+        pool_maxsize: int = HTTP_POOL_MAXSIZE,
+        host_pool_sizes: Optional[Dict[str, int]] = None,
+        timeout: Timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT),
+        connect_retries: int = HTTP_CONNECT_RETRIES,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_connections: Number of connection pools kept per session
+            pool_maxsize: Keep-alive connections kept per host
+            host_pool_sizes: Optional per-host overrides of `pool_maxsize`
+            timeout: Default (connect, read) timeout applied when a request sets none
+            connect_retries: Retries for connection errors, requests that reached
+                the server are never retried here
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_sizes = {**HTTP_HOST_POOL_SIZES, **(host_pool_sizes or {})}
+        self.timeout = timeout
+        self.connect_retries = connect_retries
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self, host: str) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.host_pool_sizes.get(host, self.pool_maxsize),
+            max_retries=Retry(total=self.connect_retries, read=0, status=0, backoff_factor=0.5),
+            pool_block=False,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        return session
+
+    def session_for(self, url: str) -> requests.Session:
+        """Return the pooled session for the host of `url`."""
+        host = urlsplit(url).netloc
+
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._sessions[host] = self._create_session(host)
+
+        return session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[Timeout] = None,
+        platform: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request through the pooled session of the target host.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            timeout: Optional timeout, the transport default is used if None
+            platform: Platform whose rate limit bucket the request is sent under,
+                no rate limiting is applied if None
+            endpoint: Endpoint key of the bucket, the platform wide bucket if None
+            **kwargs: Passed on to `requests.Session.request`
+
+        Returns:
+            The response object. Rate limit rejections are returned as is after the
+            bucket has been paused, so a retry waits as long as the platform asked.
+        """
+        if platform:
+            rate_limiter.acquire(platform, endpoint)
+
+        response = self.session_for(url).request(method, url, timeout=timeout or self.timeout, **kwargs)
+
+        if platform:
+            rate_limiter.update(platform, endpoint, response.status_code, response.headers)
+
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        """Close every pooled session."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+# Process wide transport shared by every platform client
+transport = HTTPTransport()
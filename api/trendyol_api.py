@@ -6,8 +6,13 @@ from box import Box
 import requests
 from typing import Optional, List, Dict, Union
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
 from app.config.logging_init import logger
+from app.product_record import emits_records
+from api.pagination import Page, Paginator
+from api.rate_limiter import endpoint_key
+from api.transport import transport
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -47,9 +52,12 @@ class TrendyolClient:
     
     BASE_URL = "https://api.trendyol.com/sapigw/suppliers"
     BATCH_SIZE = 100
+    STOCK_PAGE_SIZE = 200  # Max page size accepted by the products endpoint
+    STOCK_FETCH_WORKERS = 4
+    PRICE_INVENTORY_BATCH_SIZE = 1000  # Max items per price-and-inventory request
+    BATCH_POLL_INTERVAL = 5
+    BATCH_TIMEOUT = 900
     MAX_RETRIES = 3
-    RATE_LIMIT_WAIT = 15
-    REQUEST_TIMEOUT = 3000
 
     def __init__(self, store_id: Optional[str] = None, auth_hash: Optional[str] = None, logger=None):
         """
@@ -99,12 +107,13 @@ class TrendyolClient:
         
         for attempt in range(retries):
             try:
-                response = requests.request(
+                response = transport.request(
                     request_type.value,
                     url,
                     headers=self.headers,
                     data=payload_data,
-                    timeout=self.REQUEST_TIMEOUT
+                    platform="trendyol",
+                    endpoint=endpoint_key(endpoint)
                 )
                 
                 if response.status_code == 200:
@@ -112,8 +121,8 @@ class TrendyolClient:
                 elif response.status_code == 400:
                     raise TrendyolAPIError(f"Malformed request: {response.text}")
                 elif response.status_code == 429:
-                    logger.warning("Rate limit reached, waiting...")
-                    time.sleep(self.RATE_LIMIT_WAIT)
+                    # The limiter has already paused this endpoint for as long as Trendyol asked
+                    logger.warning("Rate limit reached, retrying...")
                     continue
                     
                 response.raise_for_status()
@@ -127,6 +136,37 @@ class TrendyolClient:
                 
         raise TrendyolAPIError(f"Request failed after {retries} attempts")
 
+    def _get_batch_status(self, batch_request_id: str) -> Dict:
+        """
+        Fetch the current state of a batch request.
+        
+        Args:
+            batch_request_id: The ID of the batch request
+            
+        Returns:
+            Dict containing the batch request status and items
+        """
+        response = self._make_request(
+            f'/products/batch-requests/{batch_request_id}',
+            RequestType.GET
+        )
+        return response.json()
+
+    @staticmethod
+    def _is_batch_done(batch_status: Dict) -> bool:
+        """Check whether every item of a batch request has been processed."""
+        if batch_status.get('status') == 'COMPLETED':
+            return True
+        
+        items = batch_status.get('items') or []
+        item_count = batch_status.get('itemCount') or 0
+        
+        return (
+            bool(items)
+            and len(items) >= item_count
+            and all(item.get('status') in ('SUCCESS', 'FAILED') for item in items)
+        )
+
     def _wait_for_batch_completion(self, batch_request_id: str) -> Dict:
         """
         Wait for a batch request to complete and return the result.
@@ -138,11 +178,7 @@ class TrendyolClient:
             Dict containing the batch request results
         """
         while True:
-            response = self._make_request(
-                f'/products//batch-requests/{batch_request_id}',
-                RequestType.GET
-            )
-            batch_status = response.json()
+            batch_status = self._get_batch_status(batch_request_id)
             
             if len(batch_status['items']) > 0 and batch_status['items'][0].get('status') == 'SUCCESS':
                 return batch_status
@@ -152,11 +188,82 @@ class TrendyolClient:
             
             time.sleep(5)
 
+    def _fetch_products_page(self, page: int, page_size: int, filters: str) -> Page:
+        """Fetch one page of the products endpoint."""
+        uri_addon = f"?page={page}&size={page_size}{filters}"
+        response = self._make_request(f"/products{uri_addon}", RequestType.GET)
+        data = response.json()
+        
+        return Page(page, data['content'], int(data['totalPages']))
+
+    @staticmethod
+    def _to_product_data(item: Dict, include_full_data: bool = False) -> Dict:
+        """Convert a products endpoint item into a ProductData shaped dict."""
+        if include_full_data:
+            return {'sku': item.get('stockCode') or item.get('productMainId'), "data": item, "platform": "trendyol"}
+        
+        return {"sku": item.get('stockCode') or item.get('productMainId'),
+                "id": item.get('barcode'),
+                "quantity": item.get('quantity', 0),
+                "price": item.get('salePrice', 0.0),
+                "title": item.get('title'),
+                "product_main_id": item.get('productMainId')}
+
+    def iter_stock_data(
+        self, 
+        include_full_data: bool = False, 
+        filters: str = '',
+        page_size: int = STOCK_PAGE_SIZE,
+        max_workers: int = STOCK_FETCH_WORKERS,
+        ordered: bool = False
+    ):
+        """
+        Stream product stock data from Trendyol as pages arrive.
+        
+        The first page gives the page count, the remaining pages are fetched
+        concurrently by `max_workers` threads.
+        
+        Args:
+            include_full_data: Whether to include complete product data
+            filters: Additional filters for the API request
+            page_size: Number of items per page
+            max_workers: Number of pages fetched concurrently
+            ordered: Yield products in page order instead of arrival order
+            
+        Yields:
+            ProductData shaped dicts
+            
+        Raises:
+            TrendyolAPIError: After the last page if any page still failed after its
+                retries, so a partial catalog is never taken for a complete one
+        """
+        paginator = Paginator(
+            lambda page: self._fetch_products_page(page, page_size, filters),
+            first_page=0,
+            max_workers=max_workers,
+            name="Trendyol"
+        )
+        
+        for page in paginator.iter_pages(ordered=ordered):
+            for item in page.items:
+                yield self._to_product_data(item, include_full_data)
+        
+        if paginator.errors:
+            logger.error(f"Trendyol fetch is incomplete || Failed pages: {sorted(paginator.errors)}")
+            raise TrendyolAPIError(f"Trendyol pages {sorted(paginator.errors)} could not be fetched")
+
+    @staticmethod
+    def modified_since_filter(since: datetime) -> str:
+        """Products endpoint filter selecting the products changed since `since`."""
+        return f"&dateQueryType=LAST_MODIFIED_DATE&startDate={int(since.timestamp() * 1000)}"
+
+    @emits_records("trendyol")
     def get_stock_data(
         self, 
         include_full_data: bool = False, 
         filters: str = '',
-        page_size: int = BATCH_SIZE
+        page_size: int = STOCK_PAGE_SIZE,
+        max_workers: int = STOCK_FETCH_WORKERS
     ) -> List[ProductData]:
         """
         Fetch product stock data from Trendyol.
@@ -165,47 +272,12 @@ class TrendyolClient:
             include_full_data: Whether to include complete product data
             filters: Additional filters for the API request
             page_size: Number of items per page
+            max_workers: Number of pages fetched concurrently
             
         Returns:
-            List of ProductData objects
+            List of ProductData objects, in page order
         """
-        
-        page = 0
-        products = []
-        
-        while True:
-            uri_addon = f"?page={page}&size={page_size}{filters}"
-            response = self._make_request(f"/products{uri_addon}", RequestType.GET)
-            data = response.json()
-            
-            if not data['content']:
-                break
-                
-            for item in data['content']:
-                # product = ProductData(
-                #     sku=item.get('stockCode') or item.get('productMainId'),
-                #     barcode=item.get('barcode'),
-                #     quantity=item.get('quantity', 0),
-                #     price=item.get('salePrice', 0.0),
-                #     title=item.get('title'),
-                #     product_main_id=item.get('productMainId'),
-                #     raw_data=item if include_full_data else None
-                # )
-                if include_full_data:
-                    product = {'sku': item.get('stockCode') or item.get('productMainId'), "data": item, "platform": "trendyol"}
-                else:
-                    product = {"sku": item.get('stockCode') or item.get('productMainId'),
-                               "id": item.get('barcode'),
-                               "quantity": item.get('quantity', 0),
-                               "price": item.get('salePrice', 0.0),
-                               "title": item.get('title'),
-                               "product_main_id": item.get('productMainId')}
-                products.append(product)
-            
-            if page >= int(data['totalPages']) - 1:
-                break
-                
-            page += 1
+        products = list(self.iter_stock_data(include_full_data, filters, page_size, max_workers, ordered=True))
             
         logger.info(f"Retrieved {len(products)} products from Trendyol")
         return products
@@ -262,6 +334,150 @@ class TrendyolClient:
             logger.error(f"Error updating product {product.sku}: {str(e)}")
             return False
 
+    def _wait_for_batches(self, batch_request_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Poll several batch requests together until all of them are processed.
+        
+        Args:
+            batch_request_ids: IDs of the outstanding batch requests
+            
+        Returns:
+            Dict mapping batch request IDs to their final status; batches that did not
+            finish before BATCH_TIMEOUT are missing from the result
+        """
+        outstanding = list(batch_request_ids)
+        finished = {}
+        deadline = time.monotonic() + self.BATCH_TIMEOUT
+        
+        while outstanding:
+            for batch_request_id in list(outstanding):
+                try:
+                    batch_status = self._get_batch_status(batch_request_id)
+                except TrendyolAPIError as e:
+                    logger.error(f"Failed to check batch {batch_request_id}: {str(e)}")
+                    continue
+                
+                if self._is_batch_done(batch_status):
+                    finished[batch_request_id] = batch_status
+                    outstanding.remove(batch_request_id)
+            
+            if not outstanding:
+                break
+            
+            if time.monotonic() >= deadline:
+                logger.error(f"Timed out waiting for batches: {', '.join(outstanding)}")
+                break
+            
+            time.sleep(self.BATCH_POLL_INTERVAL)
+        
+        return finished
+
+    def update_products(
+        self, 
+        products: List[Dict], 
+        batch_size: int = PRICE_INVENTORY_BATCH_SIZE
+    ) -> Dict[str, bool]:
+        """
+        Update price and inventory of many products with as few requests as possible.
+        
+        Products are packed into price-and-inventory requests of up to `batch_size`
+        items. All batches are submitted first and then polled together.
+        
+        Args:
+            products: Product dicts with id (barcode), sku, quantity and price
+            batch_size: Number of items sent per request
+            
+        Returns:
+            Dict mapping each barcode to whether its update succeeded, products
+            with a malformed quantity or price are reported as failed
+        """
+        items, skus, invalid = self._build_price_inventory_items(products)
+        batch_request_ids = []
+        
+        for chunk in self._chunk_items(items, batch_size):
+            try:
+                response = self._make_request(
+                    "/products/price-and-inventory",
+                    RequestType.POST,
+                    {"items": chunk}
+                )
+                batch_request_ids.append(response.json()['batchRequestId'])
+            except TrendyolAPIError as e:
+                logger.error(f"Error submitting batch of {len(chunk)} products: {str(e)}")
+        
+        results = self._collect_batch_results(self._wait_for_batches(batch_request_ids), items, skus)
+        results.update(invalid)
+        return results
+
+    @staticmethod
+    def _build_price_inventory_items(products: List[Dict]) -> tuple:
+        """
+        Build price-and-inventory items keyed by barcode, a barcode to SKU map and a
+        failed result for every product that could not be turned into an item.
+        """
+        items = {}
+        skus = {}
+        invalid = {}
+        
+        for product in products:
+            barcode = product.get('id')
+            try:
+                items[barcode] = {
+                    "barcode": barcode,
+                    "quantity": int(product['quantity']),
+                    "salePrice": float(product['price'])
+                }
+                skus[barcode] = product.get('sku', barcode)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Skipping malformed product {product.get('sku', barcode)}: {e!r}")
+                invalid[barcode] = False
+        
+        return items, skus, invalid
+
+    @staticmethod
+    def _chunk_items(items: Dict[str, Dict], batch_size: int) -> List[List[Dict]]:
+        barcodes = list(items)
+        return [
+            [items[barcode] for barcode in barcodes[start:start + batch_size]]
+            for start in range(0, len(barcodes), batch_size)
+        ]
+
+    @staticmethod
+    def _collect_batch_results(
+        batch_statuses: Dict[str, Dict], 
+        items: Dict[str, Dict], 
+        skus: Dict[str, str]
+    ) -> Dict[str, bool]:
+        """Map finished batch statuses to a per barcode success map and log the outcome."""
+        results = {barcode: False for barcode in items}
+        
+        for batch_status in batch_statuses.values():
+            for item in batch_status.get('items', []):
+                barcode = item.get('requestItem', {}).get('barcode')
+                
+                if barcode not in results:
+                    continue
+                
+                if item.get('status') == 'SUCCESS':
+                    results[barcode] = True
+                    logger.info(
+                        f'Product {skus[barcode]} updated: '
+                        f'quantity {items[barcode]["quantity"]}, price {items[barcode]["salePrice"]}'
+                    )
+                else:
+                    logger.error(
+                        f'Failed to update product {skus[barcode]}: '
+                        f'{item.get("failureReasons")}'
+                    )
+        
+        successful = sum(results.values())
+        logger.info(
+            f"Trendyol bulk update finished: {successful} updated, "
+            f"{len(results) - successful} failed in {len(batch_statuses)} batches"
+        )
+        
+        return results
+
     def delete_products(
         self, 
         products: List[ProductData], 
@@ -1,12 +1,21 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from typing_extensions import TypedDict
 import os
 import re
 import json
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
 
+from requests.auth import HTTPBasicAuth
 from woocommerce import API
 from dataclasses import dataclass
 from app.config.logging_init import logger
+from app.product_record import emits_records
+from app.config.constants import HTTP_READ_TIMEOUT
+from api.pagination import Page, Paginator
+from api.rate_limiter import endpoint_key
+from api.transport import transport
 
 
 
@@ -44,13 +53,62 @@ class WooCommerceAPIConfig:
     consumer_key: str = os.environ.get("EMANHALISHOP_KEY")
     consumer_secret: str = os.environ.get("EMANHALISHOP_SECRET")
     version: str = "wc/v3"
-    timeout: int = 3000
+    timeout: int = HTTP_READ_TIMEOUT
+
+class PooledWooCommerceAPI(API):
+    """WooCommerce API whose requests go through the shared pooled transport instead of
+    opening a new connection for every call."""
+
+    def _API__request(self, method, endpoint, data, params=None, **kwargs):
+        if params is None:
+            params = {}
+        url = self._API__get_url(endpoint)
+        auth = None
+        headers = {
+            "user-agent": f"{self.user_agent}",
+            "accept": "application/json"
+        }
+
+        if self.is_ssl is True and self.query_string_auth is False:
+            auth = HTTPBasicAuth(self.consumer_key, self.consumer_secret)
+        elif self.is_ssl is True and self.query_string_auth is True:
+            params.update({
+                "consumer_key": self.consumer_key,
+                "consumer_secret": self.consumer_secret
+            })
+        else:
+            url = f"{url}?{urlencode(params)}"
+            url = self._API__get_oauth_url(url, method, **kwargs)
+
+        if data is not None:
+            data = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            headers["content-type"] = "application/json;charset=utf-8"
+
+        return transport.request(
+            method=method,
+            url=url,
+            verify=self.verify_ssl,
+            auth=auth,
+            params=params,
+            data=data,
+            timeout=(transport.timeout[0], self.timeout),
+            headers=headers,
+            platform="wordpress",
+            # products/123 and products/batch share the products bucket
+            endpoint=endpoint_key(endpoint, depth=1),
+            **kwargs
+        )
 
 class WooCommerceAPIClient:
+    BATCH_SIZE = 100  # Max operations accepted by products/batch
+    MAX_BATCH_WORKERS = 4
+    PAGE_SIZE = 100  # Max per_page accepted by the REST API
+    STOCK_FIELDS = "id,sku,price,stock_quantity"  # All _filter_products reads without every_product
+
     def __init__(self, config: WooCommerceAPIConfig = WooCommerceAPIConfig()):
         """Initialize WooCommerce API client with configuration."""
         self.logger = logger
-        self.wcapi = API(
+        self.wcapi = PooledWooCommerceAPI(
             url=config.url,
             consumer_key=config.consumer_key,
             consumer_secret=config.consumer_secret,
@@ -70,24 +128,39 @@ class WooCommerceAPIClient:
             self.logger.error(f"Failed to decode JSON response for {operation}")
             return None
 
-    def get_all_products(self, every_product: bool = False) -> List[Dict[str, Any]]:
-        """Fetch all products with pagination."""
-        products: List[Dict[str, Any]] = []
-        page = 1
+    def _fetch_products_page(self, page: int, every_product: bool, modified_after: Optional[datetime] = None) -> Page:
+        """Fetch one products page, reading the page count from X-WP-TotalPages."""
+        params = {"per_page": self.PAGE_SIZE, "page": page}
+        if not every_product:
+            params["_fields"] = self.STOCK_FIELDS
+        if modified_after:
+            params["modified_after"] = modified_after.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            params["dates_are_gmt"] = "true"
         
-        while True:
-            response = self.wcapi.get('products', params={"per_page": 100, "page": page})
-            current_products = self._handle_api_response(response, "Products fetch")
-            
-            if not current_products:
-                break
-                
-            products.extend(current_products)
-            
-            if len(current_products) < 100:
-                break
-                
-            page += 1
+        response = self.wcapi.get('products', params=params)
+        current_products = self._handle_api_response(response, "Products fetch")
+        
+        if current_products is None:
+            raise ValueError(f"Products page {page} could not be fetched")
+        
+        total_pages = response.headers.get("X-WP-TotalPages")
+        return Page(page, current_products, int(total_pages) if total_pages else None)
+
+    @emits_records("wordpress")
+    def get_all_products(self, every_product: bool = False, modified_after: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch all products, or only the ones modified after `modified_after`, the pages after the first one concurrently.
+
+        Raises:
+            ValueError: If any page still failed after its retries, so a partial catalog is never saved as a complete one.
+        """
+        paginator = Paginator(
+            lambda page: self._fetch_products_page(page, every_product, modified_after), first_page=1, name="WordPress"
+        )
+        products = paginator.fetch_all()
+
+        if paginator.errors:
+            raise ValueError(f"WordPress pages {sorted(paginator.errors)} could not be fetched")
 
         filtered_products = self._filter_products(products, every_product)
         self.logger.info(f"Fetched {len(filtered_products)} products from WordPress")
@@ -115,16 +188,20 @@ class WooCommerceAPIClient:
                 
         return filtered_products
 
-    def update_product(self, product_data: ProductData) -> bool:
-        """Update a single product's stock and price information."""
+    def _build_update_data(self, product_data: ProductData) -> Dict[str, Any]:
+        """Build the stock and price payload of a product update."""
         stock_status = 'instock' if int(product_data['quantity']) > 0 else 'outofstock'
         
-        update_data = {
+        return {
             "price": str(product_data['price']),
             'stock_quantity': str(product_data['quantity']),
             'stock_status': stock_status,
             "manage_stock": True
         }
+
+    def update_product(self, product_data: ProductData) -> bool:
+        """Update a single product's stock and price information."""
+        update_data = self._build_update_data(product_data)
         
         response = self.wcapi.put(f"products/{product_data['id']}", update_data)
         result = self._handle_api_response(response, "Product update")
@@ -150,28 +227,114 @@ class WooCommerceAPIClient:
                 self._categories_cache = []
         return self._categories_cache
 
+    def _build_product_payload(self, product_data: Dict[str, Any]) -> WooCommerceProduct:
+        """Build the payload of a new product."""
+        category = self._determine_category(product_data['title'])
+        attrs = self._format_attributes(product_data.get('attributes', []))
+        images = self._format_images(product_data)
+        
+        return {
+            "name": product_data['title'],
+            "type": "simple",
+            "sku": product_data['stockCode'],
+            "manage_stock": product_data['quantity'] > 0,
+            "stock_quantity": product_data['quantity'],
+            "stock_status": 'instock' if product_data['quantity'] > 0 else 'outofstock',
+            "tax_status": "taxable",
+            "sale_price": str(product_data['salePrice']),
+            "regular_price": str(product_data['listPrice']),
+            "description": re.sub(r"[?]", '', product_data['description']) + attrs,
+            "short_description": product_data['title'],
+            "categories": category,
+            "images": images
+        }
+
+    def _send_batch(self, operation: str, chunk: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, bool]:
+        """Send one products/batch request and map each item's outcome to its SKU."""
+        response = self.wcapi.post("products/batch", {operation: [payload for _, payload in chunk]})
+        return self._batch_outcomes(operation, chunk, self._handle_api_response(response, f"Batch {operation}"))
+
+    def _batch_outcomes(
+        self, 
+        operation: str, 
+        chunk: List[Tuple[str, Dict[str, Any]]], 
+        result: Optional[Dict[str, Any]]
+    ) -> Dict[str, bool]:
+        """Map the items of a products/batch response to their SKUs."""
+        if not result:
+            return {sku: False for sku, _ in chunk}
+        
+        outcomes = {}
+        
+        # Batch responses list the items in request order, failed items carry an error
+        for (sku, _), item in zip(chunk, result.get(operation, [])):
+            error = item.get('error')
+            outcomes[sku] = error is None
+            
+            if error:
+                self.logger.error(f"Batch {operation} failed - SKU: {sku}, Error: {error.get('message')}")
+        
+        for sku, _ in chunk[len(result.get(operation, [])):]:
+            outcomes[sku] = False
+            self.logger.error(f"Batch {operation} returned no result - SKU: {sku}")
+        
+        return outcomes
+
+    def _run_batches(self, operation: str, items: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, bool]:
+        """Split (sku, payload) pairs into batches and send them concurrently."""
+        chunks = [items[start:start + self.BATCH_SIZE] for start in range(0, len(items), self.BATCH_SIZE)]
+        results: Dict[str, bool] = {}
+        
+        if not chunks:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=min(self.MAX_BATCH_WORKERS, len(chunks))) as executor:
+            for outcomes in executor.map(lambda chunk: self._send_batch(operation, chunk), chunks):
+                results.update(outcomes)
+        
+        succeeded = sum(results.values())
+        self.logger.info(f"Batch {operation} finished - {succeeded} succeeded, {len(results) - succeeded} failed")
+        return results
+
+    def _build_update_items(self, products: List[ProductData]) -> tuple:
+        """Build the products/batch update items, plus a failed result for every product that could not be built."""
+        items = []
+        results: Dict[str, bool] = {}
+        
+        for product in products:
+            try:
+                items.append((product['sku'], {"id": product['id'], **self._build_update_data(product)}))
+            except Exception as e:
+                self.logger.error(f"Exception while preparing update of {product.get('sku')}: {str(e)}")
+                results[product.get('sku')] = False
+        
+        return items, results
+
+    def update_products(self, products: List[ProductData]) -> Dict[str, bool]:
+        """Update stock and price of many products through products/batch, keyed by SKU."""
+        items, results = self._build_update_items(products)
+        results.update(self._run_batches("update", items))
+        return results
+
+    def create_products(self, products: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Create many products through products/batch, keyed by stock code."""
+        items = []
+        results: Dict[str, bool] = {}
+        
+        for product_data in products:
+            try:
+                items.append((product_data['stockCode'], self._build_product_payload(product_data)))
+            except Exception as e:
+                self.logger.error(f"Exception while preparing product: {str(e)}")
+                results[product_data.get('stockCode')] = False
+        
+        results.update(self._run_batches("create", items))
+        return results
+
     def create_product(self, product_data: Dict[str, Any]) -> bool:
         """Create a new product with comprehensive data."""
         try:
-            category = self._determine_category(product_data['title'])
-            attrs = self._format_attributes(product_data.get('attributes', []))
-            images = self._format_images(product_data)
-            
-            new_product_data: WooCommerceProduct = {
-                "name": product_data['title'],
-                "type": "simple",
-                "sku": product_data['stockCode'],
-                "manage_stock": product_data['quantity'] > 0,
-                "stock_quantity": product_data['quantity'],
-                "stock_status": 'instock' if product_data['quantity'] > 0 else 'outofstock',
-                "tax_status": "taxable",
-                "sale_price": str(product_data['salePrice']),
-                "regular_price": str(product_data['listPrice']),
-                "description": re.sub(r"[?]", '', product_data['description']) + attrs,
-                "short_description": product_data['title'],
-                "categories": category,
-                "images": images
-            }
+            new_product_data = self._build_product_payload(product_data)
 
             response = self.wcapi.post("products", new_product_data)
             
@@ -10,9 +10,35 @@ WORDPRESS_API_URL = "https://www.emanzemin.com"
 # Pagination
 DEFAULT_PAGE_SIZE = 100
 MAX_PAGE_SIZE = 1000
+PAGINATION_MAX_WORKERS = 4  # pages fetched concurrently once the page count is known
+PAGINATION_PAGE_RETRIES = 2  # extra attempts for a failed page
+PAGINATION_RETRY_DELAY = 1  # seconds, doubled on every retry
 
 # Rate limiting
-API_RATE_LIMIT = 60  # requests per minute
+API_RATE_LIMIT = None  # requests per minute for platforms without an entry, None leaves them unthrottled
+API_RATE_BURST = None  # requests allowed back to back before the limit kicks in
+# (requests per minute, burst) keyed by platform or 'platform:endpoint'. Every endpoint
+# gets its own bucket, the most specific entry sets its limit. (None, None) runs the
+# platform unthrottled, its buckets only pause after a 429 or quota fault.
+API_RATE_LIMITS = {
+    'trendyol': (300, 50),  # 50 requests per 10 seconds per endpoint
+    'amazon': (60, 5),
+    'amazon:listings/2021-08-01': (300, 10),
+    'amazon:catalog/2022-04-01': (120, 2),
+    # No published limits, paced by their 429s and quota faults only
+    'n11': (None, None),
+    'hepsiburada': (None, None),
+    'pazarama': (None, None),
+    'pttavm': (None, None),
+    'wordpress': (None, None),
+}
+RATE_LIMIT_BACKOFF = 0.5  # rate multiplier applied on every 429
+RATE_LIMIT_MIN_FACTOR = 0.1  # a bucket never drops below this share of its configured rate
+RATE_LIMIT_RECOVERY = 0.05  # share of the configured rate restored on every success
+RATE_LIMIT_RETRY_AFTER = 5  # seconds to pause a bucket on a 429 without Retry-After
+
+# Access tokens
+TOKEN_REFRESH_MARGIN = 60  # seconds before expiry a cached token is refreshed
 
 # Platforms
 PLATFORMS = ['n11', 'hepsiburada', 'amazon', 'pttavm', 'pazarama', 'trendyol', 'wordpress']
@@ -20,4 +46,55 @@ PLATFORMS = ['n11', 'hepsiburada', 'amazon', 'pttavm', 'pazarama', 'trendyol', '
 # Update types
 UPDATE_TYPE_QUANTITY = 'quantity'
 UPDATE_TYPE_PRICE = 'price'
-UPDATE_TYPE_INFO = 'info'
\ No newline at end of file
+UPDATE_TYPE_INFO = 'info'
+
+# Fetch engine
+FETCH_TIMEOUT = 600  # seconds a platform fetch may take before it is abandoned
+PLATFORM_FETCH_TIMEOUTS = {
+    'amazon': 1800,  # report generation alone can take several minutes
+}
+
+# Snapshot store
+SNAPSHOT_DB_PATH = 'app/data/snapshots.db'
+SNAPSHOT_TTL = 3600  # seconds a stored catalog is considered fresh
+PLATFORM_SNAPSHOT_TTLS = {
+    'amazon': 6 * 3600,
+}
+
+# HTTP transport
+HTTP_CONNECT_TIMEOUT = 10  # seconds
+HTTP_READ_TIMEOUT = 120  # seconds between bytes, not for the whole response
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 20  # keep-alive connections per host
+HTTP_HOST_POOL_SIZES = {}  # per-host overrides of HTTP_POOL_MAXSIZE, e.g. {'api.trendyol.com': 32}
+HTTP_CONNECT_RETRIES = 3
+
+# Async clients
+ASYNC_MAX_IN_FLIGHT = 100  # requests one platform keeps open at once on the event loop
+ASYNC_BLOCKING_CALLS = 16  # worker threads used for SDK calls that have no async variant
+
+# Update dispatcher
+UPDATE_MAX_WORKERS = 8  # per platform cap on concurrent single item updates
+PLATFORM_UPDATE_WORKERS = {}  # per platform overrides, e.g. {'pttavm': 2}
+# Bucket each platform's single item update is sent under, sizes its worker pool
+PLATFORM_UPDATE_ENDPOINTS = {
+    'amazon': 'listings/2021-08-01',
+    'pttavm': 'StokFiyatGuncelle3',
+}
+UPDATE_ITEM_RETRIES = 2  # extra attempts for an item whose update failed
+UPDATE_RETRY_DELAY = 2  # seconds, doubled on every retry
+
+# Incremental sync
+INCREMENTAL_SYNC = False  # opt in: fetch only items changed since the last sync where the platform supports it
+INCREMENTAL_SYNC_OVERLAP = 300  # seconds re-fetched before the mark to absorb clock skew
+INCREMENTAL_FULL_RESYNC = 24 * 3600  # seconds after which a complete download is forced to drop deleted items
+
+# Product records
+PRODUCT_RECORDS = False  # opt in: hold fetched catalogs as slotted ProductRecord objects instead of dicts
+
+# Amazon report cache
+AMAZON_REPORT_CACHE_DIR = 'app/data/amazon_reports'
+# Seconds a finished report is reused instead of requesting a new one, 0 disables. Quantities
+# read from a reused report can be this old; the sync marks follow the report's creation time
+# so the next incremental fetch still picks up everything changed since then.
+AMAZON_REPORT_MAX_AGE = 30 * 60
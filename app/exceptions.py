@@ -0,0 +1,3 @@
+class APIError(Exception):
+    """Raised when a platform API request fails."""
+    pass
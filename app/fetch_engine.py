@@ -0,0 +1,148 @@
+""" Concurrent fetch engine that pulls catalogs from several platforms at once so a
+ full sync takes as long as the slowest platform instead of the sum of all of them."""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from app.config import logger
+from app.config.constants import FETCH_TIMEOUT, PLATFORM_FETCH_TIMEOUTS
+
+
+@dataclass
+class PlatformFetchResult:
+    """Outcome of a single platform fetch."""
+    platform: str
+    data: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class FetchEngine:
+    """
+    Runs platform fetch functions concurrently with per-platform timeouts.
+
+    A failing or slow platform never blocks the others: every platform gets its own
+    result object carrying either the fetched data or the error that stopped it.
+    """
+
+    def __init__(
+        self,
+        fetchers: Dict[str, Callable[[], Any]],
+        timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: float = FETCH_TIMEOUT,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Initialize the fetch engine.
+
+        Args:
+            fetchers: Mapping of platform names to zero-argument fetch functions
+            timeouts: Optional per-platform timeouts in seconds
+            default_timeout: Timeout used for platforms without an explicit one
+            max_workers: Thread count, defaults to one thread per platform
+        """
+        self.fetchers = fetchers
+        self.timeouts = {**PLATFORM_FETCH_TIMEOUTS, **(timeouts or {})}
+        self.default_timeout = default_timeout
+        self.max_workers = max_workers
+
+    def _timed_call(self, func: Callable[[], Any]) -> tuple:
+        start_time = time.perf_counter()
+        data = func()
+        return data, time.perf_counter() - start_time
+
+    def run(self, platforms: Optional[Iterable[str]] = None) -> Dict[str, PlatformFetchResult]:
+        """
+        Fetch the selected platforms concurrently.
+
+        Args:
+            platforms: Platform names to fetch, all known platforms if None
+
+        Returns:
+            Dict mapping each requested platform to its PlatformFetchResult
+        """
+        selected = list(platforms) if platforms is not None else list(self.fetchers)
+        results: Dict[str, PlatformFetchResult] = {}
+
+        for platform in selected:
+            if platform not in self.fetchers:
+                logger.warning(f"Platform '{platform}' not found.")
+                results[platform] = PlatformFetchResult(platform, error="unknown platform")
+
+        runnable = [platform for platform in selected if platform in self.fetchers]
+        if not runnable:
+            return results
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers or len(runnable),
+            thread_name_prefix="fetch",
+        )
+        started_at = time.monotonic()
+        futures: Dict[Future, str] = {
+            executor.submit(self._timed_call, self.fetchers[platform]): platform
+            for platform in runnable
+        }
+        deadlines = {
+            platform: started_at + self.timeouts.get(platform, self.default_timeout)
+            for platform in runnable
+        }
+        pending = set(futures)
+
+        try:
+            while pending:
+                now = time.monotonic()
+
+                # Abandon every platform whose deadline has passed
+                for future in [f for f in pending if deadlines[futures[f]] <= now]:
+                    platform = futures[future]
+                    future.cancel()
+                    pending.discard(future)
+                    results[platform] = PlatformFetchResult(
+                        platform,
+                        error=f"timed out after {self.timeouts.get(platform, self.default_timeout)}s",
+                        elapsed=now - started_at,
+                        timed_out=True,
+                    )
+                    logger.error(f"Fetching data for platform '{platform}' timed out")
+
+                if not pending:
+                    break
+
+                next_deadline = min(deadlines[futures[f]] for f in pending)
+                done, pending = wait(pending, timeout=max(next_deadline - now, 0), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    platform = futures[future]
+                    try:
+                        data, elapsed = future.result()
+                        results[platform] = PlatformFetchResult(platform, data=data, elapsed=elapsed)
+                    except Exception as e:
+                        logger.error(f"Error loading data for platform '{platform}': {e}")
+                        results[platform] = PlatformFetchResult(
+                            platform, error=str(e), elapsed=time.monotonic() - started_at
+                        )
+        finally:
+            # Do not wait for abandoned fetches, their threads finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.log_summary(results, time.monotonic() - started_at)
+        return results
+
+    @staticmethod
+    def log_summary(results: Dict[str, PlatformFetchResult], total_elapsed: float) -> None:
+        """Log the per-platform wall-clock summary of a fetch run."""
+        for platform, result in sorted(results.items(), key=lambda item: item[1].elapsed, reverse=True):
+            if result.ok:
+                count = len(result.data) if hasattr(result.data, "__len__") else "n/a"
+                logger.info(f"{platform}: fetched {count} items in {result.elapsed:.2f} seconds")
+            else:
+                logger.warning(f"{platform}: failed after {result.elapsed:.2f} seconds || Reason: {result.error}")
+
+        logger.info(f"Fetched {len(results)} platforms in {total_elapsed:.2f} seconds")
@@ -0,0 +1,173 @@
+""" Canonical product record shared by every platform. A slotted object takes a fraction of
+ the memory of the ad-hoc dicts the platform clients return, and its mapping style
+ accessors let the matching code in main.py work on records and dicts alike."""
+
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+RawPayload = Union[Mapping[str, Any], Callable[[], Mapping[str, Any]]]
+
+_FIELDS = frozenset(("sku", "id", "quantity", "price", "platform", "title", "product_main_id"))
+
+
+class ProductRecord:
+    """
+    One product of one platform.
+
+    The raw platform payload is optional and lazy: it can be given as the payload itself
+    or as a zero-argument loader, which is only called the first time `data` is read.
+    Compact listings carry no payload at all, and "data" is then reported missing just
+    like on the compact dicts.
+    """
+
+    __slots__ = ("sku", "id", "quantity", "price", "platform", "title", "product_main_id", "_raw")
+
+    FIELDS = ("sku", "id", "quantity", "price", "platform", "title", "product_main_id")
+
+    def __init__(
+        self,
+        sku: Optional[str],
+        id: Any = None,
+        quantity: int = 0,
+        price: float = 0.0,
+        platform: Optional[str] = None,
+        title: Optional[str] = None,
+        product_main_id: Optional[str] = None,
+        raw: Optional[RawPayload] = None,
+    ):
+        self.sku = sku
+        self.id = id
+        self.quantity = quantity
+        self.price = price
+        self.platform = platform
+        self.title = title
+        self.product_main_id = product_main_id
+        self._raw = raw
+
+    @property
+    def data(self) -> Optional[Mapping[str, Any]]:
+        """The raw platform payload, loaded on first access if a loader was given."""
+        if callable(self._raw):
+            self._raw = self._raw()
+        return self._raw
+
+    @property
+    def has_data(self) -> bool:
+        return self._raw is not None
+
+    @classmethod
+    def from_item(cls, item: Mapping[str, Any], platform: Optional[str] = None) -> "ProductRecord":
+        """
+        Build a record from any of the dict shapes the platform clients return.
+
+        Full data items (`{"sku", "data"}`) take their stock and price from the payload,
+        so records of both shapes can be compared directly.
+        """
+        raw = item.get("data")
+        payload = raw if isinstance(raw, Mapping) else {}
+
+        return cls(
+            sku=item.get("sku"),
+            id=item.get("id", payload.get("id")),
+            quantity=item.get("quantity", payload.get("quantity", payload.get("stock_quantity", 0))),
+            price=item.get("price", payload.get("salePrice", payload.get("price", 0.0))),
+            platform=item.get("platform", platform),
+            title=item.get("title", payload.get("title")),
+            product_main_id=item.get("product_main_id", payload.get("productMainId")),
+            raw=raw,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with the set fields, plus "data" when a payload is attached."""
+        item = {field: getattr(self, field) for field in self.FIELDS if getattr(self, field) is not None}
+        if self.has_data:
+            item["data"] = self.data
+        return item
+
+    # Mapping style access, so code written against the product dicts keeps working
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELDS:
+            return getattr(self, key)
+        if key == "data" and self._raw is not None:
+            return self.data
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELDS:
+            setattr(self, key, value)
+        elif key == "data":
+            self._raw = value
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        if key in _FIELDS:
+            return getattr(self, key) is not None
+        return key == "data" and self._raw is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELDS:
+            value = getattr(self, key)
+        elif key == "data":
+            value = self.data
+        else:
+            return default
+        return default if value is None else value
+
+    def keys(self) -> List[str]:
+        return [key for key in (*self.FIELDS, "data") if key in self]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ProductRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (
+            f"ProductRecord(sku={self.sku!r}, id={self.id!r}, quantity={self.quantity!r}, "
+            f"price={self.price!r}, platform={self.platform!r})"
+        )
+
+
+def to_records(items: Optional[Iterable[Mapping[str, Any]]], platform: Optional[str] = None) -> Optional[List[ProductRecord]]:
+    """
+    Convert a platform's product list into records.
+
+    Args:
+        items: Product dicts as returned by a platform client, None is passed through
+        platform: Platform name stored on records whose item carries none
+
+    Returns:
+        List of ProductRecord, or None if `items` is None
+    """
+    if items is None:
+        return None
+
+    return [item if isinstance(item, ProductRecord) else ProductRecord.from_item(item, platform) for item in items]
+
+
+def to_dicts(items: Iterable[Union[ProductRecord, Mapping[str, Any]]]) -> List[Dict[str, Any]]:
+    """Convert records back into plain dicts, for JSON snapshots and exports."""
+    return [item.to_dict() if isinstance(item, ProductRecord) else dict(item) for item in items]
+
+
+def emits_records(platform: str) -> Callable:
+    """
+    Decorator adding an `as_records` keyword to a platform's product fetch function.
+
+    With `as_records=True` the fetched list is returned as ProductRecord objects tagged
+    with `platform`, otherwise the function returns its usual dicts.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, as_records: bool = False, **kwargs):
+            products = func(*args, **kwargs)
+            return to_records(products, platform) if as_records else products
+        return wrapper
+    return decorator
@@ -0,0 +1,133 @@
+""" SKU keyed index used to join platform catalogs in a single linear pass instead of
+ scanning every target list for every source item."""
+
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+
+def normalize_sku(sku: Any) -> Optional[str]:
+    """
+    Normalize a SKU for matching across platforms.
+
+    Surrounding whitespace is stripped and the value is case folded, so `" kp4 "` and
+    `"KP4"` are considered the same product. Empty values return None.
+    """
+    if sku is None:
+        return None
+
+    normalized = str(sku).strip().casefold()
+
+    return normalized or None
+
+
+class SkuIndex:
+    """
+    Hash index over a platform's items keyed by normalized SKU.
+
+    The first item seen for a SKU wins, matching the behaviour of the old linear scan
+    which stopped at the first match. Later duplicates are kept in `duplicates` so
+    they can be reported instead of silently dropped.
+    """
+
+    def __init__(self, items: Optional[Iterable[Mapping[str, Any]]] = None, platform: str = ""):
+        self.platform = platform
+        self._items: Dict[str, Mapping[str, Any]] = {}
+        self.duplicates: Dict[str, List[Mapping[str, Any]]] = {}
+        self.missing_sku: List[Mapping[str, Any]] = []
+
+        for item in items or []:
+            self.add(item)
+
+    def add(self, item: Mapping[str, Any]) -> None:
+        """Add an item to the index."""
+        key = normalize_sku(item.get("sku"))
+
+        if key is None:
+            self.missing_sku.append(item)
+            return
+
+        if key in self._items:
+            self.duplicates.setdefault(key, []).append(item)
+            return
+
+        self._items[key] = item
+
+    def get(self, sku: Any, default: Any = None) -> Any:
+        """Return the item indexed under `sku`, or `default` when the SKU is unknown."""
+        key = normalize_sku(sku)
+
+        if key is None:
+            return default
+
+        return self._items.get(key, default)
+
+    def keys(self) -> Iterable[str]:
+        return self._items.keys()
+
+    def __contains__(self, sku: Any) -> bool:
+        key = normalize_sku(sku)
+        return key is not None and key in self._items
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        return iter(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def build_indexes(data: Mapping[str, Iterable[Mapping[str, Any]]],
+                  platforms: Optional[Iterable[str]] = None) -> Dict[str, SkuIndex]:
+    """
+    Build one SkuIndex per platform.
+
+    Args:
+        data: Platform name to item list mapping, as returned by `App.retrieve_stock_data`
+        platforms: Platforms to index, every key of `data` if None
+
+    Returns:
+        Dict mapping each platform with data to its SkuIndex
+    """
+    indexes = {}
+
+    for platform in platforms if platforms is not None else data.keys():
+        items = data.get(platform)
+
+        if not items:
+            continue
+
+        indexes[platform] = SkuIndex(items, platform)
+
+    return indexes
+
+
+def join_by_sku(source_items: Iterable[Mapping[str, Any]],
+                indexes: Mapping[str, SkuIndex]) -> Iterator[Tuple[Mapping[str, Any], Dict[str, Mapping[str, Any]]]]:
+    """
+    Join source items against every target index in one pass.
+
+    Args:
+        source_items: Items of the source platform
+        indexes: Target platform indexes built with `build_indexes`
+
+    Yields:
+        Tuples of the source item and a platform to matching item mapping. Source items
+        without a match on any platform yield an empty mapping so callers can report them.
+    """
+    seen = set()
+
+    for source_item in source_items:
+        key = normalize_sku(source_item.get("sku"))
+
+        # Duplicate or blank source SKUs are joined once, like the old first-match scan
+        if key is None or key in seen:
+            continue
+        seen.add(key)
+
+        matches = {}
+
+        for platform, index in indexes.items():
+            target_item = index.get(key)
+
+            if target_item is not None:
+                matches[platform] = target_item
+
+        yield source_item, matches
@@ -0,0 +1,282 @@
+""" On-disk snapshot store for platform catalogs, so a run can start from the last
+ fetched data instead of downloading every catalog again."""
+
+import json
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.config import logger
+from app.product_record import ProductRecord
+from app.config.constants import (
+    INCREMENTAL_FULL_RESYNC,
+    INCREMENTAL_SYNC_OVERLAP,
+    PLATFORM_SNAPSHOT_TTLS,
+    SNAPSHOT_DB_PATH,
+    SNAPSHOT_TTL,
+)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, ProductRecord):
+        return value.to_dict()
+    return str(value)
+
+
+def merge_by_sku(items: List[Dict[str, Any]], changed: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge changed items into a catalog.
+
+    Items sharing a SKU are replaced in place, new SKUs are appended in the order they
+    were fetched. Items without a SKU, None or empty like WooCommerce parent products,
+    are matched by their id instead, and appended as is if they have neither.
+    """
+    merged = list(items)
+    positions = {}
+
+    for index, item in enumerate(merged):
+        key = _merge_key(item)
+        if key is not None:
+            positions[key] = index
+
+    for item in changed:
+        key = _merge_key(item)
+
+        if key is not None and key in positions:
+            merged[positions[key]] = item
+        else:
+            if key is not None:
+                positions[key] = len(merged)
+            merged.append(item)
+
+    return merged
+
+
+def _merge_key(item: Dict[str, Any]) -> Optional[tuple]:
+    """Key an item is matched on, its SKU if it has one and its id, or its full data's id, otherwise."""
+    if item.get("sku"):
+        return ("sku", item["sku"])
+    if item.get("id") is not None:
+        return ("id", item["id"])
+
+    data = item.get("data")
+    if isinstance(data, dict) and data.get("id") is not None:
+        return ("id", data["id"])
+    return None
+
+
+class SnapshotStore:
+    """
+    SQLite backed store holding the latest catalog of every platform.
+
+    Each platform keeps two snapshots, one for the compact listing data and one for the
+    full product data (`full=True`), since the fetch functions return different shapes
+    for each. Payloads are stored as zlib compressed JSON.
+
+    Every snapshot also carries a high-water mark, the time its data was known to be
+    current, from which incremental syncs ask the platform for changed items only.
+    """
+
+    def __init__(
+        self,
+        path: str = SNAPSHOT_DB_PATH,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = SNAPSHOT_TTL,
+    ):
+        """
+        Initialize the store and create the database if needed.
+
+        Args:
+            path: Location of the SQLite database file
+            ttls: Optional per-platform freshness windows in seconds
+            default_ttl: Freshness window for platforms without an explicit one
+        """
+        self.path = path
+        self.ttls = {**PLATFORM_SNAPSHOT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS snapshots (
+                       platform TEXT NOT NULL,
+                       full INTEGER NOT NULL,
+                       fetched_at REAL NOT NULL,
+                       item_count INTEGER NOT NULL,
+                       payload BLOB NOT NULL,
+                       PRIMARY KEY (platform, full)
+                   )"""
+            )
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS sync_marks (
+                       platform TEXT NOT NULL,
+                       full INTEGER NOT NULL,
+                       synced_at REAL NOT NULL,
+                       full_synced_at REAL NOT NULL,
+                       PRIMARY KEY (platform, full)
+                   )"""
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def ttl(self, platform: str) -> float:
+        """Return the freshness window of a platform in seconds."""
+        return self.ttls.get(platform, self.default_ttl)
+
+    def save(self, platform: str, data: Any, full: bool = False, synced_at: Optional[float] = None,
+             incremental: bool = False) -> None:
+        """
+        Store the catalog of a platform, replacing the previous snapshot.
+
+        Args:
+            platform: Platform name
+            data: JSON serializable catalog, usually a list of product dicts
+            full: Whether `data` holds full product data
+            synced_at: Epoch time the data was known to be current, the start of the
+                fetch that produced it, now if None
+            incremental: Whether `data` was built by merging changed items, which
+                keeps the time of the last complete download
+        """
+        payload = zlib.compress(json.dumps(data, ensure_ascii=False, default=_json_default).encode("utf-8"))
+        item_count = len(data) if hasattr(data, "__len__") else 0
+        synced_at = time.time() if synced_at is None else synced_at
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)",
+                (platform, int(full), time.time(), item_count, payload),
+            )
+
+            if incremental:
+                connection.execute(
+                    "UPDATE sync_marks SET synced_at = ? WHERE platform = ? AND full = ?",
+                    (synced_at, platform, int(full)),
+                )
+            else:
+                connection.execute(
+                    "INSERT OR REPLACE INTO sync_marks VALUES (?, ?, ?, ?)",
+                    (platform, int(full), synced_at, synced_at),
+                )
+
+        logger.debug(f"Saved {item_count} {platform} items to the snapshot store")
+
+    def age(self, platform: str, full: bool = False) -> Optional[float]:
+        """Return the age of a platform snapshot in seconds, or None if there is none."""
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT fetched_at FROM snapshots WHERE platform = ? AND full = ?",
+                (platform, int(full)),
+            ).fetchone()
+
+        return time.time() - row[0] if row else None
+
+    def load(self, platform: str, full: bool = False, max_age: Optional[float] = None) -> Optional[Any]:
+        """
+        Load a platform snapshot if it is fresh enough.
+
+        Args:
+            platform: Platform name
+            full: Whether to load the full product data snapshot
+            max_age: Freshness window in seconds, defaults to the platform TTL
+
+        Returns:
+            The stored catalog, or None if it is missing or older than `max_age`
+        """
+        max_age = self.ttl(platform) if max_age is None else max_age
+
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT fetched_at, payload FROM snapshots WHERE platform = ? AND full = ?",
+                (platform, int(full)),
+            ).fetchone()
+
+        if not row:
+            return None
+
+        fetched_at, payload = row
+        age = time.time() - fetched_at
+
+        if age > max_age:
+            logger.debug(f"{platform} snapshot is {age:.0f} seconds old, ignoring it")
+            return None
+
+        data = json.loads(zlib.decompress(payload).decode("utf-8"))
+        logger.info(f"Loaded {len(data)} {platform} items from a {age:.0f} seconds old snapshot")
+
+        return data
+
+    def changed_since(self, platform: str, full: bool = False,
+                      full_resync: float = INCREMENTAL_FULL_RESYNC,
+                      overlap: float = INCREMENTAL_SYNC_OVERLAP) -> Optional[datetime]:
+        """
+        Return the time from which an incremental sync of a platform should fetch.
+
+        Args:
+            platform: Platform name
+            full: Whether the full product data snapshot is meant
+            full_resync: Seconds after the last complete download a full one is forced,
+                since changed item filters never report deleted products
+            overlap: Seconds subtracted from the mark to absorb clock skew
+
+        Returns:
+            Timezone aware UTC datetime, or None when a full download is needed
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT synced_at, full_synced_at FROM sync_marks WHERE platform = ? AND full = ?",
+                (platform, int(full)),
+            ).fetchone()
+
+        if not row:
+            return None
+
+        synced_at, full_synced_at = row
+
+        if time.time() - full_synced_at > full_resync:
+            logger.info(f"{platform} was last downloaded completely {time.time() - full_synced_at:.0f} seconds ago")
+            return None
+
+        return datetime.fromtimestamp(synced_at - overlap, tz=timezone.utc)
+
+    def merge(self, platform: str, changed: List[Dict[str, Any]], full: bool = False,
+              synced_at: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Merge changed items into the stored catalog of a platform and advance its mark.
+
+        Args:
+            platform: Platform name
+            changed: Items changed since the mark, as returned by the fetch function
+            full: Whether the full product data snapshot is meant
+            synced_at: Epoch time the changed items were fetched from
+
+        Returns:
+            The merged catalog, or None if there is no snapshot to merge into
+        """
+        items = self.load(platform, full, max_age=float("inf"))
+
+        if items is None:
+            return None
+
+        merged = merge_by_sku(items, changed)
+        self.save(platform, merged, full, synced_at, incremental=True)
+        logger.info(f"Merged {len(changed)} changed {platform} items into {len(items)} stored ones")
+
+        return merged
+
+    def clear(self, platform: Optional[str] = None) -> None:
+        """Remove the snapshots of a platform, or every snapshot if no platform is given."""
+        with closing(self._connect()) as connection, connection:
+            if platform:
+                connection.execute("DELETE FROM snapshots WHERE platform = ?", (platform,))
+                connection.execute("DELETE FROM sync_marks WHERE platform = ?", (platform,))
+            else:
+                connection.execute("DELETE FROM snapshots")
+                connection.execute("DELETE FROM sync_marks")
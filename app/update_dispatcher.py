@@ -0,0 +1,246 @@
+""" Update dispatcher that fans a change set out to every target platform at once, each
+ platform working through its items with a worker pool sized to its rate limit, so an
+ update run takes as long as the slowest platform instead of the sum of all of them."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from api.rate_limiter import rate_limiter
+from app.config import logger
+from app.config.constants import (
+    PLATFORM_UPDATE_ENDPOINTS,
+    PLATFORM_UPDATE_WORKERS,
+    UPDATE_ITEM_RETRIES,
+    UPDATE_MAX_WORKERS,
+    UPDATE_RETRY_DELAY,
+)
+
+
+@dataclass
+class PlatformUpdateResult:
+    """Outcome of the updates sent to a single platform."""
+    platform: str
+    succeeded: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    retries: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def total(self) -> int:
+        return len(self.succeeded) + len(self.failed)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second."""
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+
+def _item_key(post: Dict[str, Any]) -> str:
+    return str(post.get("sku") or post.get("id"))
+
+
+def _outcome_succeeded(outcome: Any) -> bool:
+    # Bulk functions report a bool per item, Pazarama a {"success", "message"} dict
+    if isinstance(outcome, dict):
+        return bool(outcome.get("success"))
+    return outcome is not False
+
+
+def _outcome_reason(outcome: Any) -> str:
+    if isinstance(outcome, dict) and outcome.get("message"):
+        return str(outcome["message"])
+    return "rejected by the platform"
+
+
+class UpdateDispatcher:
+    """
+    Sends a change set to several platforms concurrently.
+
+    Platforms with a bulk update function get their whole change set in one call, the
+    items that come back failed are resent on their own. The others get one call per
+    item from a worker pool sized to the burst of the platform's rate limit bucket, so
+    the pool never holds more requests than the limiter would let through at once.
+    Unthrottled platforms get UPDATE_MAX_WORKERS workers.
+    """
+
+    def __init__(
+        self,
+        update_functions: Dict[str, Callable[[Dict[str, Any]], Any]],
+        bulk_update_functions: Optional[Dict[str, Callable[[List[Dict[str, Any]]], Dict[str, Any]]]] = None,
+        workers: Optional[Dict[str, int]] = None,
+        retries: int = UPDATE_ITEM_RETRIES,
+        retry_delay: float = UPDATE_RETRY_DELAY,
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            update_functions: Mapping of platform names to single item update functions
+            bulk_update_functions: Optional mapping of platform names to functions taking
+                a list of items and returning an outcome per item key
+            workers: Optional per-platform worker counts for single item updates
+            retries: Extra attempts for an item whose update failed
+            retry_delay: Delay before the first retry, doubled on every retry
+        """
+        self.update_functions = update_functions
+        self.bulk_update_functions = bulk_update_functions or {}
+        self.workers = {**PLATFORM_UPDATE_WORKERS, **(workers or {})}
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+    def workers_for(self, platform: str) -> int:
+        """Worker count for the single item updates of a platform."""
+        if platform in self.workers:
+            return self.workers[platform]
+
+        _, burst = rate_limiter.limit(platform, PLATFORM_UPDATE_ENDPOINTS.get(platform))
+        if burst is None:
+            return UPDATE_MAX_WORKERS
+
+        return max(1, min(int(burst), UPDATE_MAX_WORKERS))
+
+    def _update_item(self, func: Callable[[Dict[str, Any]], Any], post: Dict[str, Any],
+                     platform: str) -> tuple:
+        """Update one item, retrying failures. Returns the key, failure reason or None and retry count."""
+        key = _item_key(post)
+
+        for attempt in range(self.retries + 1):
+            try:
+                outcome = func(post)
+                reason = None if _outcome_succeeded(outcome) else _outcome_reason(outcome)
+            except Exception as e:
+                reason = str(e)
+
+            if reason is None:
+                return key, None, attempt
+
+            if attempt < self.retries:
+                logger.warning(f"{platform}: update of {key} failed, retrying || Reason: {reason}")
+                time.sleep(self.retry_delay * 2 ** attempt)
+
+        return key, reason, self.retries
+
+    def _update_bulk(self, func: Callable[[List[Dict[str, Any]]], Dict[str, Any]],
+                     posts: List[Dict[str, Any]], result: PlatformUpdateResult) -> None:
+        pending = posts
+
+        for attempt in range(self.retries + 1):
+            try:
+                outcomes = func(pending) or {}
+                failures = {}
+
+                for post in pending:
+                    key = _item_key(post)
+                    # Outcomes are keyed by SKU on most platforms, by barcode or code on others
+                    outcome = outcomes.get(post.get("sku"), outcomes.get(post.get("id")))
+
+                    if outcome is None:
+                        failures[key] = (post, "no result returned")
+                    elif _outcome_succeeded(outcome):
+                        result.succeeded.append(key)
+                    else:
+                        failures[key] = (post, _outcome_reason(outcome))
+            except Exception as e:
+                failures = {_item_key(post): (post, str(e)) for post in pending}
+
+            if not failures:
+                return
+
+            if attempt == self.retries:
+                result.failed.update({key: reason for key, (_, reason) in failures.items()})
+                return
+
+            result.retries += len(failures)
+            logger.warning(f"{result.platform}: resending {len(failures)} failed updates")
+            time.sleep(self.retry_delay * 2 ** attempt)
+            pending = [post for post, _ in failures.values()]
+
+    def _run_platform(self, platform: str, posts: List[Dict[str, Any]]) -> PlatformUpdateResult:
+        result = PlatformUpdateResult(platform)
+        started_at = time.monotonic()
+
+        try:
+            bulk_func = self.bulk_update_functions.get(platform)
+
+            if bulk_func:
+                self._update_bulk(bulk_func, posts, result)
+            else:
+                func = self.update_functions[platform]
+                with ThreadPoolExecutor(
+                    max_workers=min(self.workers_for(platform), len(posts)),
+                    thread_name_prefix=f"update-{platform}",
+                ) as executor:
+                    for key, reason, retries in executor.map(
+                        lambda post: self._update_item(func, post, platform), posts
+                    ):
+                        result.retries += retries
+                        if reason is None:
+                            result.succeeded.append(key)
+                        else:
+                            result.failed[key] = reason
+        except Exception as e:
+            logger.error(f"Failed to update products on {platform}. Error: {e}")
+            result.error = str(e)
+
+        result.elapsed = time.monotonic() - started_at
+        return result
+
+    def run(self, post_data: Iterable[Dict[str, Any]],
+            platforms: Optional[Iterable[str]] = None) -> Dict[str, PlatformUpdateResult]:
+        """
+        Send every post to its platform, all platforms at once.
+
+        Args:
+            post_data: Update items, each carrying the `platform` it is meant for
+            platforms: Platforms to update, every platform with an update function if None
+
+        Returns:
+            Dict mapping each platform that had items to its PlatformUpdateResult
+        """
+        selected = set(platforms) if platforms is not None else set(self.update_functions)
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+
+        for post in post_data:
+            platform = post.get("platform")
+            if platform in selected:
+                grouped.setdefault(platform, []).append(post)
+
+        for platform in [platform for platform in grouped if platform not in self.update_functions]:
+            logger.warning(f"Platform '{platform}' has no update function.")
+            del grouped[platform]
+
+        if not grouped:
+            return {}
+
+        started_at = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=len(grouped), thread_name_prefix="update") as executor:
+            futures = {
+                platform: executor.submit(self._run_platform, platform, posts)
+                for platform, posts in grouped.items()
+            }
+            results = {platform: future.result() for platform, future in futures.items()}
+
+        self.log_summary(results, time.monotonic() - started_at)
+        return results
+
+    @staticmethod
+    def log_summary(results: Dict[str, PlatformUpdateResult], total_elapsed: float) -> None:
+        """Log the per-platform outcome of an update run."""
+        for platform, result in sorted(results.items(), key=lambda item: item[1].elapsed, reverse=True):
+            logger.info(
+                f"{platform}: {len(result.succeeded)} updated, {len(result.failed)} failed, "
+                f"{result.retries} retries in {result.elapsed:.2f} seconds ({result.throughput:.1f} items/s)"
+            )
+
+            for key, reason in result.failed.items():
+                logger.error(f"{platform}: product {key} was not updated || Reason: {reason}")
+
+        logger.info(f"Updated {len(results)} platforms in {total_elapsed:.2f} seconds")
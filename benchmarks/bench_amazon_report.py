@@ -0,0 +1,86 @@
+""" Benchmark of Amazon merchant listings report parsing.
+
+ Compares the in-memory path (decompress, decode, `process_report_document`, then a
+ product list) with the streaming reader (`read_report_rows` over a spooled gzip file)
+ on a synthetic report, measuring time and peak memory.
+
+ Usage: python -m benchmarks.bench_amazon_report --rows 200000
+"""
+
+import argparse
+import gzip
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from api.amazon_seller_api import AmazonListingManager
+
+COLUMNS = (
+    "item-name", "item-description", "listing-id", "seller-sku", "price", "quantity", "open-date",
+    "product-id-type", "item-condition", "asin1", "product-id", "fulfillment-channel", "status",
+)
+
+
+def make_report(row_count: int) -> bytes:
+    """Build a gzipped GET_MERCHANT_LISTINGS_ALL_DATA report with `row_count` rows."""
+    lines = ["\ufeff" + "\t".join(COLUMNS)]
+
+    for index in range(row_count):
+        sku = f"SKU{index}_fba" if index % 20 == 0 else f"SKU{index}"
+        lines.append("\t".join((
+            f"Koko Paspas {index} - Kaymaz Tabanlı Kapı Önü Paspası 40x60 cm",
+            f"Türkiyede Üretimi, yıkanabilir, kaymaz taban. Ürün {index}",
+            f"L{index:010d}", sku, f"{index % 500 + 10}.90", str(index % 40), "2024-05-01 10:00:00 UTC",
+            "1", "11", f"B0{index:08d}", f"B0{index:08d}", "DEFAULT", "Active" if index % 7 else "Inactive",
+        )))
+
+    return gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def in_memory_path(manager: AmazonListingManager, report: bytes) -> int:
+    # What the SDK download and `process_report_document` did: the whole text, every row, then products
+    document = SimpleNamespace(payload={"document": gzip.decompress(report).decode("utf-8")})
+    raw_data = manager.process_report_document(document)
+    raw_data = [item for item in raw_data if item.get("status", "ACTIVE") in ["Active"]]
+    products = [manager.process_product_data(item) for item in raw_data if "_fba" not in item["seller-sku"]]
+    return len(products)
+
+
+def streaming_path(manager: AmazonListingManager, report: bytes) -> int:
+    with tempfile.TemporaryFile() as spool:
+        spool.write(report)
+        spool.seek(0)
+        rows = manager.read_report_rows(spool, "GZIP")
+        products = list(manager.iter_listings(rows, status_filter=["Active"]))
+    return len(products)
+
+
+def measure(func, manager: AmazonListingManager, report: bytes) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func(manager, report)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    report = make_report(args.rows)
+    print(f"report size: {len(report) / 1024 / 1024:.1f} MiB gzipped, {args.rows} rows")
+
+    # The parsing methods need no credentials, skip the SP-API client setup
+    manager = AmazonListingManager.__new__(AmazonListingManager)
+
+    for name, func in (("in memory", in_memory_path), ("streaming", streaming_path)):
+        count, elapsed, peak = measure(func, manager, report)
+        print(f"{name:<10}: {count} products in {elapsed:.2f} s, peak memory {peak / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+""" Benchmark of ProductRecord against the product dicts the platform clients return.
+
+ Builds the same catalog both ways and compares peak memory and build time, then the
+ time of a SKU join that reads quantities and prices like `generate_changed_items`.
+
+ Usage: python -m benchmarks.bench_product_record --items 100000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from app.product_record import ProductRecord
+from app.sku_index import SkuIndex, join_by_sku
+
+
+def make_rows(item_count: int, seed: int = 7) -> list:
+    """Raw (sku, barcode, quantity, price, title, main id) tuples of a synthetic catalog."""
+    rng = random.Random(seed)
+    return [
+        (f"SKU{index}", f"869{index:010d}", rng.randint(0, 50), round(rng.uniform(50, 900), 2),
+         f"Koko Paspas {index}", f"MAIN{index // 4}")
+        for index in range(item_count)
+    ]
+
+
+def build_dicts(rows: list) -> list:
+    # The Trendyol compact shape, the largest of the compact dicts
+    return [
+        {"sku": sku, "id": barcode, "quantity": quantity, "price": price,
+         "title": title, "product_main_id": main_id}
+        for sku, barcode, quantity, price, title, main_id in rows
+    ]
+
+
+def build_records(rows: list) -> list:
+    return [
+        ProductRecord(sku, barcode, quantity, price, "trendyol", title, main_id)
+        for sku, barcode, quantity, price, title, main_id in rows
+    ]
+
+
+def join(source: list, target: list) -> int:
+    changed = 0
+    for source_item, matches in join_by_sku(source, {"target": SkuIndex(target, "target")}):
+        target_item = matches.get("target")
+        if target_item is not None and (
+            target_item["quantity"] != source_item["quantity"] or target_item.get("price", 0) != source_item.get("price", 0)
+        ):
+            changed += 1
+    return changed
+
+
+def measure_build(func, rows: list) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = func(rows)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, elapsed, current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.items)
+    shifted = [(sku, barcode, quantity + (index % 10 == 0), price, title, main_id)
+               for index, (sku, barcode, quantity, price, title, main_id) in enumerate(rows)]
+
+    for name, build in (("dicts", build_dicts), ("records", build_records)):
+        source, elapsed, memory = measure_build(build, rows)
+        target = build(shifted)
+
+        start = time.perf_counter()
+        changed = join(source, target)
+        join_elapsed = time.perf_counter() - start
+
+        print(
+            f"{name:<8}: built {len(source)} items in {elapsed:.3f} s using {memory / 1024 / 1024:.1f} MiB, "
+            f"joined {changed} changes in {join_elapsed:.3f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
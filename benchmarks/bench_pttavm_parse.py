@@ -0,0 +1,91 @@
+""" Benchmark of PTTAVM StokKontrolListesi response parsing.
+
+ Compares the xmltodict path (`formatdata`) with the streaming parser
+ (`iter_stock_details`) on a synthetic response, measuring time and peak memory.
+
+ Usage: python -m benchmarks.bench_pttavm_parse --products 50000
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+
+from api.pttavm_api import formatdata, iter_stock_details
+
+FIELDS = {
+    "Aktif": "true", "Barkod": "869{0:010d}", "DesiMiktari": "1", "KDVOran": "10",
+    "KDVli": "{1}.90", "KDVsiz": "{1}.00", "Miktar": "{2}", "ShopId": "12345",
+    "UrunAdi": "Koko Paspas {0} - Kaymaz Tabanlı Kapı Önü Paspası 40x60 cm",
+    "UrunKodu": "SKU{0}", "UrunId": "{0}", "KategoriId": "1000722",
+    "Aciklama": "Türkiyede Üretimi, yıkanabilir, kaymaz taban. Ürün {0}",
+}
+
+
+def make_response(product_count: int) -> bytes:
+    """Build a StokKontrolListesi SOAP response holding `product_count` products."""
+    parts = [
+        '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+        '<StokKontrolListesiResponse xmlns="http://tempuri.org/">'
+        '<StokKontrolListesiResult xmlns:a="http://schemas.datacontract.org/2004/07/ePttAVMService" '
+        'xmlns:i="http://www.w3.org/2001/XMLSchema-instance">'
+    ]
+
+    for index in range(product_count):
+        parts.append("<a:StokKontrolDetay>")
+        for field, value in FIELDS.items():
+            parts.append(f"<a:{field}>{value.format(index, index % 500 + 10, index % 40)}</a:{field}>")
+        parts.append('<a:Resimler i:nil="true"/></a:StokKontrolDetay>')
+
+    parts.append("</StokKontrolListesiResult></StokKontrolListesiResponse></s:Body></s:Envelope>")
+
+    return "".join(parts).encode("utf-8")
+
+
+class FakeResponse:
+    """Minimal stand-in for a streamed requests.Response."""
+
+    def __init__(self, body: bytes):
+        self._body = body
+        self.raw = io.BytesIO(body)
+
+    @property
+    def text(self) -> str:
+        return self._body.decode("utf-8")
+
+
+def xmltodict_path(body: bytes) -> int:
+    products = formatdata(FakeResponse(body))[
+        'StokKontrolListesiResponse']['StokKontrolListesiResult']['a:StokKontrolDetay']
+    return sum(1 for product in products if product['a:Miktar'] is not None)
+
+
+def streaming_path(body: bytes) -> int:
+    return sum(1 for product in iter_stock_details(FakeResponse(body)) if product['a:Miktar'] is not None)
+
+
+def measure(func, body: bytes) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func(body)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=50000)
+    args = parser.parse_args()
+
+    body = make_response(args.products)
+    print(f"response size: {len(body) / 1024 / 1024:.1f} MiB, {args.products} products")
+
+    for name, func in (("xmltodict", xmltodict_path), ("streaming", streaming_path)):
+        count, elapsed, peak = measure(func, body)
+        print(f"{name:<10}: {count} products in {elapsed:.2f} s, peak memory {peak / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+""" Benchmark of the SKU join used by `App.filter_items`.
+
+ Compares the old nested-loop scan of `compare_with_source` with the hash-indexed
+ join from app.sku_index on synthetic catalogs.
+
+ Usage: python -m benchmarks.bench_sku_join --skus 50000 --platforms 6
+"""
+
+import argparse
+import random
+import string
+import time
+
+from app.sku_index import build_indexes, join_by_sku
+
+
+def make_catalogs(sku_count: int, platform_count: int, overlap: float = 0.8, seed: int = 7) -> dict:
+    """Build a source catalog and `platform_count` targets sharing `overlap` of its SKUs."""
+    rng = random.Random(seed)
+    skus = ["".join(rng.choices(string.ascii_uppercase + string.digits, k=10)) for _ in range(sku_count)]
+    data = {"source": [{"sku": sku, "quantity": rng.randint(0, 50)} for sku in skus]}
+
+    for platform in range(platform_count):
+        shared = rng.sample(skus, int(sku_count * overlap))
+        extra = [f"X{platform}-{i}" for i in range(sku_count - len(shared))]
+        target = [{"sku": sku, "quantity": rng.randint(0, 50)} for sku in shared + extra]
+        rng.shuffle(target)
+        data[f"target{platform}"] = target
+
+    return data
+
+
+def legacy_join(source_items: list, targets: dict) -> dict:
+    """The nested-loop scan `compare_with_source` used before the index was added."""
+    matching_items = {}
+
+    for platform, platform_data in targets.items():
+        for source_item in source_items:
+            for target_item in platform_data:
+                if source_item["sku"] == target_item["sku"]:
+                    matching_items[source_item["sku"]] = [platform, target_item]
+                    break
+
+    return matching_items
+
+
+def indexed_join(source_items: list, targets: dict) -> dict:
+    matching_items = {}
+    indexes = build_indexes(targets)
+
+    for source_item, matches in join_by_sku(source_items, indexes):
+        for platform, target_item in matches.items():
+            matching_items[source_item["sku"]] = [platform, target_item]
+
+    return matching_items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skus", type=int, default=50000)
+    parser.add_argument("--platforms", type=int, default=6)
+    parser.add_argument("--legacy-sample", type=int, default=200,
+                        help="source items timed with the nested loop, the full run is extrapolated")
+    args = parser.parse_args()
+
+    data = make_catalogs(args.skus, args.platforms)
+    source = data.pop("source")
+
+    start = time.perf_counter()
+    indexed = indexed_join(source, data)
+    indexed_time = time.perf_counter() - start
+
+    # The nested loop is linear in the number of source items, so a sample is extrapolated
+    sample = source[:args.legacy_sample]
+    start = time.perf_counter()
+    legacy = legacy_join(sample, data)
+    legacy_time = (time.perf_counter() - start) * len(source) / len(sample)
+
+    assert all(indexed[sku] == legacy[sku] for sku in legacy)
+
+    print(f"catalog size      : {args.skus} SKUs x {args.platforms} target platforms")
+    print(f"matched SKUs      : {len(indexed)}")
+    print(f"indexed join      : {indexed_time:.3f} s")
+    print(f"nested loop (est.): {legacy_time:.1f} s  (from {len(sample)} sampled source items)")
+    print(f"speedup           : {legacy_time / indexed_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+""" Benchmark of SOAP envelope building and response reading.
+
+ Compares the f-string envelopes and xmltodict parsing the PTTAVM and N11 SOAP clients
+ used per call with the precompiled templates and extractors of `api.soap`.
+
+ Usage: python -m benchmarks.bench_soap --calls 20000
+"""
+
+import argparse
+import time
+
+import xmltodict
+
+from api import pttavm_api
+from api.soap import SoapTemplate, find_text
+
+USERNAME, PASSWORD, SHOP_ID = "magaza@example.com", "s3cr3t-parola", "12345"
+
+PTTAVM_RESPONSE = (
+    '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+    '<StokFiyatGuncelle3Response xmlns="http://tempuri.org/">'
+    '<StokFiyatGuncelle3Result xmlns:a="http://schemas.datacontract.org/2004/07/ePttAVMService" '
+    'xmlns:i="http://www.w3.org/2001/XMLSchema-instance">'
+    "<a:ErrorMessage i:nil=\"true\"/><a:Success>true</a:Success>"
+    "</StokFiyatGuncelle3Result></StokFiyatGuncelle3Response></s:Body></s:Envelope>"
+)
+
+N11_RESPONSE = (
+    '<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/"><SOAP-ENV:Header/><SOAP-ENV:Body>'
+    '<ns3:UpdateStockByStockSellerCodeResponse xmlns:ns3="http://www.n11.com/ws/schemas">'
+    "<result><status>failure</status><errorCode>SELLER_API.stockItemNotFound</errorCode>"
+    "<errorMessage>Stok kalemi bulunamadı</errorMessage><errorCategory>SELLER_API</errorCategory></result>"
+    "</ns3:UpdateStockByStockSellerCodeResponse></SOAP-ENV:Body></SOAP-ENV:Envelope>"
+)
+
+
+def fstring_envelope(product: dict) -> bytes:
+    """The envelope as rendered before, credentials and namespaces formatted on every call."""
+    body = f"""
+    <tem:StokFiyatGuncelle3>
+        <tem:item>
+            <ept:Aktif>true</ept:Aktif>
+            <ept:Barkod>{product['id']}</ept:Barkod>
+            <ept:KDVOran>10</ept:KDVOran>
+            <ept:KDVli>{product['price']}</ept:KDVli>
+            <ept:KDVsiz>0</ept:KDVsiz>
+            <ept:Miktar>{product['quantity']}</ept:Miktar>
+            <ept:ShopId>{SHOP_ID}</ept:ShopId>
+        </tem:item>
+    </tem:StokFiyatGuncelle3>"""
+
+    return f"""
+    <soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:tem="http://tempuri.org/" xmlns:ept="http://schemas.datacontract.org/2004/07/ePttAVMService">
+    <soapenv:Header>
+        <wsse:Security soapenv:mustUnderstand="1" xmlns:wsse="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd">
+            <wsse:UsernameToken>
+                <wsse:Username>{USERNAME}</wsse:Username>
+                <wsse:Password Type="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-username-token-profile-1.0#PasswordText">{PASSWORD}</wsse:Password>
+            </wsse:UsernameToken>
+        </wsse:Security>
+    </soapenv:Header>
+   <soapenv:Body>
+    {body}
+    </soapenv:Body>
+</soapenv:Envelope>
+""".encode("utf-8")
+
+
+def template_envelope(envelope: SoapTemplate, item: SoapTemplate, request: SoapTemplate, products: list) -> bytes:
+    return envelope.render(body=request.render(items=item.render_many(products)))
+
+
+def xmltodict_pttavm(response: str) -> bool:
+    result = xmltodict.parse(response)["s:Envelope"]["s:Body"][
+        "StokFiyatGuncelle3Response"]["StokFiyatGuncelle3Result"]
+    return str(result["a:Success"]).lower() == "true"
+
+
+def xmltodict_n11(response: str) -> str:
+    # The envelope trimming `__assign_vars__` did before handing the rest to xmltodict
+    trimmed = response.replace(
+        '<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/"><SOAP-ENV:Header/><SOAP-ENV:Body>', ""
+    ).replace("</SOAP-ENV:Body></SOAP-ENV:Envelope>", "")
+    return xmltodict.parse(trimmed)["ns3:UpdateStockByStockSellerCodeResponse"]["result"]["errorMessage"]
+
+
+def per_call(func, calls: int, items: int = 1) -> float:
+    """Microseconds per item of `func`, which handles `items` items per call."""
+    start = time.perf_counter()
+    for index in range(calls):
+        func(index)
+    return (time.perf_counter() - start) / (calls * items) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=pttavm_api.UPDATE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    envelope = SoapTemplate(pttavm_api.ENVELOPE_TEMPLATE, username=USERNAME, password=PASSWORD)
+    item = SoapTemplate(pttavm_api.STOCK_PRICE_ITEM_TEMPLATE, shop_id=SHOP_ID)
+    request = pttavm_api.STOCK_PRICE_REQUEST
+    products = [{"id": f"869{index:010d}", "price": 129.9, "quantity": index % 40} for index in range(1000)]
+
+    pttavm_bytes = PTTAVM_RESPONSE.encode("utf-8")
+    n11_bytes = N11_RESPONSE.encode("utf-8")
+
+    batch = products[:args.batch]
+
+    # (name, items per call of the new path, old path, new path)
+    cases = (
+        ("single envelope", 1, lambda i: fstring_envelope(products[i % 1000]),
+         lambda i: template_envelope(envelope, item, request, [products[i % 1000]])),
+        ("batch envelope", len(batch), lambda i: fstring_envelope(products[i % 1000]),
+         lambda i: template_envelope(envelope, item, request, batch)),
+        ("pttavm response", 1, lambda i: xmltodict_pttavm(PTTAVM_RESPONSE),
+         lambda i: find_text(pttavm_bytes, "Success", "").lower() == "true"),
+        ("n11 response", 1, lambda i: xmltodict_n11(N11_RESPONSE),
+         lambda i: find_text(n11_bytes, "errorMessage")),
+        ("pttavm update", 1,
+         lambda i: (fstring_envelope(products[i % 1000]), xmltodict_pttavm(PTTAVM_RESPONSE)),
+         lambda i: (template_envelope(envelope, item, request, [products[i % 1000]]),
+                    find_text(pttavm_bytes, "Success", "").lower() == "true")),
+    )
+
+    for name, items, before, after in cases:
+        before_us = per_call(before, args.calls)
+        after_us = per_call(after, max(1, args.calls // items), items)
+        print(f"{name:<16}: {before_us:6.1f} us -> {after_us:6.1f} us per item ({before_us / after_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
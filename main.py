@@ -5,19 +5,28 @@
  operations related to each platform."""
 
 import os
+import time
+from functools import partial
 from app.config import logger 
 from datetime import datetime, timezone
 from dateutil.relativedelta import relativedelta
 from api.n11_rest_api import N11RestAPI
 from tui import ProductManagerApp
 from rich.prompt import Prompt
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from api.amazon_seller_api import AmazonListingManager
+from api.async_clients import build_async_clients
 from api.hepsiburada_api import Hb_API
 from api.pazarama_api import PazaramaAPIClient
-from api.pttavm_api import getpttavm_procuctskdata, pttavm_updatedata
+from api.pttavm_api import getpttavm_procuctskdata, pttavm_update_products, pttavm_updatedata
 from api.trendyol_api import TrendyolClient
 from api.wordpress_api import WooCommerceAPIClient
+from app.config.constants import INCREMENTAL_SYNC, PRODUCT_RECORDS
+from app.fetch_engine import FetchEngine
+from app.product_record import ProductRecord, to_dicts, to_records
+from app.sku_index import SkuIndex, build_indexes, join_by_sku
+from app.snapshot_store import SnapshotStore
+from app.update_dispatcher import UpdateDispatcher
 
 
 hpApi = Hb_API()
@@ -26,6 +35,16 @@ amznApi = AmazonListingManager()
 pazaramaApi = PazaramaAPIClient()
 trendyolApi = TrendyolClient()
 woocommerceApi = WooCommerceAPIClient()
+# Coroutine versions of the clients above, PTTAVM is a module of functions
+asyncClients = build_async_clients({
+    "n11": n11Api,
+    "hepsiburada": hpApi,
+    "amazon": amznApi,
+    "pttavm": None,
+    "pazarama": pazaramaApi,
+    "trendyol": trendyolApi,
+    "wordpress": woocommerceApi,
+})
 
 
 def group_product_variants(matching_items: Dict[Any, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
@@ -59,7 +78,7 @@ def group_product_variants(matching_items: Dict[Any, List[Dict[str, Any]]]) -> D
 def find_non_matching_items(data: Dict[str, Any], source: str, target: str) -> List[Dict[str, Any]]:
     """Finds items that don't match between source and target platforms."""
     non_matching_items = []
-    target_data = {item["sku"]: item for item in data.get(target, [])}
+    target_data = SkuIndex(data.get(target, []), target)
     exists = []
     non_found = []
 
@@ -98,6 +117,11 @@ def generate_changed_items(matching_items: Dict[str, List[Dict[str, Any]]], use_
 def add_items_without_source(include_all: bool, matching_items: Dict[str, List[Dict[str, Any]]], platform: str, target_item):
     """Helper function to add items without considering the source."""
 
+    if isinstance(target_item, ProductRecord):
+        # Records already carry every field the comparison reads, no copy is needed
+        matching_items.setdefault(target_item.sku, []).append(target_item)
+        return
+
     quantity = (
         int(target_item.get("data", {}).get("quantity", 0))
         if "data" in target_item
@@ -125,14 +149,14 @@ def add_items_without_source(include_all: bool, matching_items: Dict[str, List[D
                 {"platform": platform, "id": item_id, "price": price, "quantity": quantity}
             ]
 
-def compare_with_source(source_data: List[Dict[str, Any]], platform_data: List[Dict[str, Any]], 
+def compare_with_source(source_data: List[Dict[str, Any]], platform_data: Union[List[Dict[str, Any]], SkuIndex], 
                         platform: str, matching_items: Dict[str, List[Dict[str, Any]]], include_all: bool):
     """Compares items between source and a target platform, updating matching_items."""
-    for source_item in source_data:
-        for target_item in platform_data:
-            if source_item["sku"] == target_item["sku"]:
-                add_matching_item(matching_items, source_item, target_item, platform, include_all)
-                break
+    target_index = platform_data if isinstance(platform_data, SkuIndex) else SkuIndex(platform_data, platform)
+
+    for source_item, matches in join_by_sku(source_data, {platform: target_index}):
+        if platform in matches:
+            add_matching_item(matching_items, source_item, matches[platform], platform, include_all)
 
 def add_matching_item(matching_items: Dict[str, List[Dict[str, Any]]], source_item: Dict[str, Any], 
                       target_item: Dict[str, Any], platform: str, include_all: bool):
@@ -140,6 +164,11 @@ def add_matching_item(matching_items: Dict[str, List[Dict[str, Any]]], source_it
 
     """Adds a source and target item pair to matching_items."""
     sku = source_item["sku"]
+    if isinstance(target_item, ProductRecord):
+        # Records already carry their platform and fields, no copy is needed
+        matching_items[sku] = [source_item, target_item] if include_all else [target_item]
+        return
+
     if include_all:
         matching_items[sku] = [
             {"platform": source_item["platform"], "data": source_item["data"]},
@@ -168,6 +197,11 @@ class App:
     def __init__(self) -> None:
 
         self.platform_data_cache = {}     
+        self.last_fetch_results = {}
+        self.last_update_results = {}
+        self.incremental = INCREMENTAL_SYNC
+        self.use_records = PRODUCT_RECORDS
+        self.snapshot_store = SnapshotStore()
         self.platforms = [
             self.N11,
             self.HEPSIBURADA,
@@ -186,8 +220,19 @@ class App:
             'trendyol': trendyolApi.update_product,
             'wordpress': woocommerceApi.update_product,
         }
+        # Platforms that accept a whole change set in one call
+        self.platform_to_bulk_update_function = {
+            'trendyol': trendyolApi.update_products,
+            'hepsiburada': hpApi.update_listings,
+            'n11': n11Api.update_products,
+            'pazarama': pazaramaApi.update_products,
+            'wordpress': woocommerceApi.update_products,
+            'pttavm': pttavm_update_products,
+            'amazon': amznApi.update_listings,
+        }
 
-    def load_initial_data(self, load_all: bool, platforms: list[str] = None) -> dict:
+    def load_initial_data(self, load_all: bool, platforms: list[str] = None, use_local_data: bool = False,
+                          incremental: bool = None) -> dict:
         """
         Load initial data in the background and cache it.
 
@@ -195,6 +240,11 @@ class App:
             load_all (bool): Whether to load all products or partial data.
             platforms (list[str], optional): List of platform names to load data from. 
                                              Loads all platforms if None.
+            use_local_data (bool): Start from fresh snapshots in the snapshot store and only
+                                   fetch the platforms without one.
+            incremental (bool): Fetch only the items changed since the last sync on platforms
+                                that can filter by modification date, and merge them into
+                                their stored snapshot. Defaults to `self.incremental`.
 
         Returns:
             dict: Loaded data from the specified platforms or all platforms if none are specified.
@@ -210,19 +260,72 @@ class App:
             "pttavm": lambda: getpttavm_procuctskdata(load_all),
             "amazon": lambda: amznApi.get_listings(every_product=load_all),
         }
+        # Platforms that can return only the items changed since a given time
+        platform_delta_functions = {
+            "trendyol": lambda since: trendyolApi.get_stock_data(
+                include_full_data=load_all, filters=trendyolApi.modified_since_filter(since)
+            ),
+            "wordpress": lambda since: woocommerceApi.get_all_products(load_all, modified_after=since),
+            "amazon": lambda since: amznApi.get_listings(every_product=load_all, modified_since=since),
+        }
+        # Platforms whose data can be older than the fetch, e.g. a reused Amazon report
+        platform_data_as_of = {
+            "amazon": lambda: amznApi.listings_as_of,
+        }
+
+        if incremental is None:
+            incremental = self.incremental
 
         data = {}
 
         # Load data for the specified platforms or all platforms if none specified
-        selected_platforms = platforms or platform_functions.keys()
+        selected_platforms = list(platforms or platform_functions.keys())
 
-        for platform in selected_platforms:
-            try:
-                data[platform] = platform_functions[platform]()
-            except KeyError:
-                logger.warning(f"Platform '{platform}' not found.")
-            except Exception as e:
-                logger.error(f"Error loading data for platform '{platform}': {e}")
+        if use_local_data:
+            for platform in selected_platforms:
+                snapshot = self.snapshot_store.load(platform, full=load_all)
+                if snapshot is not None:
+                    data[platform] = snapshot
+
+        platforms_to_fetch = [platform for platform in selected_platforms if platform not in data]
+
+        fetch_functions = dict(platform_functions)
+        delta_platforms = set()
+
+        if incremental:
+            for platform in platforms_to_fetch:
+                since = self.snapshot_store.changed_since(platform, full=load_all)
+
+                if platform in platform_delta_functions and since is not None:
+                    fetch_functions[platform] = partial(platform_delta_functions[platform], since)
+                    delta_platforms.add(platform)
+                    logger.info(f"Fetching {platform} items changed since {since.isoformat()}")
+
+        if platforms_to_fetch:
+            started_at = time.time()
+
+            # Fetch every selected platform at once, a failed platform does not block the others
+            fetch_results = FetchEngine(fetch_functions).run(platforms_to_fetch)
+            self.last_fetch_results = fetch_results
+
+            for platform, result in fetch_results.items():
+                if not result.ok:
+                    continue
+
+                # The next delta has to start where the data was current, not where the fetch began
+                data_as_of = platform_data_as_of[platform]() if platform in platform_data_as_of else None
+                synced_at = min(started_at, data_as_of) if data_as_of else started_at
+
+                if result.data is None:
+                    data[platform] = result.data
+                elif platform in delta_platforms:
+                    data[platform] = self.snapshot_store.merge(platform, result.data, full=load_all, synced_at=synced_at)
+                else:
+                    data[platform] = result.data
+                    self.snapshot_store.save(platform, result.data, full=load_all, synced_at=synced_at)
+
+        if self.use_records:
+            data = {platform: to_records(items, platform) for platform, items in data.items()}
 
         # Cache loaded data if all platforms are being loaded
         if platforms is None:
@@ -272,12 +375,12 @@ class App:
                 logger.error(f"An error occurred while retrieving stock data: {e}")
                 return {}
             
-        if source_platform and not use_local_data:
+        if source_platform:
 
             source_data = self.retrieve_data(include_all_products, use_local_data, [source_platform])
             return source_data
 
-        self.load_initial_data(include_all_products)
+        self.load_initial_data(include_all_products, use_local_data=use_local_data)
         return self.platform_data_cache
     
     def get_date_range(date_option: str) -> Tuple[datetime, datetime]:
@@ -328,7 +431,7 @@ class App:
         filtered_data = {}
     
         # Load initial data based on the include_all_products flag
-        returned_data = self.load_initial_data(include_all_products, platforms)
+        returned_data = self.load_initial_data(include_all_products, platforms, use_local_data)
         
         # Access cached data
         if returned_data:
@@ -408,24 +511,30 @@ class App:
         Returns:
             List[Dict[str, Any]]: List of items with quantity changes or mismatches.
         """
-        if source:
-            del self.platforms[self.platforms.index(source)]
+        platforms = [platform for platform in self.platforms if platform != source]
 
         if find_mismatches:
             return find_non_matching_items(data, source, target)
 
         matching_items = {}
 
-        for platform in self.platforms:
+        if use_source:
+            # Index every target once and join the source against all of them in a single pass
+            indexes = build_indexes(data, platforms)
+
+            for source_item, matches in join_by_sku(data.get(source) or [], indexes):
+                for platform, target_item in matches.items():
+                    add_matching_item(matching_items, source_item, target_item, platform, include_all)
+
+            return generate_changed_items(matching_items, use_source)
+
+        for platform in platforms:
             platform_data = data.get(platform)
             if not platform_data:
                 continue
 
-            if use_source:
-                compare_with_source(data[source], platform_data, platform, matching_items, include_all)
-            else:
-                for item in platform_data:
-                    add_items_without_source(matching_items=matching_items, target_item=item, platform=platform, include_all=include_all)
+            for item in platform_data:
+                add_items_without_source(matching_items=matching_items, target_item=item, platform=platform, include_all=include_all)
 
         return generate_changed_items(matching_items, use_source)
     
@@ -474,7 +583,8 @@ class App:
                     
                     
 
-        return product_data
+        # Update functions expect plain dicts
+        return to_dicts(product_data)
 
     def process_update_data(self, source=None, use_source=False, targets=None, options=None):
         """
@@ -536,21 +646,19 @@ class App:
             logger.error(f"An error occurred while processing update data: {e}")
             return {}
 
-    def execute_platform_updates(self, platform, func, post_data, options, source):
+    def execute_platform_updates(self, platforms, post_data):
+        """
+        Send the change set to the given platforms at once through the update dispatcher.
 
-        try:
-            if isinstance(post_data, list):
-                for post in post_data:
-                    if platform == post['platform']:
+        Returns:
+            dict: Platform name to PlatformUpdateResult, also kept in `last_update_results`.
+        """
 
-                        func(post)
-            else:
-                if platform == post_data['platform']:
-                    func(post_data)
+        posts = post_data if isinstance(post_data, list) else [post_data]
+        dispatcher = UpdateDispatcher(self.platform_to_update_function, self.platform_to_bulk_update_function)
+        self.last_update_results = dispatcher.run(posts, platforms)
 
-            # logger.info(f"Successfully updated {len(post_data)} products on {platform.name}.")
-        except Exception as e:
-            logger.error(f"Failed to update products on {platform}. Error: {e}")
+        return self.last_update_results
 
     def execute_updates(self, source=None, use_source=False, targets=None, options=None, user_input=None):
         """
@@ -618,16 +726,17 @@ class App:
 
             
 
-            # Process updates
-            for platform, func in self.platform_to_update_function.items():
+            # Process updates, every selected platform at once
+            if isinstance(targets, list):
+                platforms = targets
+            elif targets:
+                platforms = [targets]
+            elif not source:
+                platforms = list(self.platform_to_update_function)
+            else:
+                platforms = []
 
-                if isinstance(targets, list):
-                    if platform in targets:
-                        self.execute_platform_updates(platform, func, post_data, options, source)
-                elif platform == targets:
-                    self.execute_platform_updates(platform, func, post_data, options, source)
-                elif not source and not targets:
-                    self.execute_platform_updates(platform, func, post_data, options, source)
+            self.execute_platform_updates(platforms, post_data)
 
             logger.info("Updates completed.")
 
@@ -635,16 +744,6 @@ class App:
             
     def create_products(self, SOURCE_PLATFORM, TARGET_PLATFORM, TARGET_OPTIONS, LOCAL_DATA=False):
 
-        platform_to_function = {
-        "n11": n11Api.create_product,
-        "hepsiburada": hpApi.create_listing,
-        "amazon": amznApi.add_listing,
-        "pttavm": pttavm_updatedata,
-        "pazarama": pazaramaApi.create_products,
-        "trendyol": trendyolApi.update_product,
-        "wordpress": woocommerceApi.create_product,
-    }
-
         data_lists = self.retrieve_stock_data(
         include_all_products=True,
         use_local_data=LOCAL_DATA,
@@ -663,9 +762,10 @@ class App:
 
         if filtered_data:
 
-            for product in filtered_data:
+            # Every product is created concurrently on the async clients' event loop
+            results = asyncClients[TARGET_PLATFORM].create_products_sync([product['data'] for product in filtered_data])
 
-                platform_to_function[TARGET_PLATFORM](product_data=product['data'])
+            logger.info(f"{TARGET_PLATFORM}: created {sum(results.values())} of {len(results)} products")
 
         logger.info("Done")
 
@@ -0,0 +1,120 @@
+import gzip
+import io
+import json
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from api.amazon_seller_api import AmazonListingManager, ListingFetchError, ReportCache
+
+
+def _manager(cache_dir):
+    with patch("api.amazon_seller_api.DataKiosk"):
+        manager = AmazonListingManager()
+    manager.report_cache = ReportCache(str(cache_dir), manager.report_max_age)
+    manager.feed_poll_interval = 0
+    manager.retry = lambda func, *args, **kwargs: func(*args, **kwargs)
+    return manager
+
+
+def test_update_listings_sends_one_feed_and_maps_issues_to_skus(tmp_path):
+    manager = _manager(tmp_path)
+    products = [{"sku": f"SKU{i}", "quantity": i, "price": 100 + i} for i in range(3)]
+    feeds = MagicMock()
+    uploaded = []
+
+    def submit_feed(feed_type, file, content_type, **kwargs):
+        uploaded.append(json.loads(file.read()))
+        return MagicMock(), MagicMock(payload={"feedId": "F1"})
+
+    feeds.submit_feed.side_effect = submit_feed
+    feeds.get_feed.side_effect = [
+        MagicMock(payload={"processingStatus": "IN_PROGRESS"}),
+        MagicMock(payload={"processingStatus": "DONE", "resultFeedDocumentId": "D1"}),
+    ]
+    feeds.get_feed_result_document.return_value = json.dumps({
+        "issues": [
+            {"messageId": 2, "severity": "ERROR", "code": "90220", "message": "price is invalid"},
+            {"messageId": 3, "severity": "WARNING", "code": "18", "message": "ignored attribute"},
+        ]
+    })
+
+    with patch("api.amazon_seller_api.Feeds", return_value=feeds):
+        results = manager.update_listings(products)
+
+    messages = uploaded[0]["messages"]
+    assert [(message["messageId"], message["sku"], message["operationType"]) for message in messages] == [
+        (1, "SKU0", "PATCH"), (2, "SKU1", "PATCH"), (3, "SKU2", "PATCH")
+    ]
+    assert messages[0]["patches"] == manager._build_update_payload(products[0])["patches"]
+    assert results == {"SKU0": True, "SKU1": {"success": False, "message": "price is invalid"}, "SKU2": True}
+
+
+def test_listing_messages_are_split_into_feeds_and_failed_feeds_fail_their_skus(tmp_path):
+    manager = _manager(tmp_path)
+    manager.feed_max_messages = 2
+    manager._submit_feed = MagicMock(side_effect=["F1", ValueError("upload failed")])
+    manager.get_feed_report = MagicMock(return_value={"issues": []})
+
+    results = manager.submit_listing_messages([{"sku": f"SKU{i}"} for i in range(3)])
+
+    assert results == {"SKU0": True, "SKU1": True, "SKU2": {"success": False, "message": "upload failed"}}
+
+
+REPORT = (
+    "\ufeffitem-name\tlisting-id\tseller-sku\tprice\tquantity\tproduct-id\tstatus\n"
+    "Koko Paspas\tL1\tKP4\t129.90\t5\tB001\tActive\n"
+    "Koko Paspas FBA\tL2\tKP4_fba\t129.90\t2\tB002\tActive\n"
+    "Kapı Önü Paspası\tL3\tKP5\t\t0\tB003\tInactive\n"
+)
+
+
+def test_listings_are_streamed_from_a_gzipped_report_and_cached(tmp_path):
+    manager = _manager(tmp_path)
+    document = MagicMock(payload={"url": "https://reports.example/doc", "compressionAlgorithm": "GZIP"})
+    response = MagicMock(encoding="UTF-8")
+    response.__enter__.return_value = response
+    response.iter_content.return_value = [gzip.compress(REPORT.encode("utf-8"))]
+    reports = MagicMock()
+    reports.get_report_document.return_value = document
+
+    with patch("api.amazon_seller_api.ReportsV2", return_value=reports), \
+            patch("api.amazon_seller_api.transport.get", return_value=response):
+        products = list(manager.iter_listings(manager.iter_report_rows("D1")))
+        active = list(manager.iter_listings(manager.iter_report_rows("D1"), status_filter=["Active"]))
+
+    assert [(product["sku"], product["quantity"], product["price"]) for product in products] == [
+        ("KP4", 5, 129.9), ("KP5", 0, 0)
+    ]
+    assert [product["sku"] for product in active] == ["KP4"]
+    # The second read came from the cached document
+    assert reports.get_report_document.call_count == 1
+
+
+def test_report_without_required_columns_is_rejected():
+    rows = AmazonListingManager.read_report_rows(io.BytesIO(b"seller-sku\tprice\nKP4\t1\n"))
+
+    with pytest.raises(ListingFetchError):
+        next(rows)
+
+
+def test_recent_complete_report_is_reused(tmp_path):
+    manager = _manager(tmp_path)
+    manager.report_cache.remember_report("R2", datetime(2026, 10, 16, tzinfo=timezone.utc))
+    reports = MagicMock()
+    reports.get_reports.return_value = MagicMock(payload={"reports": [
+        {"reportId": "R1", "reportDocumentId": "D1", "createdTime": "2026-10-16T09:00:00+00:00"},
+        {"reportId": "R2", "reportDocumentId": "D2", "createdTime": "2026-10-16T10:00:00+00:00"},
+    ]})
+
+    with patch("api.amazon_seller_api.ReportsV2", return_value=reports):
+        complete = manager.get_report("GET_MERCHANT_LISTINGS_ALL_DATA")
+        delta = manager.get_report("GET_MERCHANT_LISTINGS_ALL_DATA", datetime(2026, 10, 16, 8, tzinfo=timezone.utc))
+
+    # R2 only holds the rows changed since midnight, enough for the later delta but not a complete report
+    assert complete.report_id == "R1"
+    assert delta.report_id == "R2"
+    # Listings from a reused report are only as current as the report itself
+    assert complete.created_at == datetime(2026, 10, 16, 9, tzinfo=timezone.utc)
+    reports.create_report.assert_not_called()
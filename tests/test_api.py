@@ -1,5 +1,6 @@
 import pytest
 from api.base_api import BaseAPI
+from api.transport import transport
 from api.n11_api import N11API
 from unittest.mock import patch, MagicMock
 
@@ -18,12 +19,14 @@ def test_base_api_initialization(base_api):
 @patch('requests.Session.request')
 def test_base_api_get_request(mock_request, base_api):
     mock_response = MagicMock()
+    mock_response.status_code = 200
     mock_response.json.return_value = {"key": "value"}
     mock_request.return_value = mock_response
 
     result = base_api.get("endpoint")
     assert result == {"key": "value"}
-    mock_request.assert_called_once_with("GET", "https://api.example.com/endpoint", params=None, json=None)
+    mock_request.assert_called_once_with("GET", "https://api.example.com/endpoint", params=None, json=None,
+                                         headers={"Authorization": "Bearer test_key"}, timeout=transport.timeout)
 
 @patch('api.n11_api.N11API._make_request')
 def test_n11_api_get_products(mock_make_request, n11_api):
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from api import pttavm_api
+from api.async_clients import (
+    AsyncHepsiburadaClient,
+    AsyncPlatformClient,
+    AsyncPttavmClient,
+    AsyncTrendyolClient,
+    fetch_pages,
+    gather_limited,
+    run_sync,
+)
+from api.pagination import Page
+from api.trendyol_api import TrendyolClient
+
+
+def test_gather_limited_bounds_concurrency_and_keeps_order():
+    running = 0
+    peak = 0
+
+    async def work(i):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if i == 3:
+            raise ValueError("boom")
+        return i
+
+    results = run_sync(gather_limited((work(i) for i in range(10)), limit=3))
+
+    assert peak == 3
+    assert results[:3] == [0, 1, 2]
+    assert isinstance(results[3], ValueError)
+
+
+def test_fetch_pages_skips_pages_that_keep_failing():
+    async def fetch_page(number):
+        if number == 2:
+            raise ValueError("down")
+        return Page(number, [number], 4)
+
+    items = run_sync(fetch_pages(fetch_page, first_page=1, retry_delay=0))
+
+    assert items == [1, 3, 4]
+
+
+def test_trendyol_update_products_submits_and_polls_batches():
+    client = AsyncTrendyolClient(TrendyolClient(store_id="1", auth_hash="x"))
+    client.client.PRICE_INVENTORY_BATCH_SIZE = 2
+    products = [{"id": f"B{i}", "sku": f"SKU{i}", "quantity": i, "price": 1.0} for i in range(3)]
+    batches = {}
+
+    async def request(method, url, **kwargs):
+        if method == "POST":
+            batch_id = f"batch{len(batches)}"
+            batches[batch_id] = [item["barcode"] for item in json.loads(kwargs["content"])["items"]]
+            return httpx.Response(200, json={"batchRequestId": batch_id})
+
+        batch_id = url.rsplit("/", 1)[1]
+        return httpx.Response(200, json={"status": "COMPLETED", "items": [
+            {"requestItem": {"barcode": barcode}, "status": "FAILED" if barcode == "B2" else "SUCCESS"}
+            for barcode in batches[batch_id]
+        ]})
+
+    with patch("api.async_clients.async_transport.request", side_effect=request):
+        results = client.update_products_sync(products)
+
+    assert sorted(batches.values()) == [["B0", "B1"], ["B2"]]
+    assert results == {"B0": True, "B1": True, "B2": False}
+
+
+def test_platform_clients_must_implement_every_operation():
+    with pytest.raises(TypeError):
+        AsyncPlatformClient()
+
+
+def test_pttavm_update_products_packs_items_into_envelopes():
+    products = [{"sku": f"SKU{i}", "id": f"B{i}", "quantity": i, "price": 10} for i in range(5)]
+    sent = []
+
+    async def request(method, url, content=None, **kwargs):
+        sent.append(content.count(b"<tem:item>"))
+        flags = "".join(
+            f"<a:ServiceResult><a:Success>{str(index != 1).lower()}</a:Success></a:ServiceResult>"
+            for index in range(sent[-1])
+        )
+        return httpx.Response(200, content=(
+            '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+            '<StokFiyatGuncelle3Result xmlns:a="http://schemas.datacontract.org/2004/07/ePttAVMService">'
+            f"{flags}</StokFiyatGuncelle3Result></s:Body></s:Envelope>"
+        ).encode())
+
+    with patch.object(pttavm_api, "UPDATE_BATCH_SIZE", 3), \
+            patch("api.async_clients.async_transport.request", side_effect=request):
+        results = AsyncPttavmClient().update_products_sync(products)
+
+    assert sorted(sent) == [2, 3]
+    assert results == {"SKU0": True, "SKU1": False, "SKU2": True, "SKU3": True, "SKU4": False}
+
+
+def test_sync_creates_run_one_at_a_time_and_need_a_true_result():
+    running = 0
+    peak = 0
+
+    class Client:
+        def create_listing(self, product_data):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            time.sleep(0.01)
+            running -= 1
+            return None if product_data["stockCode"] == "S1" else True
+
+    products = [{"stockCode": f"S{i}"} for i in range(4)]
+    results = AsyncHepsiburadaClient(Client()).create_products_sync(products)
+
+    assert peak == 1
+    assert results == {"S0": True, "S1": False, "S2": True, "S3": True}
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from app.fetch_engine import FetchEngine
+
+
+def test_platforms_are_fetched_concurrently():
+    barrier = threading.Barrier(2, timeout=1)
+
+    def fetch(name):
+        barrier.wait()
+        return [name]
+
+    results = FetchEngine({"a": lambda: fetch("a"), "b": lambda: fetch("b")}).run()
+
+    assert results["a"].data == ["a"]
+    assert results["b"].data == ["b"]
+
+
+def test_failing_platform_does_not_block_the_others():
+    def fail():
+        raise ValueError("server down")
+
+    results = FetchEngine({"n11": fail, "trendyol": lambda: [1, 2]}).run()
+
+    assert results["trendyol"].ok and results["trendyol"].data == [1, 2]
+    assert not results["n11"].ok
+    assert results["n11"].error == "server down"
+
+
+def test_slow_platform_times_out():
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return []
+
+    start = time.monotonic()
+    results = FetchEngine({"amazon": slow, "pttavm": lambda: [1]}, timeouts={"amazon": 0.1}).run()
+    release.set()
+
+    assert time.monotonic() - start < 2
+    assert results["amazon"].timed_out and not results["amazon"].ok
+    assert results["pttavm"].ok
+
+
+def test_unknown_platform_is_reported():
+    results = FetchEngine({"trendyol": lambda: []}).run(["trendyol", "ebay"])
+
+    assert results["ebay"].error == "unknown platform"
+    assert results["trendyol"].ok
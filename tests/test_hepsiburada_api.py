@@ -0,0 +1,88 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from api.hepsiburada_api import Hb_API
+
+
+def _response(payload):
+    response = MagicMock()
+    response.text = json.dumps(payload)
+    return response
+
+
+@patch.object(Hb_API, "INVENTORY_POLL_INTERVAL", 0)
+def test_update_listings_groups_rows_into_uploads():
+    api = Hb_API()
+    products = [{"id": f"HB{i}", "sku": f"SKU{i}", "quantity": i, "price": 10.0} for i in range(5)]
+    statuses = {
+        "u0": [{"status": "InProgress", "errors": []}, {"status": "Done", "errors": []}],
+        "u1": [{"status": "Done", "errors": [{"merchantSku": "SKU3", "message": "invalid price"}]}],
+        "u2": [{"status": "Done", "errors": []}],
+    }
+    uploads = iter(["u0", "u1", "u2"])
+
+    def request_data(subdomain, url_addons, request_type, payload_content):
+        if request_type == "POST":
+            assert len(json.loads(payload_content)) <= 2
+            return _response({"id": next(uploads)})
+        return _response(statuses[url_addons.rsplit("/", 1)[1]].pop(0))
+
+    with patch.object(api, "request_data", side_effect=request_data) as mock_request:
+        results = api.update_listings(products, batch_size=2)
+
+    assert results == {"SKU0": True, "SKU1": True, "SKU2": True, "SKU3": False, "SKU4": True}
+    assert mock_request.call_count == 3 + 4
+
+
+@patch.object(Hb_API, "INVENTORY_POLL_INTERVAL", 0)
+def test_update_listings_skips_rows_missing_a_field():
+    api = Hb_API()
+    products = [{"id": "HB0", "sku": "SKU0", "quantity": 1, "price": 10.0}, {"id": "HB1", "quantity": 1, "price": 10.0}]
+    sent = []
+
+    def request_data(subdomain, url_addons, request_type, payload_content):
+        if request_type == "POST":
+            sent.extend(row["merchantSku"] for row in json.loads(payload_content))
+            return _response({"id": "u0"})
+        return _response({"status": "Done", "errors": []})
+
+    with patch.object(api, "request_data", side_effect=request_data):
+        results = api.update_listings(products)
+
+    assert sent == ["SKU0"]
+    assert results == {"SKU0": True, "HB1": False}
+
+
+def test_get_listings_reads_every_listing_page():
+    api = Hb_API()
+    listings = [{"merchantSku": f"SKU{i}", "availableStock": i, "price": "9.5"} for i in range(5)]
+    products = [{"hbSku": f"HB{i}", "merchantSku": f"SKU{i}"} for i in range(6)]
+
+    def request_data(subdomain, url_addons, request_type, payload_content):
+        if subdomain == api.listing_external_url:
+            offset = int(url_addons.split("offset=")[1].split("&")[0])
+            return _response({"totalCount": 5, "listings": listings[offset:offset + 2]})
+        page = int(url_addons.split("page=")[1])
+        return _response({"totalPages": 4, "data": products[(page - 1) * 2:page * 2]})
+
+    with patch.object(api, "request_data", side_effect=request_data):
+        result = api.get_listings()
+
+    assert [item["sku"] for item in result] == ["SKU0", "SKU1", "SKU2", "SKU3", "SKU4"]
+    assert result[4] == {"id": "HB4", "sku": "SKU4", "quantity": 4, "price": 9.5}
+
+
+def test_get_listings_fails_instead_of_returning_a_partial_catalog():
+    api = Hb_API()
+    listings = [{"merchantSku": f"SKU{i}", "availableStock": i, "price": "9.5"} for i in range(2)]
+
+    def request_data(subdomain, url_addons, request_type, payload_content):
+        if subdomain == api.listing_external_url:
+            offset = int(url_addons.split("offset=")[1].split("&")[0])
+            return _response({"totalCount": 5, "listings": listings}) if offset == 0 else None
+        return _response({"totalPages": 1, "data": []})
+
+    with patch.object(api, "request_data", side_effect=request_data), pytest.raises(ValueError):
+        api.get_listings()
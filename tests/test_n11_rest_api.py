@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock, patch
+
+from api.n11_rest_api import N11RestAPI
+
+
+def _response(payload, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    return response
+
+
+@patch.object(N11RestAPI, "TASK_POLL_INTERVAL", 0)
+def test_update_products_batches_skus_into_tasks():
+    api = N11RestAPI()
+    products = [{"sku": f"SKU{i}", "quantity": i, "price": 10} for i in range(5)]
+    submitted = []
+    polls = {}
+
+    def post(url, headers=None, json=None, **kwargs):
+        if url.endswith("price-stock-update"):
+            submitted.append([sku["stockCode"] for sku in json["payload"]["skus"]])
+            return _response({"id": len(submitted)})
+
+        task_id, page = json["taskId"], json["pageable"]["page"]
+        polls[task_id] = polls.get(task_id, 0) + 1
+        if polls[task_id] == 1:
+            return _response({"status": "IN_QUEUE"})
+
+        codes = submitted[task_id - 1]
+        content = [{"itemCode": code, "status": "FAIL" if code == "SKU3" else "SUCCESS", "reasons": ["x"]}
+                   for code in codes[page:page + 1]]
+        return _response({"status": "PROCESSED", "skus": {"content": content, "totalPages": len(codes)}})
+
+    with patch("api.n11_rest_api.transport.post", side_effect=post):
+        results = api.update_products(products, batch_size=2)
+
+    assert submitted == [["SKU0", "SKU1"], ["SKU2", "SKU3"], ["SKU4"]]
+    assert results == {"SKU0": True, "SKU1": True, "SKU2": True, "SKU3": False, "SKU4": True}
+
+
+@patch.object(N11RestAPI, "TASK_POLL_INTERVAL", 0)
+def test_update_products_reports_malformed_products_as_failed():
+    api = N11RestAPI()
+    products = [{"sku": "SKU0", "quantity": 1, "price": 10}, {"sku": "SKU1", "quantity": 1, "price": None}]
+    submitted = []
+
+    def post(url, headers=None, json=None, **kwargs):
+        if url.endswith("price-stock-update"):
+            submitted.append([sku["stockCode"] for sku in json["payload"]["skus"]])
+            return _response({"id": 1})
+        content = [{"itemCode": "SKU0", "status": "SUCCESS", "reasons": []}]
+        return _response({"status": "PROCESSED", "skus": {"content": content, "totalPages": 1}})
+
+    with patch("api.n11_rest_api.transport.post", side_effect=post):
+        results = api.update_products(products)
+
+    assert submitted == [["SKU0"]]
+    assert results == {"SKU0": True, "SKU1": False}
+
+
+@patch("api.pagination.time.sleep")
+def test_get_products_returns_partial_results_with_error_report(mock_sleep):
+    api = N11RestAPI()
+
+    def get(url, params=None, **kwargs):
+        if params["page"] == 3:
+            response = _response({}, status_code=500)
+            response.raise_for_status.side_effect = Exception("500 Server Error")
+            return response
+        content = [{"n11ProductId": params["page"], "stockCode": f"SKU{params['page']}", "quantity": 1, "salePrice": 2}]
+        return _response({"content": content, "totalPages": 4})
+
+    with patch("api.n11_rest_api.transport.get", side_effect=get):
+        products = api.get_products(page_size=100)
+
+    assert [product["sku"] for product in products] == ["SKU1", "SKU2", "SKU4"]
+    assert api.last_fetch_errors == {3: "500 Server Error"}
@@ -0,0 +1,47 @@
+import threading
+import time
+
+from api.pagination import Page, Paginator
+
+
+def test_fetch_all_keeps_page_order():
+    def fetch_page(number):
+        time.sleep(0.01 * (5 - number))  # later pages arrive first
+        return Page(number, [number * 10, number * 10 + 1], total_pages=5)
+
+    assert Paginator(fetch_page, first_page=0).fetch_all() == [0, 1, 10, 11, 20, 21, 30, 31, 40, 41]
+
+
+def test_failed_pages_are_retried_then_reported():
+    attempts = {}
+    lock = threading.Lock()
+
+    def fetch_page(number):
+        with lock:
+            attempts[number] = attempts.get(number, 0) + 1
+        if number == 2 and attempts[number] == 1:
+            raise ValueError("timeout")
+        if number == 3:
+            raise ValueError("server error")
+        return Page(number, [number], total_pages=4)
+
+    paginator = Paginator(fetch_page, first_page=1, retries=1, retry_delay=0)
+    items = paginator.fetch_all()
+
+    assert items == [1, 2, 4]
+    assert paginator.errors == {3: "server error"}
+    assert attempts == {1: 1, 2: 2, 3: 2, 4: 1}
+
+
+def test_unknown_page_count_walks_until_empty_page():
+    def fetch_page(number):
+        return Page(number, [number] if number < 3 else [])
+
+    assert Paginator(fetch_page, first_page=0).fetch_all(ordered=False) == [0, 1, 2]
+
+
+def test_start_page_skips_earlier_pages():
+    def fetch_page(number):
+        return Page(number, [number], total_pages=5)
+
+    assert Paginator(fetch_page, first_page=1, start_page=3).fetch_all() == [3, 4, 5]
@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+from api.pazarama_api import PazaramaAPIClient
+
+
+def test_update_products_chunks_stock_and_price():
+    client = PazaramaAPIClient()
+    products = [{"id": f"C{i}", "sku": f"SKU{i}", "quantity": i, "price": 10} for i in range(3)]
+    sent = []
+
+    def request_data(method, uri, payload, return_failures):
+        sent.append((uri, [item["code"] for item in payload["items"]]))
+        if uri == "product/updatePrice-v2" and "C2" in [item["code"] for item in payload["items"]]:
+            return {"success": False, "message": "price too low", "data": None}
+        return {"success": True, "message": None, "data": None}
+
+    with patch.object(client, "request_data", side_effect=request_data):
+        results = client.update_products(products, update_price=True, batch_size=2)
+
+    assert sorted(sent) == [
+        ("product/updatePrice-v2", ["C0", "C1"]),
+        ("product/updatePrice-v2", ["C2"]),
+        ("product/updateStock-v2", ["C0", "C1"]),
+        ("product/updateStock-v2", ["C2"]),
+    ]
+    assert results["C0"] == {"success": True, "message": None}
+    assert results["C2"] == {"success": False, "message": "price too low"}
+
+
+def test_update_products_defaults_to_stock_only():
+    client = PazaramaAPIClient()
+    products = [{"id": "C0", "sku": "SKU0", "quantity": 3, "price": None}]
+    sent = []
+
+    def request_data(method, uri, payload, return_failures):
+        sent.append((uri, payload["items"]))
+        return {"success": True, "message": None, "data": None}
+
+    with patch.object(client, "request_data", side_effect=request_data):
+        results = client.update_products(products)
+
+    assert sent == [("product/updateStock-v2", [{"code": "C0", "stockCount": 3}])]
+    assert results["C0"] == {"success": True, "message": None}
+
+
+def test_update_products_reports_malformed_rows_as_failed():
+    client = PazaramaAPIClient()
+    products = [
+        {"id": "C0", "sku": "SKU0", "quantity": 1},
+        {"id": "C1", "sku": "SKU1", "quantity": "many"},
+        {"sku": "SKU2", "quantity": 1},
+    ]
+    sent = []
+
+    def request_data(method, uri, payload, return_failures):
+        sent.append((uri, [item["code"] for item in payload["items"]]))
+        return {"success": True, "message": None, "data": None}
+
+    with patch.object(client, "request_data", side_effect=request_data):
+        results = client.update_products(products)
+
+    assert sent == [("product/updateStock-v2", ["C0"])]
+    assert results["C0"] == {"success": True, "message": None}
+    assert results["C1"]["success"] is False
+    assert results[None] == {"success": False, "message": "Missing code"}
@@ -0,0 +1,54 @@
+from app.product_record import ProductRecord, emits_records, to_dicts, to_records
+from app.sku_index import SkuIndex, join_by_sku
+from app.snapshot_store import SnapshotStore
+
+
+def test_from_item_reads_compact_and_full_shapes():
+    compact = ProductRecord.from_item({"id": 7, "sku": "KP4", "quantity": 3, "price": 9.5}, "n11")
+    full = ProductRecord.from_item(
+        {"sku": "KP4", "data": {"quantity": 4, "salePrice": 10.0, "productMainId": "KP"}, "platform": "trendyol"}
+    )
+
+    assert (compact.platform, compact.quantity, compact.price) == ("n11", 3, 9.5)
+    assert "data" not in compact and compact.get("data", {}) == {}
+    assert (full.platform, full.quantity, full.price, full.product_main_id) == ("trendyol", 4, 10.0, "KP")
+    assert full["data"]["quantity"] == 4
+
+
+def test_raw_payload_is_loaded_lazily():
+    calls = []
+
+    def load():
+        calls.append(1)
+        return {"description": "..."}
+
+    record = ProductRecord("KP4", raw=load)
+
+    assert "data" in record and not calls
+    assert record["data"] == {"description": "..."}
+    assert record.data == {"description": "..."}
+    assert len(calls) == 1
+
+
+def test_records_join_like_dicts():
+    source = to_records([{"sku": "KP4", "quantity": 5}, {"sku": "OTO2", "quantity": 1}], "trendyol")
+    target = to_records([{"sku": " kp4 ", "id": 2, "quantity": 3}], "n11")
+
+    matches = {item["sku"]: found for item, found in join_by_sku(source, {"n11": SkuIndex(target, "n11")})}
+
+    assert matches["KP4"]["n11"]["quantity"] == 3
+    assert matches["OTO2"] == {}
+
+
+def test_emits_records_and_snapshots_store_records_as_dicts(tmp_path):
+    @emits_records("pazarama")
+    def get_products(everyProduct=False):
+        return [{"id": "a", "sku": "KP4", "quantity": 1, "price": 2}]
+
+    records = get_products(as_records=True)
+    store = SnapshotStore(path=str(tmp_path / "snapshots.db"))
+    store.save("pazarama", records)
+
+    assert isinstance(records[0], ProductRecord) and records[0].platform == "pazarama"
+    assert get_products() == [{"id": "a", "sku": "KP4", "quantity": 1, "price": 2}]
+    assert store.load("pazarama") == to_dicts(records)
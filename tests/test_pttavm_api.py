@@ -0,0 +1,50 @@
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from api import pttavm_api
+
+RESULT = "<a:ServiceResult><a:Success>{}</a:Success></a:ServiceResult>"
+
+
+def _response(*successes):
+    results = "".join(RESULT.format(str(success).lower()) for success in successes)
+    response = MagicMock(spec=requests.Response)
+    response.status_code = 200
+    response.content = (
+        '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+        '<StokFiyatGuncelle3Response xmlns="http://tempuri.org/">'
+        '<StokFiyatGuncelle3Result xmlns:a="http://schemas.datacontract.org/2004/07/ePttAVMService">'
+        f"{results}</StokFiyatGuncelle3Result></StokFiyatGuncelle3Response></s:Body></s:Envelope>"
+    ).encode()
+    return response
+
+
+def test_update_products_packs_items_into_envelopes():
+    products = [{"sku": f"SKU{i}", "id": f"B{i}", "quantity": i, "price": 10} for i in range(5)]
+    sent = []
+
+    def request(method, url, data=None, **kwargs):
+        sent.append(data)
+        count = data.count(b"<tem:item>")
+        return _response(*[index != 1 for index in range(count)])
+
+    with patch.object(pttavm_api.transport, "request", side_effect=request):
+        results = pttavm_api.pttavm_update_products(products, batch_size=3, max_in_flight=1)
+
+    assert [envelope.count(b"<tem:item>") for envelope in sent] == [3, 2]
+    assert all(envelope.count(b"wsse:Security") == 2 for envelope in sent)
+    assert results == {"SKU0": True, "SKU1": False, "SKU2": True, "SKU3": True, "SKU4": False}
+
+
+def test_update_products_reports_faults_per_item():
+    products = [{"sku": "SKU0", "id": "B0", "quantity": 1, "price": 10}]
+
+    with patch.object(pttavm_api, "requestdata", return_value="Geçersiz barkod"):
+        results = pttavm_api.pttavm_update_products(products)
+
+    assert results == {"SKU0": {"success": False, "message": "Geçersiz barkod"}}
+
+
+def test_single_success_flag_answers_for_the_envelope():
+    assert pttavm_api.update_results(_response(True), 3) == [True, True, True]
@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+from api.rate_limiter import RateLimiter, TokenBucket, endpoint_key, retry_after_seconds
+
+
+def test_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.05 < bucket.reserve() <= 0.1
+
+
+def test_penalize_pauses_and_lowers_rate():
+    bucket = TokenBucket(rate=10, capacity=5)
+    bucket.penalize(retry_after=0.5)
+
+    assert bucket.rate == 5
+    assert bucket.reserve() >= 0.45
+
+    for _ in range(20):
+        bucket.reward()
+    assert bucket.rate == 10
+
+
+def test_acquire_async_waits():
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(3)))
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.09
+
+
+def test_limits_resolve_from_most_specific_key():
+    limiter = RateLimiter(limits={"amazon": (60, 1), "amazon:listings/2021-08-01": (300, 10)})
+
+    assert limiter.bucket("amazon", "listings/2021-08-01").max_rate == 5
+    assert limiter.bucket("amazon", "reports/2021-06-30").max_rate == 1
+    assert limiter.bucket("amazon", "reports/2021-06-30") is not limiter.bucket("amazon")
+
+
+def test_platforms_without_a_limit_are_unthrottled():
+    limiter = RateLimiter(limits={"n11": (None, None)})
+
+    for platform in ("n11", "pazarama"):
+        bucket = limiter.bucket(platform)
+        assert all(bucket.reserve() == 0 for _ in range(100))
+        assert limiter.limit(platform) == (None, None)
+
+    limiter.penalize("n11", retry_after=0.5)
+    assert limiter.bucket("n11").reserve() >= 0.45
+    assert limiter.bucket("n11").rate is None
+
+
+def test_update_reacts_to_429():
+    limiter = RateLimiter(limits={})
+
+    assert limiter.update("n11", None, 429, {"Retry-After": "2"})
+    assert limiter.bucket("n11").reserve() >= 1.9
+    assert not limiter.update("n11", None, 200, {})
+
+
+def test_helpers():
+    assert retry_after_seconds({"Retry-After": "3"}) == 3
+    assert retry_after_seconds({}) is None
+    assert endpoint_key("/products/batch-requests/123?x=1") == "products/batch-requests"
@@ -0,0 +1,43 @@
+import pytest
+from app.sku_index import SkuIndex, build_indexes, join_by_sku, normalize_sku
+
+
+@pytest.fixture
+def platform_data():
+    return {
+        "trendyol": [
+            {"sku": "KP4", "quantity": 5},
+            {"sku": " oto2 ", "quantity": 2},
+            {"sku": "DMT16", "quantity": 0},
+        ],
+        "n11": [
+            {"sku": "kp4", "id": 1, "quantity": 3},
+            {"sku": "KP4", "id": 2, "quantity": 9},
+            {"sku": None, "id": 3, "quantity": 1},
+        ],
+        "pazarama": [
+            {"sku": "OTO2", "id": "a", "quantity": 2},
+        ],
+    }
+
+def test_normalize_sku():
+    assert normalize_sku("  Kp4 ") == "kp4"
+    assert normalize_sku("") is None
+    assert normalize_sku(None) is None
+    assert normalize_sku(123) == "123"
+
+def test_index_keeps_first_duplicate(platform_data):
+    index = SkuIndex(platform_data["n11"], "n11")
+
+    assert len(index) == 1
+    assert index.get("KP4")["id"] == 1
+    assert [item["id"] for item in index.duplicates["kp4"]] == [2]
+    assert [item["id"] for item in index.missing_sku] == [3]
+
+def test_join_by_sku_matches_all_platforms(platform_data):
+    indexes = build_indexes(platform_data, ["n11", "pazarama"])
+    joined = {source["sku"]: matches for source, matches in join_by_sku(platform_data["trendyol"], indexes)}
+
+    assert set(joined["KP4"]) == {"n11"}
+    assert set(joined[" oto2 "]) == {"pazarama"}
+    assert joined["DMT16"] == {}
@@ -0,0 +1,59 @@
+import pytest
+from app.snapshot_store import SnapshotStore, merge_by_sku
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(path=str(tmp_path / "snapshots.db"), ttls={"amazon": 60})
+
+def test_save_and_load(store):
+    products = [{"sku": "KP4", "id": 1, "quantity": 5, "price": 10.5}]
+    store.save("n11", products)
+
+    assert store.load("n11") == products
+    assert store.load("n11", full=True) is None
+    assert store.age("n11") < 5
+
+def test_stale_snapshot_is_ignored(store):
+    store.save("amazon", [{"sku": "KP4"}])
+
+    assert store.load("amazon", max_age=0) is None
+    assert store.ttl("amazon") == 60
+
+def test_clear(store):
+    store.save("n11", [])
+    store.save("pazarama", [])
+    store.clear("n11")
+
+    assert store.age("n11") is None
+    assert store.age("pazarama") is not None
+
+def test_merge_replaces_changed_items_and_advances_mark(store):
+    store.save("trendyol", [{"sku": "A", "quantity": 1}, {"sku": "B", "quantity": 2}], synced_at=1000)
+
+    merged = store.merge("trendyol", [{"sku": "B", "quantity": 7}, {"sku": "C", "quantity": 3}], synced_at=2000)
+
+    assert merged == [{"sku": "A", "quantity": 1}, {"sku": "B", "quantity": 7}, {"sku": "C", "quantity": 3}]
+    assert store.load("trendyol") == merged
+    assert store.changed_since("trendyol", full_resync=float("inf"), overlap=0).timestamp() == 2000
+
+def test_changed_since_forces_periodic_full_download(store):
+    assert store.changed_since("wordpress") is None
+
+    store.save("wordpress", [{"sku": "A"}])
+    store.merge("wordpress", [{"sku": "B"}])
+
+    assert store.changed_since("wordpress") is not None
+    assert store.changed_since("wordpress", full_resync=0) is None
+    assert store.merge("n11", [{"sku": "A"}]) is None
+
+
+def test_merge_matches_items_without_a_sku_by_id():
+    items = [{"sku": "", "id": 1}, {"sku": "A", "id": 2}, {"sku": None, "id": 5}]
+    changed = [{"sku": "", "id": 1, "quantity": 3}, {"sku": "A", "id": 4}, {"sku": "", "id": 6}]
+
+    merged = merge_by_sku(items, changed)
+    # Merging the same delta again must not build up copies
+    assert merge_by_sku(merged, changed) == merged == [
+        {"sku": "", "id": 1, "quantity": 3}, {"sku": "A", "id": 4}, {"sku": None, "id": 5}, {"sku": "", "id": 6}
+    ]
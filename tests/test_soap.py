@@ -0,0 +1,38 @@
+from api.soap import SoapTemplate, fault_string, find_text, find_texts, iter_elements
+
+FAULT = (
+    b'<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body><s:Fault>'
+    b'<faultcode>s:Client</faultcode><faultstring xml:lang="tr-TR">Dakikada 60 istek</faultstring>'
+    b"</s:Fault></s:Body></s:Envelope>"
+)
+
+
+def test_template_folds_static_values_and_escapes_the_rest():
+    template = SoapTemplate("<auth>{key}</auth><item>{sku}</item><raw>{body}</raw>{{literal}}", key="a&b")
+
+    rendered = template.render(sku="KP<4>", body=b"<x/>")
+
+    assert template.fields == ("sku", "body")
+    assert rendered == b"<auth>a&amp;b</auth><item>KP&lt;4&gt;</item><raw><x/></raw>{literal}"
+
+
+def test_render_many_repeats_the_template_per_row():
+    item = SoapTemplate("<item><id>{id}</id><qty>{quantity}</qty><on>{active}</on></item>")
+    rows = [{"id": "B&1", "quantity": 2, "active": True, "sku": "extra"}, {"id": "B2", "quantity": 0, "active": None}]
+
+    assert item.render_many(rows) == (
+        b"<item><id>B&amp;1</id><qty>2</qty><on>true</on></item><item><id>B2</id><qty>0</qty><on></on></item>"
+    )
+
+
+def test_extractors_read_elements_by_local_name():
+    orders = (
+        b'<r xmlns:a="urn:a"><a:list><a:order><a:id>1</a:id></a:order>'
+        b"<a:order><a:id>2</a:id></a:order></a:list><a:pageCount>3</a:pageCount></r>"
+    )
+
+    assert [order["a:id"] for order in iter_elements(orders, "order")] == ["1", "2"]
+    assert find_texts(orders, "id") == ["1", "2"]
+    assert find_text(orders, "pageCount") == "3"
+    assert find_text(orders, "missing", "0") == "0"
+    assert fault_string(FAULT) == "Dakikada 60 istek"
@@ -0,0 +1,43 @@
+import threading
+import time
+
+from api.token_manager import TokenManager
+
+
+def test_token_is_cached_until_margin():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return f"token-{len(calls)}", 3600
+
+    manager = TokenManager(fetch, refresh_margin=60)
+
+    assert manager.get() == "token-1"
+    assert manager.get() == "token-1"
+    assert len(calls) == 1
+
+    manager._expires_at = time.time() + 30  # inside the refresh margin
+    assert manager.get() == "token-2"
+
+    manager.invalidate()
+    assert manager.get() == "token-3"
+
+
+def test_concurrent_callers_trigger_one_fetch():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return "token", None
+
+    manager = TokenManager(fetch)
+    threads = [threading.Thread(target=manager.get) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert manager.expires_at is None
@@ -0,0 +1,26 @@
+from unittest.mock import patch
+
+from api.transport import HTTPTransport
+
+
+def test_session_is_shared_per_host():
+    transport = HTTPTransport()
+
+    first = transport.session_for("https://api.example.com/products?page=1")
+    second = transport.session_for("https://api.example.com/orders")
+    other = transport.session_for("https://other.example.com/")
+
+    assert first is second
+    assert first is not other
+
+
+def test_request_applies_default_timeout():
+    transport = HTTPTransport(timeout=(3, 30))
+    session = transport.session_for("https://api.example.com")
+
+    with patch.object(session, "request") as mock_request:
+        transport.get("https://api.example.com/products", headers={"a": "b"})
+        transport.post("https://api.example.com/products", timeout=5)
+
+    assert mock_request.call_args_list[0].kwargs == {"timeout": (3, 30), "headers": {"a": "b"}}
+    assert mock_request.call_args_list[1].kwargs == {"timeout": 5}
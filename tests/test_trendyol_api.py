@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from api.trendyol_api import TrendyolAPIError, TrendyolClient
+
+
+def test_get_stock_data_fetches_pages_concurrently_in_order():
+    client = TrendyolClient(store_id="1", auth_hash="x")
+    requested = []
+
+    def make_request(endpoint, request_type, payload=None):
+        page = int(endpoint.split("page=")[1].split("&")[0])
+        requested.append(endpoint)
+        response = MagicMock()
+        response.json.return_value = {
+            "totalPages": 3,
+            "content": [{"stockCode": f"SKU{page}", "barcode": f"B{page}", "quantity": page, "salePrice": 1.0}],
+        }
+        return response
+
+    with patch.object(client, "_make_request", side_effect=make_request):
+        products = client.get_stock_data(page_size=50)
+        streamed = {product["sku"] for product in client.iter_stock_data()}
+
+    assert [product["sku"] for product in products] == ["SKU0", "SKU1", "SKU2"]
+    assert products[1]["id"] == "B1"
+    assert all("size=50" in endpoint for endpoint in requested[:3])
+    assert streamed == {"SKU0", "SKU1", "SKU2"}
+
+
+def test_update_products_reports_malformed_items_as_failed():
+    client = TrendyolClient(store_id="1", auth_hash="x")
+    products = [
+        {"id": "B0", "sku": "SKU0", "quantity": 1, "price": 10.0},
+        {"id": "B1", "sku": "SKU1", "quantity": "many", "price": 10.0},
+        {"id": "B2", "sku": "SKU2", "quantity": 2, "price": None},
+    ]
+    sent = []
+
+    def make_request(endpoint, request_type, payload=None):
+        response = MagicMock()
+        if payload:
+            sent.extend(item["barcode"] for item in payload["items"])
+            response.json.return_value = {"batchRequestId": "batch0"}
+        else:
+            response.json.return_value = {"status": "COMPLETED", "items": [
+                {"requestItem": {"barcode": barcode}, "status": "SUCCESS"} for barcode in sent
+            ]}
+        return response
+
+    with patch.object(client, "_make_request", side_effect=make_request):
+        results = client.update_products(products)
+
+    assert sent == ["B0"]
+    assert results == {"B0": True, "B1": False, "B2": False}
+
+
+@patch("api.pagination.time.sleep")
+def test_get_stock_data_fails_when_a_page_keeps_failing(_sleep):
+    client = TrendyolClient(store_id="1", auth_hash="x")
+
+    def make_request(endpoint, request_type, payload=None):
+        page = int(endpoint.split("page=")[1].split("&")[0])
+        if page == 1:
+            raise TrendyolAPIError("server error")
+        response = MagicMock()
+        response.json.return_value = {"totalPages": 3, "content": [{"stockCode": f"SKU{page}", "barcode": f"B{page}"}]}
+        return response
+
+    with patch.object(client, "_make_request", side_effect=make_request), pytest.raises(TrendyolAPIError):
+        client.get_stock_data()
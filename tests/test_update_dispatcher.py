@@ -0,0 +1,69 @@
+import threading
+import time
+
+from app.update_dispatcher import UpdateDispatcher
+
+
+def test_run_updates_platforms_concurrently():
+    running = set()
+    overlap = threading.Event()
+
+    def slow_update(post):
+        running.add(post["platform"])
+        if len(running) > 1:
+            overlap.set()
+        time.sleep(0.05)
+
+    posts = [{"platform": "pttavm", "sku": "A", "id": 1}, {"platform": "amazon", "sku": "B", "id": 2}]
+    dispatcher = UpdateDispatcher({"pttavm": slow_update, "amazon": slow_update, "n11": slow_update})
+
+    results = dispatcher.run(posts)
+
+    assert overlap.is_set()
+    assert set(results) == {"pttavm", "amazon"}
+    assert results["amazon"].succeeded == ["B"]
+
+
+def test_single_item_failures_are_retried_and_reported():
+    attempts = {}
+
+    def update(post):
+        attempts[post["sku"]] = attempts.get(post["sku"], 0) + 1
+        if post["sku"] == "BAD" or attempts[post["sku"]] == 1:
+            raise ValueError("timeout")
+
+    posts = [{"platform": "pttavm", "sku": sku, "id": sku} for sku in ("OK", "BAD")]
+    dispatcher = UpdateDispatcher({"pttavm": update}, retries=2, retry_delay=0)
+
+    result = dispatcher.run(posts)["pttavm"]
+
+    assert result.succeeded == ["OK"]
+    assert result.failed == {"BAD": "timeout"}
+    assert result.retries == 3
+    assert attempts == {"OK": 2, "BAD": 3}
+
+
+def test_bulk_failures_are_resent_alone():
+    calls = []
+
+    def bulk_update(posts):
+        calls.append([post["id"] for post in posts])
+        # Keyed by barcode like Trendyol, the first attempt of B2 fails
+        return {post["id"]: post["id"] != "B2" or len(calls) > 1 for post in posts}
+
+    posts = [{"platform": "trendyol", "sku": f"SKU{i}", "id": f"B{i}"} for i in range(3)]
+    dispatcher = UpdateDispatcher({"trendyol": None}, {"trendyol": bulk_update}, retry_delay=0)
+
+    result = dispatcher.run(posts)["trendyol"]
+
+    assert calls == [["B0", "B1", "B2"], ["B2"]]
+    assert sorted(result.succeeded) == ["SKU0", "SKU1", "SKU2"]
+    assert result.ok
+
+
+def test_workers_follow_rate_limit_burst():
+    dispatcher = UpdateDispatcher({}, workers={"pttavm": 3})
+
+    assert dispatcher.workers_for("pttavm") == 3
+    assert dispatcher.workers_for("amazon") == 8
+    assert dispatcher.workers_for("hepsiburada") == 8
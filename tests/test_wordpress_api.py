@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from api.wordpress_api import WooCommerceAPIClient
+
+
+def test_update_products_uses_batch_endpoint():
+    client = WooCommerceAPIClient()
+    client.BATCH_SIZE = 2
+    products = [{"id": i, "sku": f"SKU{i}", "quantity": i, "price": 5.0} for i in range(5)]
+    calls = []
+
+    def post(endpoint, data):
+        calls.append((endpoint, [item["id"] for item in data["update"]]))
+        response = MagicMock(ok=True)
+        response.json.return_value = {"update": [
+            {"id": item["id"], "error": {"message": "Invalid ID."}} if item["id"] == 3 else {"id": item["id"]}
+            for item in data["update"]
+        ]}
+        return response
+
+    client.wcapi = MagicMock()
+    client.wcapi.post.side_effect = post
+
+    results = client.update_products(products)
+
+    assert sorted(calls) == [("products/batch", [0, 1]), ("products/batch", [2, 3]), ("products/batch", [4])]
+    assert results == {"SKU0": True, "SKU1": True, "SKU2": True, "SKU3": False, "SKU4": True}
+
+
+def test_update_products_reports_malformed_items_as_failed():
+    client = WooCommerceAPIClient()
+    products = [{"id": 0, "sku": "SKU0", "quantity": 1, "price": 5.0}, {"id": 1, "sku": "SKU1", "quantity": None}]
+    client.wcapi = MagicMock()
+    client.wcapi.post.return_value = MagicMock(ok=True)
+    client.wcapi.post.return_value.json.return_value = {"update": [{"id": 0}]}
+
+    results = client.update_products(products)
+
+    assert [item["id"] for item in client.wcapi.post.call_args[0][1]["update"]] == [0]
+    assert results == {"SKU0": True, "SKU1": False}
+
+
+def test_get_all_products_fetches_pages_from_total_header():
+    client = WooCommerceAPIClient()
+    requested = []
+
+    def get(endpoint, params):
+        requested.append(params)
+        response = MagicMock(ok=True, headers={"X-WP-TotalPages": "3"})
+        response.json.return_value = [{"id": params["page"], "sku": f"SKU{params['page']}", "price": "1", "stock_quantity": 2}]
+        return response
+
+    client.wcapi = MagicMock()
+    client.wcapi.get.side_effect = get
+
+    products = client.get_all_products()
+
+    assert [product["sku"] for product in products] == ["SKU1", "SKU2", "SKU3"]
+    assert all(params["_fields"] == client.STOCK_FIELDS for params in requested)
+
+
+@patch("api.pagination.time.sleep")
+def test_get_all_products_fails_when_a_page_keeps_failing(_sleep):
+    client = WooCommerceAPIClient()
+
+    def get(endpoint, params):
+        response = MagicMock(ok=params["page"] != 2, headers={"X-WP-TotalPages": "3"})
+        response.json.return_value = [{"id": params["page"], "sku": f"SKU{params['page']}", "price": "1"}]
+        return response
+
+    client.wcapi = MagicMock()
+    client.wcapi.get.side_effect = get
+
+    with pytest.raises(ValueError):
+        client.get_all_products()
+
+
+def test_requests_go_through_the_wordpress_rate_limit_bucket():
+    client = WooCommerceAPIClient()
+
+    with patch("api.wordpress_api.transport.request") as mock_request:
+        client.wcapi.get("products/12")
+        client.wcapi.post("products/batch", {"update": []})
+
+    assert [(call.kwargs["platform"], call.kwargs["endpoint"]) for call in mock_request.call_args_list] == [
+        ("wordpress", "products"), ("wordpress", "products")
+    ]